@@ -0,0 +1,221 @@
+"""Locating the sprite and sound folders.
+
+A one-file PyInstaller build unpacks everything bundled with --add-data into a
+temporary _MEIPASS folder on every launch. Bundling img/ therefore means about
+120 MB of disk writes before the game can start. Instead, the sprites can ship
+as an asset pack: a folder holding img/ and a manifest.json of SHA-256 hashes.
+The pack sits next to the executable or in the user's data folder.
+
+A pack is hashed against its manifest only the first time it is seen. The
+result is remembered together with a cheap stat signature of the folder, so
+later launches just list the folder. The bundled/development img/ folder is
+used only when no valid pack is found. Sound effects are looked up in a
+sounds/ folder next to whichever img/ is used.
+
+    python assets.py build img dist/PokemonQuiz-assets
+    python assets.py verify dist/PokemonQuiz-assets
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+
+ASSET_PACK_NAME = "PokemonQuiz-assets"
+MANIFEST_NAME = "manifest.json"
+VERIFIED_FILE = "verified_asset_packs.json"
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+
+# Helper function for PyInstaller asset bundling
+def resource_path(relative_path):
+    """ Get absolute path to resource, works for dev and for PyInstaller """
+    try:
+        # PyInstaller creates a temp folder and stores path in _MEIPASS
+        base_path = sys._MEIPASS
+        print(f"Running in PyInstaller bundle. Base path: {base_path}")
+    except Exception:
+        # Not running in a PyInstaller bundle, use current directory
+        base_path = os.path.abspath(".")
+        print(f"Running in development mode. Base path: {base_path}")
+
+    full_path = os.path.join(base_path, relative_path)
+    print(f"Resource path for '{relative_path}': {full_path}")
+    return full_path
+
+
+def user_data_dir():
+    """Per-user folder the game writes to (not created here)"""
+    if os.name == 'posix':
+        return os.path.join(os.path.expanduser("~"), ".pokemonquiz")
+    return os.path.join(os.getenv('APPDATA') or os.path.expanduser("~"), "PokemonQuiz")
+
+
+def candidate_pack_dirs():
+    """Places an asset pack may live, most specific first"""
+    candidates = []
+    if os.getenv("POKEMONQUIZ_ASSETS"):
+        candidates.append(os.getenv("POKEMONQUIZ_ASSETS"))
+    # Next to the executable (or the script, when running from source)
+    if getattr(sys, 'frozen', False):
+        app_dir = os.path.dirname(os.path.abspath(sys.executable))
+    else:
+        app_dir = os.path.dirname(os.path.abspath(__file__))
+    candidates.append(os.path.join(app_dir, ASSET_PACK_NAME))
+    candidates.append(os.path.join(user_data_dir(), "assets"))
+    return candidates
+
+
+def list_images(image_dir):
+    return sorted(f for f in os.listdir(image_dir) if f.endswith(IMAGE_EXTENSIONS))
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def pack_hash(files):
+    """Single hash identifying a manifest's complete file list"""
+    digest = hashlib.sha256()
+    for name in sorted(files):
+        digest.update(f"{name}:{files[name]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def stat_signature(image_dir, filenames):
+    """Cheap fingerprint of the folder: file count, total size and newest mtime"""
+    total_size = 0
+    newest = 0
+    for name in filenames:
+        st = os.stat(os.path.join(image_dir, name))
+        total_size += st.st_size
+        newest = max(newest, st.st_mtime_ns)
+    return f"{len(filenames)}:{total_size}:{newest}"
+
+
+def build_pack(source_dir, pack_dir):
+    """Copy sprites into an asset pack and write its manifest"""
+    image_dir = os.path.join(pack_dir, "img")
+    os.makedirs(image_dir, exist_ok=True)
+    files = {}
+    for name in list_images(source_dir):
+        shutil.copy2(os.path.join(source_dir, name), os.path.join(image_dir, name))
+        files[name] = file_hash(os.path.join(image_dir, name))
+    manifest = {"version": 1, "pack_hash": pack_hash(files), "files": files}
+    with open(os.path.join(pack_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    print(f"Built asset pack with {len(files)} sprites at {pack_dir}")
+    return manifest
+
+
+def load_manifest(pack_dir):
+    try:
+        with open(os.path.join(pack_dir, MANIFEST_NAME), 'r') as f:
+            manifest = json.load(f)
+        if manifest.get("pack_hash") != pack_hash(manifest["files"]):
+            print(f"Asset pack manifest in {pack_dir} is inconsistent")
+            return None
+        return manifest
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Could not read asset pack manifest in {pack_dir}: {e}")
+        return None
+
+
+def verify_pack(pack_dir, manifest):
+    """Hash every sprite against the manifest"""
+    image_dir = os.path.join(pack_dir, "img")
+    for name, expected in manifest["files"].items():
+        path = os.path.join(image_dir, name)
+        if not os.path.exists(path) or file_hash(path) != expected:
+            print(f"Asset pack file {name} is missing or corrupt")
+            return False
+    return True
+
+
+def _load_verified():
+    try:
+        with open(os.path.join(user_data_dir(), VERIFIED_FILE), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_verified(verified):
+    try:
+        os.makedirs(user_data_dir(), exist_ok=True)
+        with open(os.path.join(user_data_dir(), VERIFIED_FILE), 'w') as f:
+            json.dump(verified, f)
+    except OSError as e:
+        print(f"Could not record asset pack verification: {e}")
+
+
+def find_asset_pack():
+    """Image folder of the first valid asset pack, or None"""
+    verified = None
+    for pack_dir in candidate_pack_dirs():
+        image_dir = os.path.join(pack_dir, "img")
+        if not os.path.isdir(image_dir):
+            continue
+        manifest = load_manifest(pack_dir)
+        if manifest is None:
+            continue
+
+        filenames = list_images(image_dir)
+        if sorted(manifest["files"]) != filenames:
+            print(f"Asset pack at {pack_dir} doesn't match its manifest")
+            continue
+        signature = stat_signature(image_dir, filenames)
+
+        if verified is None:
+            verified = _load_verified()
+        key = os.path.abspath(pack_dir)
+        if verified.get(key) == [manifest["pack_hash"], signature]:
+            print(f"Using asset pack at {pack_dir}")
+            return image_dir
+
+        print(f"Verifying asset pack at {pack_dir} (first launch only)...")
+        if verify_pack(pack_dir, manifest):
+            verified[key] = [manifest["pack_hash"], signature]
+            _save_verified(verified)
+            print(f"Using asset pack at {pack_dir}")
+            return image_dir
+    return None
+
+
+def locate_sprite_dir():
+    """Folder to load sprites from: an asset pack if present, else the bundled img/"""
+    return find_asset_pack() or resource_path("img")
+
+
+def locate_sound_dir(image_dir):
+    """sounds/ beside the sprite folder (an asset pack's root), else the bundled sounds/"""
+    sound_dir = os.path.join(os.path.dirname(os.path.abspath(image_dir)), "sounds")
+    return sound_dir if os.path.isdir(sound_dir) else resource_path("sounds")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or check a Pokemon Quiz asset pack")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Create a pack from a sprite folder")
+    build_parser.add_argument("source", help="Folder of sprites, e.g. img")
+    build_parser.add_argument("pack", help="Folder to create, e.g. dist/PokemonQuiz-assets")
+    verify_parser = subparsers.add_parser("verify", help="Hash a pack against its manifest")
+    verify_parser.add_argument("pack")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_pack(args.source, args.pack)
+    else:
+        manifest = load_manifest(args.pack)
+        ok = manifest is not None and verify_pack(args.pack, manifest)
+        print("Asset pack OK" if ok else "Asset pack INVALID")
+        sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
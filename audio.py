@@ -0,0 +1,130 @@
+"""Sound effects that start within a frame of the key press.
+
+- The mixer is opened with a 256-sample buffer (about 6 ms at 44.1 kHz)
+  instead of SDL's default of several thousand samples.
+- Every effect is decoded into a pygame.mixer.Sound once, by a background
+  thread at startup, so playing one never touches the disk.
+- Each effect owns a couple of reserved channels and plays on them in turn.
+  A rapid burst of SPACE presses cuts off the oldest copy of the sound
+  instead of queueing behind it, and never looks for or allocates a channel.
+
+Effects come from the sounds folder (see assets.locate_sound_dir) if it has
+them, otherwise a short tone is synthesized in their place. Without an audio device the game runs silent.
+"""
+import array
+import math
+import os
+import threading
+
+import pygame
+
+from assets import resource_path
+
+FREQUENCY = 44100
+MIXER_BUFFER = 256
+CHANNELS_PER_EFFECT = 2
+
+# Effect -> file in the sounds folder, and the notes (Hz, seconds) played when it's missing
+EFFECTS = {
+    "correct": ("new_pokemon.wav", [(880, 0.05), (1320, 0.07)]),
+    "skip": ("skip.wav", [(330, 0.05), (247, 0.07)]),
+    "start": ("start_game.wav", [(523, 0.08), (659, 0.08), (784, 0.12)]),
+    "time_up": ("end_game.wav", [(784, 0.12), (659, 0.12), (523, 0.25)]),
+    "high_score": ("high_score.wav", [(523, 0.08), (659, 0.08), (784, 0.08), (1047, 0.3)]),
+}
+
+
+def init_mixer():
+    """Open the mixer with a small buffer; returns False if there is no audio device"""
+    pygame.mixer.pre_init(FREQUENCY, -16, 2, MIXER_BUFFER)
+    try:
+        pygame.mixer.init()
+    except pygame.error as e:
+        print(f"Sound disabled: {e}")
+        return False
+    return True
+
+
+def mixer_latency():
+    """Seconds of audio buffered ahead of the speakers"""
+    frequency = pygame.mixer.get_init()[0] if pygame.mixer.get_init() else FREQUENCY
+    return MIXER_BUFFER / frequency
+
+
+def synthesize(notes, volume=0.3):
+    """A Sound playing notes as soft square-ish tones, in the mixer's format"""
+    frequency, size, channels = pygame.mixer.get_init()
+    if size != -16:
+        return None
+    samples = array.array('h')
+    for pitch, seconds in notes:
+        count = int(frequency * seconds)
+        fade = max(1, count // 8)
+        for i in range(count):
+            # A little of the third harmonic, with short fades so notes don't click
+            phase = 2 * math.pi * pitch * i / frequency
+            value = math.sin(phase) + math.sin(3 * phase) / 3
+            envelope = min(1.0, i / fade, (count - i) / fade)
+            sample = int(value * envelope * volume * 32767 * 0.75)
+            samples.extend([sample] * channels)
+    return pygame.mixer.Sound(buffer=samples.tobytes())
+
+
+class SoundBank:
+    """Pre-decoded sound effects on pooled channels"""
+
+    def __init__(self, sound_dir=None, enabled=True):
+        # Resolved by the loader thread when not given, so importing this module touches no files
+        self.sound_dir = sound_dir
+        # Effect name -> Sound, filled in by the loader thread
+        self.sounds = {}
+        self.channels = {}
+        self.next_channel = {}
+        self.enabled = enabled and pygame.mixer.get_init() is not None
+        self.loader = None
+        if not self.enabled:
+            return
+
+        # Reserve the first channels for the effects, so nothing else can take them
+        reserved = len(EFFECTS) * CHANNELS_PER_EFFECT
+        if pygame.mixer.get_num_channels() < reserved:
+            pygame.mixer.set_num_channels(reserved)
+        pygame.mixer.set_reserved(reserved)
+        for i, effect in enumerate(EFFECTS):
+            self.channels[effect] = [pygame.mixer.Channel(i * CHANNELS_PER_EFFECT + n)
+                                     for n in range(CHANNELS_PER_EFFECT)]
+            self.next_channel[effect] = 0
+
+        self.loader = threading.Thread(target=self.load, name="sound-loader", daemon=True)
+        self.loader.start()
+
+    def load(self):
+        """Decode every effect (runs on the loader thread)"""
+        if self.sound_dir is None:
+            self.sound_dir = resource_path("sounds")
+        for effect, (filename, notes) in EFFECTS.items():
+            path = os.path.join(self.sound_dir, filename)
+            try:
+                if os.path.exists(path):
+                    sound = pygame.mixer.Sound(path)
+                else:
+                    sound = synthesize(notes)
+            except pygame.error as e:
+                print(f"Could not load sound {path}: {e}")
+                sound = synthesize(notes)
+            if sound is not None:
+                self.sounds[effect] = sound
+
+    def wait_until_loaded(self, timeout=None):
+        if self.loader is not None:
+            self.loader.join(timeout)
+
+    def play(self, effect):
+        """Start an effect now; does nothing until it has been decoded"""
+        sound = self.sounds.get(effect)
+        if sound is None:
+            return
+        channels = self.channels[effect]
+        index = self.next_channel[effect]
+        self.next_channel[effect] = (index + 1) % len(channels)
+        channels[index].play(sound)
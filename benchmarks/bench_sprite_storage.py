@@ -0,0 +1,71 @@
+"""Memory and blit-speed comparison of the sprite storage modes.
+
+    python benchmarks/bench_sprite_storage.py --count 100
+
+Runs headless under the SDL dummy video driver.
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from assets import list_images
+from sprite_store import STORAGE_MODES, pack_sprite, stored_size, unpack_sprite, resolve_mode
+
+
+def bench_mode(mode, sources, screen, blits):
+    started = time.perf_counter()
+    stored = [pack_sprite(surface, mode) for surface in sources]
+    pack_time = time.perf_counter() - started
+
+    total_bytes = sum(stored_size(sprite) for sprite in stored)
+
+    started = time.perf_counter()
+    surfaces = [unpack_sprite(sprite) for sprite in stored]
+    unpack_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for i in range(blits):
+        screen.blit(surfaces[i % len(surfaces)], (256, 128))
+    blit_time = time.perf_counter() - started
+
+    return {
+        "bytes_per_sprite": total_bytes / len(stored),
+        "pack_ms": pack_time * 1000 / len(stored),
+        "unpack_ms": unpack_time * 1000 / len(stored),
+        "blit_us": blit_time * 1e6 / blits,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--img", default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "img"))
+    parser.add_argument("--count", type=int, default=100, help="Sprites to load")
+    parser.add_argument("--blits", type=int, default=2000)
+    args = parser.parse_args()
+
+    pygame.display.init()
+    screen = pygame.display.set_mode((1024, 768))
+    sources = [pygame.image.load(os.path.join(args.img, name)) for name in list_images(args.img)[:args.count]]
+
+    results = {}
+    for mode in STORAGE_MODES:
+        if resolve_mode(mode) != mode:
+            continue
+        results[mode] = bench_mode(mode, sources, screen, args.blits)
+
+    baseline = results["rgba"]["bytes_per_sprite"]
+    print(f"{len(sources)} sprites, {args.blits} blits each mode")
+    print(f"{'mode':<12}{'KB/sprite':>10}{'vs rgba':>9}{'pack ms':>9}{'unpack ms':>11}{'blit us':>9}")
+    for mode, r in results.items():
+        print(f"{mode:<12}{r['bytes_per_sprite'] / 1024:>10.1f}{baseline / r['bytes_per_sprite']:>8.1f}x"
+              f"{r['pack_ms']:>9.2f}{r['unpack_ms']:>11.2f}{r['blit_us']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
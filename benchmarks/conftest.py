@@ -0,0 +1,229 @@
+"""Performance regression checks for the game logic and rendering.
+
+    python -m pytest benchmarks
+    python -m pytest benchmarks --perf-threshold 0.2    # only allow 20% slowdowns
+    python -m pytest benchmarks --perf-update           # record a new baseline
+
+Every benchmark runs its code a few times with garbage collection paused,
+timing a fixed pure-Python reference workload right before each run. The
+median ratio of the two is compared with perf_baseline.json, and a benchmark
+fails when it is more than the threshold (default 50%, or
+POKEMONQUIZ_PERF_THRESHOLD) slower than its baseline. Measuring against the
+reference keeps a machine that is busy or throttled as a whole from failing
+the run, but record the baseline on the kind of machine that runs the checks
+all the same. Metrics missing from the baseline pass and are reported as new.
+The baseline file is only written with --perf-update, or when it doesn't
+exist yet, so a plain run never changes it.
+
+Rendering runs headless under the SDL dummy video driver, and the game writes
+its high scores and sprite store to a temporary home folder.
+"""
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import pytest
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perf_baseline.json")
+DEFAULT_THRESHOLD = 0.5
+# Size of the reference workload, about 2 ms on a typical machine
+REFERENCE_ITEMS = 5000
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("perf", "performance baseline")
+    group.addoption("--perf-threshold", type=float, default=None,
+                    help="Fail when a metric is this fraction slower than its baseline (default 0.5)")
+    group.addoption("--perf-update", action="store_true",
+                    help="Write this run's timings to perf_baseline.json instead of comparing")
+    group.addoption("--perf-baseline", default=BASELINE_FILE, help="Baseline file to compare with")
+
+
+def load_baseline(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f).get("metrics", {})
+    except (OSError, ValueError) as e:
+        if os.path.exists(path):
+            print(f"Could not read performance baseline {path}: {e}")
+        return {}
+
+
+def reference_workload():
+    """Fixed pure-Python work, timed next to every benchmark to gauge the machine's current speed"""
+    table = {}
+    for i in range(REFERENCE_ITEMS):
+        table[str(i)] = i * 2
+    return table
+
+
+class PerfRecorder:
+    """Times benchmarks and checks them against the baseline"""
+
+    def __init__(self, baseline, threshold, update=False):
+        self.baseline = baseline
+        self.threshold = threshold
+        self.update = update
+        # Metric name -> {"seconds": per operation, "relative": in reference workload times}, for this run
+        self.results = {}
+
+    def measure(self, name, func, number=1, repeat=7, setup=None, threshold=None):
+        """Time repeat runs of func() called number times; returns the best time per call.
+
+        threshold loosens the check for timings that mostly depend on how other
+        threads get scheduled; such benchmarks should also assert a fixed budget.
+        """
+        timings = []
+        references = []
+        for _ in range(repeat):
+            if setup:
+                setup()
+            # Like timeit, keep garbage collection pauses out of the timings
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                started = time.perf_counter()
+                reference_workload()
+                references.append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                for _ in range(number):
+                    func()
+                timings.append((time.perf_counter() - started) / number)
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+        # Each repeat is compared with the reference timed right before it, as the machine's speed drifts
+        relative = statistics.median(timing / reference for timing, reference in zip(timings, references))
+        self.results[name] = {"seconds": min(timings), "relative": relative}
+        self.check(name, threshold)
+        return min(timings)
+
+    def change(self, name):
+        """How much slower name ran than its baseline (0.1 is 10% slower), or None if it has none.
+
+        Both timings are taken relative to the reference workload, so a machine
+        that is busy or throttled as a whole doesn't count as a regression.
+        """
+        baseline = self.baseline.get(name)
+        if baseline is None:
+            return None
+        return self.results[name]["relative"] / baseline["relative"] - 1
+
+    def check(self, name, threshold=None):
+        threshold = max(self.threshold, threshold or 0)
+        change = self.change(name)
+        if self.update or change is None or change <= threshold:
+            return
+        pytest.fail(f"{name} regressed: {format_seconds(self.results[name]['seconds'])} against a baseline of "
+                    f"{format_seconds(self.baseline[name]['seconds'])} ({change:+.0%} adjusted for machine speed, "
+                    f"threshold {threshold:.0%})", pytrace=False)
+
+    def save(self, path):
+        """Write this run's timings to the baseline file, keeping metrics that weren't run"""
+        metrics = dict(self.baseline)
+        metrics.update(self.results)
+        data = {
+            "machine": {
+                "python": platform.python_version(),
+                "pygame": pygame.version.ver,
+                "platform": platform.platform(),
+                "processor": platform.machine(),
+            },
+            "recorded": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "metrics": dict(sorted(metrics.items())),
+        }
+        with open(path + ".tmp", 'w') as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+        os.replace(path + ".tmp", path)
+
+
+def format_seconds(value):
+    if value >= 1:
+        return f"{value:.2f} s"
+    if value >= 1e-3:
+        return f"{value * 1e3:.2f} ms"
+    return f"{value * 1e6:.1f} us"
+
+
+def pytest_configure(config):
+    # Options are only registered when this folder is on the command line, so fall back to defaults
+    threshold = config.getoption("--perf-threshold", default=None)
+    if threshold is None:
+        threshold = float(os.getenv("POKEMONQUIZ_PERF_THRESHOLD", DEFAULT_THRESHOLD))
+    path = config.getoption("--perf-baseline", default=None) or BASELINE_FILE
+    update = config.getoption("--perf-update", default=False)
+    config.perf_baseline_path = path
+    config.perf_recorder = PerfRecorder(load_baseline(path), threshold, update)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    recorder = getattr(session.config, "perf_recorder", None)
+    if recorder is None or not recorder.results:
+        return
+    path = session.config.perf_baseline_path
+    if recorder.update or not os.path.exists(path):
+        recorder.save(path)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    recorder = getattr(config, "perf_recorder", None)
+    if recorder is None or not recorder.results:
+        return
+    terminalreporter.section("performance")
+    for name, result in sorted(recorder.results.items()):
+        change = recorder.change(name)
+        if change is None:
+            note = "new"
+        else:
+            note = f"{change:+.0%} vs {format_seconds(recorder.baseline[name]['seconds'])}"
+        terminalreporter.write_line(f"{name:<40}{format_seconds(result['seconds']):>12}  {note}")
+    if recorder.update or not recorder.baseline:
+        terminalreporter.write_line(f"Baseline written to {config.perf_baseline_path}")
+
+
+@pytest.fixture
+def perf(request):
+    return request.config.perf_recorder
+
+
+@pytest.fixture(scope="session")
+def game_home():
+    """Temporary home folder, so benchmarks never touch the player's scores or sprite store"""
+    home = tempfile.mkdtemp(prefix="pokemonquiz-perf-")
+    saved = {key: os.environ.get(key) for key in ("HOME", "APPDATA")}
+    os.environ["HOME"] = os.environ["APPDATA"] = home
+    yield home
+    for key, value in saved.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+    shutil.rmtree(home, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def quiz(game_home):
+    """pokemon_quiz with its display open"""
+    import pokemon_quiz
+    pokemon_quiz.bootstrap()
+    yield pokemon_quiz
+    pygame.quit()
+
+
+@pytest.fixture(scope="session")
+def game(quiz):
+    """A game with the full roster loaded, through the shared sprite store so its benchmark finds it built"""
+    return quiz.PokemonQuizGame(shared_sprites=True)
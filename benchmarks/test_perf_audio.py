@@ -0,0 +1,78 @@
+"""Sound effect latency: from the key press to the effect playing, under the SDL dummy audio driver"""
+import pygame
+import pytest
+
+import audio
+
+# Key presses timed per measurement
+PRESSES = 100
+# These timings swing with the mixer and journal threads, so regressions are mostly caught by the frame budget
+LATENCY_THRESHOLD = 2.0
+
+
+@pytest.fixture
+def sounding_game(quiz, game):
+    if not game.audio.enabled:
+        pytest.skip("no audio device")
+    game.audio.wait_until_loaded()
+    game.answer_mode = "classic"
+    game.start_game()
+    yield game
+    pygame.mixer.stop()
+    game.reset_game()
+
+
+def press(game, key):
+    """Queue a key press and let the game handle it, as one frame of the main loop would"""
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+    game.handle_events()
+
+
+@pytest.mark.parametrize("key, effect", [(pygame.K_SPACE, "correct"), (pygame.K_BACKSPACE, "skip")],
+                         ids=["space", "backspace"])
+def test_key_press_effect_latency(perf, quiz, sounding_game, key, effect):
+    game = sounding_game
+    seconds = perf.measure(f"sound_latency_{effect}", lambda: press(game, key), number=PRESSES,
+                           threshold=LATENCY_THRESHOLD)
+    assert any(channel.get_busy() for channel in game.audio.channels[effect])
+    # Handling the press plus the audio already buffered ahead of it must fit in one frame
+    assert seconds + audio.mixer_latency() < 1 / quiz.FPS
+
+
+def test_end_game_effect_latency(perf, quiz, sounding_game, monkeypatch):
+    game = sounding_game
+    # Only time the way to the effect; saving the score and round log happens after it has started
+    monkeypatch.setattr(game.high_score_manager, "add_score", lambda *args, **kwargs: None)
+    monkeypatch.setattr(game, "save_session_log", lambda: None)
+    seconds = perf.measure("sound_latency_end_game", game.end_game, setup=game.start_game,
+                           threshold=LATENCY_THRESHOLD)
+    assert any(channel.get_busy() for effect in ("time_up", "high_score") for channel in game.audio.channels[effect])
+    assert seconds + audio.mixer_latency() < 1 / quiz.FPS
+
+
+class RecordingChannel:
+    """Stands in for a reserved channel and notes each play on it"""
+
+    def __init__(self, channel, plays):
+        self.channel = channel
+        self.plays = plays
+
+    def play(self, sound):
+        self.plays.append(self.channel)
+        self.channel.play(sound)
+
+
+def test_rapid_presses_reuse_channels(quiz, sounding_game, monkeypatch):
+    game = sounding_game
+    reserved = game.audio.channels["correct"]
+    plays = []
+    monkeypatch.setitem(game.audio.channels, "correct", [RecordingChannel(channel, plays) for channel in reserved])
+    channels = pygame.mixer.get_num_channels()
+    pygame.mixer.stop()
+    start = game.audio.next_channel["correct"]
+    for _ in range(PRESSES):
+        press(game, pygame.K_SPACE)
+    # Every press takes the effect's next reserved channel in turn, cutting off the oldest copy of the sound
+    # instead of looking for or allocating another one
+    assert plays == [reserved[(start + n) % len(reserved)] for n in range(PRESSES)]
+    assert pygame.mixer.get_num_channels() == channels
@@ -0,0 +1,76 @@
+"""Game logic benchmarks: drawing Pokemon, loading names and saving scores"""
+import os
+
+from checkpoint import CheckpointJournal, CheckpointRecorder
+from quiz_engine import QuizEngine, QuizRoster
+
+# Rounds drawn per measurement of a full-roster session
+SESSIONS = 20
+# Timings that wait on the disk or share the CPU with the journal thread swing more than the rest,
+# so they are repeated more often and also held to a fixed budget of a few times their usual cost
+IO_REPEAT = 21
+ADD_SCORE_BUDGET = 1e-3
+CHECKPOINTED_ANSWER_BUDGET = 25e-6
+
+
+def test_get_random_pokemon_full_roster(perf, game):
+    """Every Pokemon in the roster drawn once, as in a round that sees them all"""
+    roster_size = len(game.pokemon_images)
+    assert roster_size > 1000
+
+    def full_session():
+        game.engine.reset()
+        for _ in range(roster_size):
+            game.get_random_pokemon()
+
+    perf.measure("get_random_pokemon_full_roster", full_session, number=SESSIONS)
+    assert len(set(game.seen_pokemon)) == roster_size
+
+
+def test_engine_sessions_side_by_side(perf, game):
+    """Many sessions drawing from one shared roster, as the party server runs them"""
+    roster = QuizRoster(pid for pid, _, _ in game.pokemon_images)
+    engines = [QuizEngine(roster) for _ in range(SESSIONS)]
+
+    def sessions():
+        for engine in engines:
+            engine.reset()
+        for _ in range(len(roster)):
+            for engine in engines:
+                engine.get_random_pokemon()
+
+    perf.measure("engine_full_roster_x20", sessions)
+    assert all(len(engine.seen_pokemon) == len(roster) for engine in engines)
+
+
+def test_load_pokemon_names(perf, quiz):
+    names = quiz.load_pokemon_names()
+    assert len(names) > 1000
+    perf.measure("load_pokemon_names", quiz.load_pokemon_names, number=10)
+
+
+def test_add_score(perf, quiz, game_home):
+    manager = quiz.HighScoreManager(file_path=os.path.join(game_home, "perf_high_scores.json"))
+    scores = iter(range(10 ** 9))
+
+    seconds = perf.measure("high_score_add_score", lambda: manager.add_score(next(scores)), number=200,
+                           repeat=IO_REPEAT)
+    assert seconds < ADD_SCORE_BUDGET
+    assert len(manager.get_recent_scores()) == 10
+    assert manager.get_top_score() == next(scores) - 1
+
+
+def test_checkpointed_answer(perf, game, game_home):
+    """SPACE with the round being journaled; the game thread only queues the journal's writes"""
+    journal = CheckpointJournal(os.path.join(game_home, "perf_checkpoint.pqj"))
+    engine = QuizEngine(QuizRoster(pid for pid, _, _ in game.pokemon_images))
+    engine.recorder = CheckpointRecorder(journal)
+    engine.start_game()
+    try:
+        # Each run starts with the previous run's writes on disk, so it only pays for its own
+        seconds = perf.measure("checkpointed_next_pokemon", engine.next_pokemon, number=1000,
+                               repeat=IO_REPEAT, setup=journal.flush)
+        assert seconds < CHECKPOINTED_ANSWER_BUDGET
+        assert journal.flush()
+    finally:
+        journal.close()
@@ -0,0 +1,107 @@
+"""Rendering and startup benchmarks, headless under the SDL dummy video driver"""
+import itertools
+import os
+import shutil
+
+import pytest
+
+from assets import list_images
+
+# Frames drawn per measurement
+FRAMES = 60
+# Entries on the end screen's list of seen Pokemon
+SEEN_ENTRIES = 600
+# Sprites decoded by the uncached startup benchmark, which is slow on the full roster
+DECODE_SPRITES = 100
+
+
+@pytest.fixture
+def round_in_progress(game):
+    """A game showing its first Pokemon; set hard_mode_checkbox before starting"""
+    game.answer_mode = "classic"
+    yield game
+    game.hard_mode_checkbox.checked = False
+    game.reset_game()
+
+
+def frame_drawer(game):
+    """One game screen frame per call, walking through several sprites so the
+    scaled-sprite cache and the hard mode scaling both do their work"""
+    frames = itertools.count()
+
+    def frame():
+        number = next(frames)
+        if number % 10 == 0:
+            game.engine.next_pokemon()
+        game.pokemon_scale = 0.9 + 0.1 * (number % 20) / 20
+        game.fade_alpha = 150 + number % 100
+        game.draw_game_screen()
+    return frame
+
+
+@pytest.mark.parametrize("hard_mode", [False, True], ids=["normal", "hard"])
+def test_draw_game_screen(perf, quiz, round_in_progress, hard_mode):
+    game = round_in_progress
+    game.hard_mode_checkbox.checked = hard_mode
+    game.start_game()
+    assert game.state == "game" and game.hard_mode == hard_mode
+
+    mode = "hard" if hard_mode else "normal"
+    perf.measure(f"draw_game_screen_{mode}", frame_drawer(game), number=FRAMES)
+
+
+def test_draw_scrollable_pokemon_list(perf, quiz, round_in_progress):
+    game = round_in_progress
+    game.start_game()
+    for i in range(SEEN_ENTRIES - 1):
+        if i % 4:
+            game.engine.next_pokemon()
+        else:
+            game.engine.skip_pokemon()
+    game.end_game()
+    assert len(game.seen_pokemon) >= SEEN_ENTRIES
+
+    def frame():
+        # Scroll a little each frame, as while browsing the list
+        game.scroll_y = (game.scroll_y + game.scroll_speed) % max(1, game.max_scroll)
+        game.draw_scrollable_pokemon_list()
+
+    perf.measure("draw_scrollable_pokemon_list_600", frame, number=10)
+    assert game.max_scroll > 0
+
+
+def test_load_pokemon_images_shared_store(perf, game):
+    """Startup with the decoded sprite store already built, as on every launch after the first"""
+    def load():
+        game.pokemon_images = []
+        game.load_pokemon_images()
+
+    perf.measure("load_pokemon_images_shared", load)
+    assert len(game.pokemon_images) > 1000
+
+
+def test_load_pokemon_images_decode(perf, quiz, game, game_home, monkeypatch):
+    """Startup decoding every PNG, as without --shared-sprites, on part of the roster"""
+    image_dir = os.path.join(game_home, "img")
+    if not os.path.isdir(image_dir):
+        os.makedirs(image_dir)
+        for filename in list_images(game.image_dir)[:DECODE_SPRITES]:
+            shutil.copy(os.path.join(game.image_dir, filename), image_dir)
+    monkeypatch.setattr(quiz, "locate_sprite_dir", lambda: image_dir)
+    monkeypatch.setattr(game, "shared_sprites", False)
+    saved_images = game.pokemon_images
+
+    def load():
+        game.pokemon_images = []
+        game.load_pokemon_images()
+
+    try:
+        perf.measure(f"load_pokemon_images_decode_{DECODE_SPRITES}", load)
+        assert len(game.pokemon_images) == DECODE_SPRITES
+    finally:
+        # Back to the full roster for the other benchmarks
+        monkeypatch.undo()
+        game.pokemon_images = saved_images
+        game.image_dir = quiz.locate_sprite_dir()
+        game.engine.roster = quiz.QuizRoster(pid for pid, _, _ in saved_images)
+        game.engine.reset()
@@ -0,0 +1,293 @@
+"""Crash-safe checkpoints of the round in progress.
+
+A solo round is already recorded event by event as a compact session log (see
+session_log), and replaying that log rebuilds the round exactly. While a
+round is played, the recorder also sends every new piece of the log to a
+journal in the user data folder:
+
+    header   magic, version
+    frames   kind, ms into the round, payload length, payload, CRC32
+
+    ROUND    round started: answer mode and other details, then the log so far
+    EVENTS   log bytes for one or more SPACE/BACKSPACE presses
+    TICK     heartbeat once a second, so the time left is known within a second
+
+The game thread only queues these; a background thread appends them, with one
+fsync per batch. Every COMPACT_FRAMES frames the journal is rewritten as a
+single ROUND frame, so it never grows much past the log itself. A finished
+round deletes the journal. After a crash, the next launch reads the journal
+up to the last intact frame and offers to resume the round with the time
+that was left.
+"""
+import json
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+
+from assets import user_data_dir
+from session_log import HEADER as LOG_HEADER, SessionRecorder
+
+CHECKPOINT_FILE = "checkpoint.pqj"
+MAGIC = b"PQCJ"
+VERSION = 1
+FILE_HEADER = struct.Struct("!4sB")
+# kind, ms into the round, payload length; followed by the payload and a CRC32 of both
+FRAME = struct.Struct("!BII")
+CRC = struct.Struct("!I")
+# details JSON length, ahead of the details and the log in a ROUND payload
+DETAILS_LENGTH = struct.Struct("!H")
+
+ROUND = 1
+EVENTS = 2
+TICK = 3
+DONE = 4
+
+COMPACT_FRAMES = 200
+TICK_MS = 1000
+# Older checkpoints are not offered any more
+MAX_AGE = 24 * 60 * 60
+
+
+def checkpoint_path():
+    return os.path.join(user_data_dir(), CHECKPOINT_FILE)
+
+
+def pack_frame(kind, elapsed_ms, payload=b""):
+    frame = FRAME.pack(kind, elapsed_ms, len(payload)) + payload
+    return frame + CRC.pack(zlib.crc32(frame))
+
+
+class Checkpoint:
+    """An unfinished round read back from the journal"""
+    __slots__ = ("details", "log", "elapsed_ms", "saved")
+
+    def __init__(self, details, log, elapsed_ms, saved):
+        self.details = details
+        self.log = log
+        self.elapsed_ms = elapsed_ms
+        self.saved = saved
+
+    @property
+    def duration(self):
+        return LOG_HEADER.unpack_from(self.log, 0)[4]
+
+    @property
+    def time_left(self):
+        return max(0, self.duration - self.elapsed_ms // 1000)
+
+
+def load_checkpoint(path=None):
+    """The round left in the journal, or None if there is nothing worth resuming"""
+    path = path or checkpoint_path()
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        saved = os.path.getmtime(path)
+    except OSError:
+        return None
+    if len(data) < FILE_HEADER.size or FILE_HEADER.unpack_from(data, 0) != (MAGIC, VERSION):
+        print(f"Ignoring unreadable checkpoint {path}")
+        return None
+    if time.time() - saved > MAX_AGE:
+        return None
+
+    details = None
+    log = bytearray()
+    elapsed_ms = 0
+    offset = FILE_HEADER.size
+    while offset + FRAME.size + CRC.size <= len(data):
+        kind, frame_ms, length = FRAME.unpack_from(data, offset)
+        end = offset + FRAME.size + length
+        if end + CRC.size > len(data) or CRC.unpack_from(data, end)[0] != zlib.crc32(data[offset:end]):
+            # Torn write at the moment of the crash; everything before it is good
+            break
+        payload = data[offset + FRAME.size:end]
+        if kind == ROUND:
+            (details_length,) = DETAILS_LENGTH.unpack_from(payload, 0)
+            details = json.loads(payload[DETAILS_LENGTH.size:DETAILS_LENGTH.size + details_length])
+            log = bytearray(payload[DETAILS_LENGTH.size + details_length:])
+        elif kind == EVENTS:
+            log += payload
+        elapsed_ms = max(elapsed_ms, frame_ms)
+        offset = end + CRC.size
+
+    if details is None or len(log) < LOG_HEADER.size:
+        return None
+    checkpoint = Checkpoint(details, bytes(log), elapsed_ms, saved)
+    return checkpoint if checkpoint.time_left > 1 else None
+
+
+def discard_checkpoint(path=None):
+    try:
+        os.remove(path or checkpoint_path())
+    except OSError:
+        pass
+
+
+class CheckpointJournal:
+    """Writes a round's progress to the journal from a background thread.
+
+    The methods called by the game only put a record on a queue.
+    """
+
+    def __init__(self, path=None, compact_frames=COMPACT_FRAMES):
+        self.path = path or checkpoint_path()
+        self.compact_frames = compact_frames
+        self.queue = queue.SimpleQueue()
+        # Everything below belongs to the writer thread
+        self.file = None
+        self.details = None
+        self.log = bytearray()
+        self.elapsed_ms = 0
+        self.frames = 0
+        self.thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+        self.thread.start()
+
+    def round_started(self, details, data):
+        self.queue.put((ROUND, 0, bytes(data), details))
+
+    def events(self, data, elapsed_ms):
+        self.queue.put((EVENTS, elapsed_ms, bytes(data), None))
+
+    def tick(self, elapsed_ms):
+        self.queue.put((TICK, elapsed_ms, b"", None))
+
+    def round_finished(self):
+        self.queue.put((DONE, 0, b"", None))
+
+    def flush(self, timeout=5):
+        """Wait until everything queued so far is on disk"""
+        written = threading.Event()
+        self.queue.put(written)
+        return written.wait(timeout)
+
+    def close(self, timeout=5):
+        self.queue.put(None)
+        self.thread.join(timeout)
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            # Take whatever else piled up, so a burst of key presses costs one fsync
+            try:
+                while True:
+                    batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            flushed = []
+            for item in batch:
+                if item is None:
+                    self._sync()
+                    self._close_file()
+                    for written in flushed:
+                        written.set()
+                    return
+                if isinstance(item, threading.Event):
+                    flushed.append(item)
+                    continue
+                try:
+                    self._apply(*item)
+                except (OSError, ValueError) as e:
+                    print(f"Could not write checkpoint {self.path}: {e}")
+                    self._close_file()
+            try:
+                self._sync()
+            except OSError as e:
+                print(f"Could not write checkpoint {self.path}: {e}")
+            for written in flushed:
+                written.set()
+
+    def _apply(self, kind, elapsed_ms, data, details):
+        if kind == ROUND:
+            self.details = details
+            self.log = bytearray(data)
+            self.elapsed_ms = 0
+            self._compact()
+        elif kind == DONE:
+            self.details = None
+            self.log = bytearray()
+            self._close_file()
+            discard_checkpoint(self.path)
+        elif self.details is not None:
+            if kind == EVENTS:
+                self.log += data
+            self.elapsed_ms = max(self.elapsed_ms, elapsed_ms)
+            if self.file is None:
+                self._compact()
+            else:
+                self.file.write(pack_frame(kind, elapsed_ms, data))
+                self.frames += 1
+                if self.frames >= self.compact_frames:
+                    self._compact()
+
+    def _compact(self):
+        """Replace the journal with one ROUND frame holding the whole log"""
+        details = json.dumps(self.details).encode("utf-8")
+        payload = DETAILS_LENGTH.pack(len(details)) + details + self.log
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(temp_path, 'wb') as f:
+            f.write(FILE_HEADER.pack(MAGIC, VERSION) + pack_frame(ROUND, self.elapsed_ms, payload))
+            f.flush()
+            os.fsync(f.fileno())
+        # Closed first, as Windows can't replace an open file
+        self._close_file()
+        os.replace(temp_path, self.path)
+        self.file = open(self.path, 'ab')
+        self.frames = 1
+
+    def _sync(self):
+        if self.file is not None:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def _close_file(self):
+        if self.file is not None:
+            try:
+                self.file.close()
+            except OSError:
+                pass
+            self.file = None
+
+
+class CheckpointRecorder(SessionRecorder):
+    """SessionRecorder that also journals the round as it goes, so a crash doesn't lose it"""
+
+    def __init__(self, journal, details=dict):
+        super().__init__()
+        self.journal = journal
+        # Called at the start of each round for what the log doesn't cover (e.g. answer mode)
+        self.details = details
+        self.sent = 0
+        self.last_tick_ms = 0
+
+    def start(self, engine):
+        super().start(engine)
+        self.sent = len(self.data)
+        self.last_tick_ms = 0
+        self.journal.round_started(self.details(), self.data)
+
+    def record(self, engine, next_pokemon):
+        super().record(engine, next_pokemon)
+        if len(self.data) > self.sent:
+            self.journal.events(self.data[self.sent:], self.last_ms)
+            self.sent = len(self.data)
+
+    def finish(self, engine):
+        was_finished = self.finished
+        super().finish(engine)
+        if self.data and not was_finished:
+            self.journal.round_finished()
+
+    def tick(self, engine):
+        """Call every frame; notes the time into the round about once a second"""
+        if not self.data or self.finished or engine.state != "game":
+            return
+        elapsed_ms = int((engine.clock() - engine.start_time) * 1000)
+        if elapsed_ms - self.last_tick_ms >= TICK_MS:
+            self.last_tick_ms = elapsed_ms
+            self.journal.tick(elapsed_ms)
@@ -0,0 +1,420 @@
+"""Shared leaderboard for many quiz installs.
+
+Each install queues finished rounds in a local file and a background thread
+uploads them in batches over one long-lived connection, retrying with
+exponential backoff while the server is unreachable. The aggregation server
+keeps a bounded top-N list and a score histogram per mode. Leaderboard and
+rank queries are answered with bisect and Fenwick-tree lookups, so they take
+O(log n).
+
+    python leaderboard.py --port 5556
+    python leaderboard.py --query hard --address 192.168.1.20:5556
+    python leaderboard.py --load-test 200 --rounds 50
+"""
+import argparse
+import asyncio
+import bisect
+import json
+import os
+import random
+import shutil
+import socket
+import tempfile
+import threading
+import time
+
+import quiz_protocol as proto
+
+DEFAULT_PORT = 5556
+MODES = ("normal", "hard", "typed", "choice")
+TOP_N = 100
+MAX_SCORE = 0xFFFF
+BATCH_SIZE = 50
+FLUSH_INTERVAL = 2.0
+MAX_BACKOFF = 60.0
+
+
+def mode_index(mode):
+    return MODES.index(mode) if mode in MODES else 0
+
+
+class ScoreCounts:
+    """Fenwick tree over every possible score, for O(log n) rank lookups"""
+
+    def __init__(self, size=MAX_SCORE + 1):
+        self.tree = [0] * (size + 1)
+        self.total = 0
+
+    def add(self, score):
+        self.total += 1
+        i = score + 1
+        tree = self.tree
+        while i < len(tree):
+            tree[i] += 1
+            i += i & -i
+
+    def count_at_most(self, score):
+        i = min(score + 1, len(self.tree) - 1)
+        count = 0
+        tree = self.tree
+        while i > 0:
+            count += tree[i]
+            i -= i & -i
+        return count
+
+    def rank(self, score):
+        """1-based position a score would hold among everything submitted"""
+        return self.total - self.count_at_most(score) + 1
+
+
+class ModeBoard:
+    """Top-N scores for one game mode, kept sorted best first"""
+
+    def __init__(self, capacity=TOP_N):
+        self.capacity = capacity
+        self.keys = []     # (-score, timestamp) so bisect keeps best scores first
+        self.entries = []
+        self.counts = ScoreCounts()
+
+    def add(self, entry):
+        score, _, timestamp, _ = entry
+        self.counts.add(score)
+        key = (-score, timestamp)
+        if len(self.keys) >= self.capacity and key >= self.keys[-1]:
+            return
+        pos = bisect.bisect_right(self.keys, key)
+        self.keys.insert(pos, key)
+        self.entries.insert(pos, entry)
+        if len(self.keys) > self.capacity:
+            self.keys.pop()
+            self.entries.pop()
+
+    def top(self, limit):
+        return self.entries[:limit]
+
+
+class LeaderboardConnection(asyncio.Protocol):
+    def __init__(self, server):
+        self.server = server
+        self.decoder = proto.FrameDecoder()
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        for msg_type, payload in self.decoder.feed(data):
+            reply = self.server.handle_message(msg_type, payload)
+            if reply:
+                self.transport.write(reply)
+
+
+class LeaderboardServer:
+    def __init__(self, capacity=TOP_N):
+        self.boards = [ModeBoard(capacity) for _ in MODES]
+        # Last batch accepted from each client, so retried uploads aren't counted twice
+        self.last_batch = {}
+        self.scores_received = 0
+        self.server = None
+
+    async def start(self, host="0.0.0.0", port=DEFAULT_PORT):
+        loop = asyncio.get_running_loop()
+        self.server = await loop.create_server(lambda: LeaderboardConnection(self), host, port)
+        print(f"Leaderboard server listening on {host}:{self.port}")
+        return self
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def handle_message(self, msg_type, payload):
+        if msg_type == proto.SUBMIT_BATCH:
+            client_id, batch_id, entries = proto.decode_batch(payload)
+            if self.last_batch.get(client_id) != batch_id:
+                self.last_batch[client_id] = batch_id
+                for entry in entries:
+                    if entry[1] < len(self.boards):
+                        self.boards[entry[1]].add(entry)
+                self.scores_received += len(entries)
+            return proto.encode(proto.BATCH_ACK, proto.U32.pack(batch_id))
+        elif msg_type == proto.QUERY_TOP:
+            mode, limit = proto.QUERY.unpack(payload)
+            board = self.boards[mode] if mode < len(self.boards) else self.boards[0]
+            return proto.encode_top(board.top(limit))
+        elif msg_type == proto.QUERY_RANK:
+            mode, score = proto.QUERY.unpack(payload)
+            board = self.boards[mode] if mode < len(self.boards) else self.boards[0]
+            return proto.encode(proto.RANK, proto.RANK_INFO.pack(board.counts.rank(score),
+                                                                 board.counts.total))
+        return None
+
+
+class LeaderboardConnectionPool:
+    """One persistent blocking socket, reopened only after a failure"""
+
+    def __init__(self, host, port, timeout=5.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.sock = None
+        self.decoder = proto.FrameDecoder()
+        self.lock = threading.Lock()
+
+    def request(self, frame, reply_type):
+        with self.lock:
+            try:
+                if self.sock is None:
+                    self.sock = socket.create_connection((self.host, self.port), self.timeout)
+                    self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    self.decoder = proto.FrameDecoder()
+                self.sock.sendall(frame)
+                while True:
+                    data = self.sock.recv(65536)
+                    if not data:
+                        raise ConnectionError("Leaderboard server closed the connection")
+                    for msg_type, payload in self.decoder.feed(data):
+                        if msg_type == reply_type:
+                            return payload
+            except OSError:
+                self.close()
+                raise
+
+    def close(self):
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+
+def parse_address(address):
+    host, _, port = address.rpartition(":")
+    if not host:
+        return address, DEFAULT_PORT
+    return host, int(port)
+
+
+class LeaderboardSink:
+    """Queues finished rounds on disk and uploads them in the background"""
+
+    def __init__(self, address, queue_path, name="Player", batch_size=BATCH_SIZE,
+                 flush_interval=FLUSH_INTERVAL):
+        self.name = name
+        self.pool = LeaderboardConnectionPool(*parse_address(address))
+        self.queue_path = queue_path
+        # Client id and batch counter outlive the process, like the queue, so a batch the server
+        # took but never acknowledged is resent under the same ids after a restart and dropped
+        self.state_path = queue_path + ".client.json"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.client_id, self.batch_id, self.in_flight = self.load_state()
+        self.pending = self.load_queue()
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stopped = False
+        self.backoff = 0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def load_queue(self):
+        pending = []
+        if os.path.exists(self.queue_path):
+            try:
+                with open(self.queue_path, 'r') as f:
+                    for line in f:
+                        if line.strip():
+                            pending.append(tuple(json.loads(line)))
+                print(f"Loaded {len(pending)} queued leaderboard scores")
+            except (OSError, ValueError) as e:
+                print(f"Error reading leaderboard queue: {e}")
+        return pending
+
+    def load_state(self):
+        """(client id, last batch id sent, size of that batch if it was never acknowledged)"""
+        try:
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+            return int(state["client_id"]), int(state["batch_id"]), int(state["in_flight"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            if os.path.exists(self.state_path):
+                print(f"Error reading leaderboard client state: {e}")
+        state = (random.getrandbits(32), 0, 0)
+        self.save_state(*state)
+        return state
+
+    def save_state(self, client_id, batch_id, in_flight):
+        try:
+            tmp_path = self.state_path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({"client_id": client_id, "batch_id": batch_id, "in_flight": in_flight}, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"Error saving leaderboard client state: {e}")
+
+    def save_queue(self):
+        try:
+            tmp_path = self.queue_path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                for entry in self.pending:
+                    f.write(json.dumps(entry) + "\n")
+            os.replace(tmp_path, self.queue_path)
+        except OSError as e:
+            print(f"Error saving leaderboard queue: {e}")
+
+    def submit(self, score, mode="normal", name=None, timestamp=None):
+        """Queue one finished round for upload"""
+        if timestamp is None:
+            timestamp = time.time()
+        entry = (int(score), mode_index(mode), int(timestamp), (name or self.name)[:32])
+        with self.lock:
+            self.pending.append(entry)
+            try:
+                with open(self.queue_path, 'a') as f:
+                    f.write(json.dumps(entry) + "\n")
+            except OSError as e:
+                print(f"Error queueing leaderboard score: {e}")
+        self.wake.set()
+
+    def flush(self):
+        """Upload queued scores until the queue is empty or a send fails"""
+        while True:
+            with self.lock:
+                if self.in_flight:
+                    # Resend exactly the unacknowledged batch under its id, so the server can drop duplicates
+                    batch = self.pending[:self.in_flight]
+                else:
+                    batch = self.pending[:self.batch_size]
+            if not batch:
+                self.in_flight = 0
+                return True
+            if not self.in_flight:
+                self.batch_id = (self.batch_id + 1) & 0xFFFFFFFF
+                self.in_flight = len(batch)
+                self.save_state(self.client_id, self.batch_id, self.in_flight)
+            frame = proto.encode_batch(self.client_id, self.batch_id, batch)
+            try:
+                self.pool.request(frame, proto.BATCH_ACK)
+            except OSError as e:
+                print(f"Leaderboard upload failed: {e}")
+                return False
+            with self.lock:
+                del self.pending[:len(batch)]
+                self.save_queue()
+            self.in_flight = 0
+            self.save_state(self.client_id, self.batch_id, 0)
+
+    def _run(self):
+        while not self.stopped:
+            self.wake.wait(self.backoff or self.flush_interval)
+            self.wake.clear()
+            if self.stopped:
+                break
+            if self.flush():
+                self.backoff = 0
+            else:
+                # Exponential backoff with jitter while the server is unreachable
+                self.backoff = min(MAX_BACKOFF, max(1.0, self.backoff * 2)) * random.uniform(0.8, 1.2)
+
+    def query_top(self, mode="normal", limit=10):
+        payload = self.pool.request(proto.encode(proto.QUERY_TOP, proto.QUERY.pack(mode_index(mode), limit)),
+                                    proto.TOP)
+        return proto.decode_top(payload)
+
+    def query_rank(self, score, mode="normal"):
+        payload = self.pool.request(proto.encode(proto.QUERY_RANK, proto.QUERY.pack(mode_index(mode), score)),
+                                    proto.RANK)
+        return proto.RANK_INFO.unpack(payload)
+
+    def close(self):
+        self.stopped = True
+        self.wake.set()
+        self.thread.join(timeout=2)
+        self.pool.close()
+
+
+async def load_test(clients, rounds, host="127.0.0.1"):
+    """Run `clients` LeaderboardSinks against a localhost server, each uploading `rounds` scores.
+
+    The kiosks go through the same queue, batching and connection code as the
+    game. Raises RuntimeError if the server's totals or top lists don't match
+    what was submitted.
+    """
+    server = LeaderboardServer()
+    await server.start(host, 0)
+    loop = asyncio.get_running_loop()
+    queue_dir = tempfile.mkdtemp(prefix="leaderboard-load-")
+    sinks = [LeaderboardSink(f"{host}:{server.port}", os.path.join(queue_dir, f"kiosk{i}.jsonl"),
+                             name=f"kiosk{i}", flush_interval=0.05)
+             for i in range(clients)]
+    submitted = [[] for _ in MODES]
+    try:
+        started = loop.time()
+        for _ in range(rounds):
+            for sink in sinks:
+                score, mode = random.randint(0, 80), random.randrange(len(MODES))
+                sink.submit(score, MODES[mode])
+                submitted[mode].append(score)
+        while any(sink.pending for sink in sinks):
+            await asyncio.sleep(0.01)
+        elapsed = loop.time() - started
+
+        total = clients * rounds
+        print(f"{server.scores_received} scores from {clients} clients in {elapsed:.2f}s "
+              f"({server.scores_received / max(elapsed, 1e-9):.0f} scores/s)")
+        if server.scores_received != total:
+            raise RuntimeError(f"Server counted {server.scores_received} scores, {total} were submitted")
+        for mode, board, scores in zip(MODES, server.boards, submitted):
+            # Queried through a kiosk's own connection, as the game would
+            top = await loop.run_in_executor(None, sinks[0].query_top, mode, TOP_N)
+            expected = sorted(scores, reverse=True)[:TOP_N]
+            if board.counts.total != len(scores) or [entry[0] for entry in top] != expected:
+                raise RuntimeError(f"{mode} leaderboard doesn't match the submitted scores")
+            print(f"  {mode}: {board.counts.total} scores, best {expected[0] if expected else '-'}")
+    finally:
+        await loop.run_in_executor(None, lambda: [sink.close() for sink in sinks])
+        await server.close()
+        shutil.rmtree(queue_dir, ignore_errors=True)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pokemon Quiz leaderboard server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--query", choices=MODES, help="Print the top scores from --address and exit")
+    parser.add_argument("--address", default=f"127.0.0.1:{DEFAULT_PORT}")
+    parser.add_argument("--load-test", type=int, default=0, metavar="N",
+                        help="Run N simulated kiosks against a localhost server and exit")
+    parser.add_argument("--rounds", type=int, default=100, help="Scores per kiosk in --load-test")
+    args = parser.parse_args()
+
+    if args.load_test:
+        asyncio.run(load_test(args.load_test, args.rounds))
+        return
+
+    if args.query:
+        pool = LeaderboardConnectionPool(*parse_address(args.address))
+        payload = pool.request(proto.encode(proto.QUERY_TOP, proto.QUERY.pack(mode_index(args.query), 10)),
+                               proto.TOP)
+        for rank, (score, _, timestamp, name) in enumerate(proto.decode_top(payload), 1):
+            print(f"{rank:>2}. {name:<20} {score:>4}  {time.strftime('%Y-%m-%d %H:%M', time.localtime(timestamp))}")
+        pool.close()
+        return
+
+    async def serve():
+        await LeaderboardServer().start(args.host, args.port)
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
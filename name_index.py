@@ -0,0 +1,185 @@
+"""Fast lookup of Pokemon names for the typed-answer mode.
+
+Names are normalised (lower case, accents and punctuation dropped, gender
+symbols spelled out), so "Farfetchd" matches "Farfetch'd" and "mr mime"
+matches "Mr. Mime". Two structures are built once per name list:
+
+- a trie whose nodes store their best few completions, so autocomplete for
+  each keystroke is just a walk down the typed prefix;
+- a bigram index, so typo-tolerant matching only runs the edit distance
+  against the handful of names sharing enough letter pairs with the input.
+
+Suggestions are memoised per input, so retyping or deleting a letter is a
+dictionary hit.
+"""
+import unicodedata
+
+SUGGESTION_LIMIT = 5
+GENDER_SYMBOLS = {"♀": "f", "♂": "m"}
+
+
+def normalize(name):
+    """Comparable form of a name: lower case letters and digits only"""
+    for symbol, letter in GENDER_SYMBOLS.items():
+        name = name.replace(symbol, letter)
+    name = unicodedata.normalize("NFKD", name)
+    return "".join(c for c in name.lower() if c.isalnum())
+
+
+def edit_distance(a, b, limit=None):
+    """Damerau-Levenshtein (optimal string alignment) distance between a and b.
+
+    With a limit, returns limit + 1 as soon as the distance must exceed it.
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            cost = 0 if ca == cb else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if limit is not None and row_min > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def bigrams(key):
+    """Letter pairs of a normalised name, padded so the first and last letters count too"""
+    padded = f"^{key}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def typo_tolerance(normalized_name):
+    """How many typos still count as right for a name of this length"""
+    if len(normalized_name) <= 4:
+        return 0
+    if len(normalized_name) <= 7:
+        return 1
+    return 2
+
+
+class _TrieNode:
+    __slots__ = ("children", "suggestions")
+
+    def __init__(self):
+        self.children = {}
+        self.suggestions = []
+
+
+class NameIndex:
+    def __init__(self, names, suggestion_limit=SUGGESTION_LIMIT):
+        """names is an iterable of display names, in the order suggestions should prefer"""
+        self.suggestion_limit = suggestion_limit
+        # Normalised form -> display names (a few normalise to the same key)
+        self.by_key = {}
+        for name in names:
+            self.by_key.setdefault(normalize(name), []).append(name)
+
+        self.trie = _TrieNode()
+        for key, display_names in self.by_key.items():
+            self._trie_insert(key, display_names)
+
+        self.keys = list(self.by_key)
+        # Bigram -> positions in self.keys of the names containing it
+        self.postings = {}
+        for position, key in enumerate(self.keys):
+            for gram in bigrams(key):
+                self.postings.setdefault(gram, []).append(position)
+
+        self._suggestion_cache = {}
+
+    def _trie_insert(self, key, display_names):
+        node = self.trie
+        for name in display_names:
+            if len(node.suggestions) < self.suggestion_limit:
+                node.suggestions.append(name)
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+            for name in display_names:
+                if len(node.suggestions) < self.suggestion_limit:
+                    node.suggestions.append(name)
+
+    def complete(self, prefix):
+        """Names starting with what has been typed so far"""
+        node = self.trie
+        for char in normalize(prefix):
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.suggestions
+
+    def fuzzy(self, text, max_distance):
+        """(distance, normalised name) pairs within max_distance of text, closest first"""
+        grams = bigrams(text)
+        counts = {}
+        for gram in grams:
+            for position in self.postings.get(gram, ()):
+                counts[position] = counts.get(position, 0) + 1
+
+        # One edit can break at most three of the input's bigrams
+        needed = len(grams) - 3 * max_distance
+        results = []
+        for position, shared in counts.items():
+            if shared < needed:
+                continue
+            key = self.keys[position]
+            if abs(len(key) - len(text)) > max_distance:
+                continue
+            distance = edit_distance(text, key, max_distance)
+            if distance <= max_distance:
+                results.append((distance, key))
+        results.sort()
+        return results
+
+    def suggest(self, text):
+        """Autocomplete suggestions, topped up with near misses once a few letters are typed"""
+        key = normalize(text)
+        cached = self._suggestion_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # An exact name goes first, even when a longer one comes earlier in the Pokedex
+        suggestions = list(self.by_key.get(key, ()))
+        suggestions += [name for name in self.complete(key) if name not in suggestions]
+        suggestions = suggestions[:self.suggestion_limit]
+        if len(suggestions) < self.suggestion_limit and len(key) >= 3:
+            for _, match in self.fuzzy(key, typo_tolerance(key) or 1):
+                for name in self.by_key[match]:
+                    if name not in suggestions:
+                        suggestions.append(name)
+            suggestions = suggestions[:self.suggestion_limit]
+        self._suggestion_cache[key] = suggestions
+        return suggestions
+
+    def is_correct(self, typed, name):
+        """Whether a typed answer should count as the given Pokemon"""
+        typed_key = normalize(typed)
+        name_key = normalize(name)
+        if not typed_key:
+            return False
+        if typed_key == name_key:
+            return True
+        # "Nidoran" is accepted for both Nidoran♀ and Nidoran♂
+        if name_key[-1:] in ("f", "m") and any(s in name for s in GENDER_SYMBOLS) and typed_key == name_key[:-1]:
+            return True
+
+        tolerance = typo_tolerance(name_key)
+        if tolerance == 0 or edit_distance(typed_key, name_key, tolerance) > tolerance:
+            return False
+        # A typo only counts if no other Pokemon is an even better match
+        matches = self.fuzzy(typed_key, tolerance)
+        return bool(matches) and any(key == name_key for d, key in matches if d == matches[0][0])
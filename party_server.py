@@ -0,0 +1,431 @@
+"""Party mode: one quiz round shared by every player on the LAN.
+
+The server owns a QuizEngine that picks the Pokemon. It broadcasts each
+sprite ID and a once-a-second timer tick to all connected players and collects
+their SPACE/BACKSPACE answers. A question moves on once every player has
+answered or QUESTION_TIMEOUT runs out.
+
+    python party_server.py --port 5555
+    python party_server.py --simulate 300 --duration 10
+"""
+import argparse
+import asyncio
+import csv
+import os
+import queue
+import random
+import threading
+import time
+
+import quiz_protocol as proto
+from quiz_engine import QuizEngine, QuizRoster, TIMER_DURATION
+
+DEFAULT_PORT = 5555
+QUESTION_TIMEOUT = 5.0
+TICK_INTERVAL = 0.05
+# Players whose socket buffer grows past this are too slow to keep up and are dropped
+MAX_WRITE_BUFFER = 256 * 1024
+
+
+def load_roster(names_file="pokemon_names.csv"):
+    """Read the Pokemon IDs from the names CSV without importing pygame"""
+    ids = []
+    with open(names_file, 'r', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if len(row) >= 2 and row[0].isdigit():
+                ids.append(row[0])
+    return QuizRoster(ids)
+
+
+class PartyPlayer:
+    __slots__ = ("player_id", "name", "transport", "score", "answered_seq", "answered_known")
+
+    def __init__(self, player_id, transport):
+        self.player_id = player_id
+        self.name = f"Player {player_id}"
+        self.transport = transport
+        self.score = 0
+        self.answered_seq = -1
+        self.answered_known = False
+
+
+class PartyConnection(asyncio.Protocol):
+    """One player's socket on the server side"""
+
+    def __init__(self, server):
+        self.server = server
+        self.decoder = proto.FrameDecoder()
+        self.player = None
+
+    def connection_made(self, transport):
+        self.player = self.server.add_player(transport)
+
+    def data_received(self, data):
+        for msg_type, payload in self.decoder.feed(data):
+            self.server.handle_message(self.player, msg_type, payload)
+
+    def connection_lost(self, exc):
+        self.server.remove_player(self.player)
+
+
+class PartyServer:
+    def __init__(self, roster, duration=TIMER_DURATION, hard_mode=False,
+                 question_timeout=QUESTION_TIMEOUT, auto_start=None):
+        self.engine = QuizEngine(roster, duration=duration, clock=time.monotonic)
+        self.engine.hard_mode = hard_mode
+        self.question_timeout = question_timeout
+        self.auto_start = auto_start
+        self.players = {}
+        self.next_player_id = 1
+        self.seq = 0
+        self.question_started = 0
+        self.answers = 0
+        self.known_answers = 0
+        self.last_tick = None
+        self.server = None
+        self.loop_task = None
+        self.rounds_played = 0
+
+    async def start(self, host="0.0.0.0", port=DEFAULT_PORT):
+        loop = asyncio.get_running_loop()
+        self.server = await loop.create_server(lambda: PartyConnection(self), host, port)
+        self.loop_task = asyncio.create_task(self._round_loop())
+        print(f"Party server listening on {host}:{self.port}")
+        return self
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.loop_task:
+            self.loop_task.cancel()
+        for player in list(self.players.values()):
+            player.transport.close()
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+    def add_player(self, transport):
+        player = PartyPlayer(self.next_player_id, transport)
+        self.next_player_id = (self.next_player_id % 0xFFFF) + 1
+        self.players[player.player_id] = player
+        transport.write(proto.encode_welcome(player.player_id))
+        # Late joiners pick up the round in progress
+        if self.engine.state == "game" and self.engine.current >= 0:
+            transport.write(proto.encode_round_start(self.engine.duration, self.engine.hard_mode))
+            transport.write(proto.encode_pokemon(self.seq, self.engine.current_pokemon_id))
+            transport.write(proto.encode_tick(self.engine.time_left))
+        return player
+
+    def remove_player(self, player):
+        if self.players.pop(player.player_id, None) is None:
+            return
+        if self.engine.state != "game" or self.engine.current < 0:
+            return
+        # Their answer no longer counts towards everyone having answered, or towards the room's tally
+        if player.answered_seq == self.seq:
+            self.answers -= 1
+            if player.answered_known:
+                self.known_answers -= 1
+        # The player everyone was waiting for may have just left
+        if self.players and self.answers >= len(self.players):
+            self.advance()
+
+    def broadcast(self, frame):
+        """Queue one pre-built frame on every socket without waiting on any of them"""
+        slow = []
+        for player in self.players.values():
+            transport = player.transport
+            if transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                slow.append(player)
+            else:
+                transport.write(frame)
+        for player in slow:
+            print(f"Dropping {player.name}: not keeping up")
+            player.transport.abort()
+            self.remove_player(player)
+
+    def handle_message(self, player, msg_type, payload):
+        if msg_type == proto.HELLO:
+            player.name = payload.decode("utf-8", "replace") or player.name
+        elif msg_type == proto.START:
+            if self.engine.state != "game":
+                self.start_round()
+        elif msg_type == proto.ANSWER and len(payload) == proto.SEQ_ANSWER.size:
+            seq, known = proto.SEQ_ANSWER.unpack(payload)
+            if self.engine.state != "game" or seq != self.seq or player.answered_seq == seq:
+                return
+            player.answered_seq = seq
+            player.answered_known = bool(known)
+            self.answers += 1
+            if known:
+                player.score += 1
+                self.known_answers += 1
+            if self.answers >= len(self.players):
+                self.advance()
+
+    def start_round(self):
+        for player in self.players.values():
+            player.score = 0
+            player.answered_seq = -1
+        self.engine.start_game()
+        self.last_tick = self.engine.time_left
+        self.broadcast(proto.encode_round_start(self.engine.duration, self.engine.hard_mode))
+        self.broadcast(proto.encode_tick(self.engine.time_left))
+        self._announce_pokemon()
+
+    def advance(self):
+        """Move the whole room on to the next Pokemon"""
+        if self.known_answers:
+            self.engine.next_pokemon()
+        else:
+            self.engine.skip_pokemon()
+        self.seq = (self.seq + 1) & 0xFFFF
+        self._announce_pokemon()
+
+    def _announce_pokemon(self):
+        self.answers = 0
+        self.known_answers = 0
+        self.question_started = time.monotonic()
+        if self.engine.current >= 0:
+            self.broadcast(proto.encode_pokemon(self.seq, self.engine.current_pokemon_id))
+
+    def end_round(self):
+        self.engine.end_game()
+        self.rounds_played += 1
+        results = sorted(
+            ((p.player_id, p.score, p.name) for p in self.players.values()),
+            key=lambda r: r[1], reverse=True,
+        )
+        self.broadcast(proto.encode_round_end(results))
+        print(f"Round over: {len(results)} players, room score {self.engine.current_score}")
+
+    async def _round_loop(self):
+        waiting_since = None
+        while True:
+            await asyncio.sleep(TICK_INTERVAL)
+            engine = self.engine
+
+            if engine.state != "game":
+                if self.auto_start is not None and self.players:
+                    if waiting_since is None:
+                        waiting_since = time.monotonic()
+                    elif time.monotonic() - waiting_since >= self.auto_start:
+                        waiting_since = None
+                        self.start_round()
+                continue
+
+            if engine.update_timer():
+                self.end_round()
+                continue
+            if engine.time_left != self.last_tick:
+                self.last_tick = engine.time_left
+                self.broadcast(proto.encode_tick(engine.time_left))
+            if time.monotonic() - self.question_started >= self.question_timeout:
+                self.advance()
+
+
+class PartyClientProtocol(asyncio.Protocol):
+    def __init__(self, client):
+        self.client = client
+        self.decoder = proto.FrameDecoder()
+
+    def connection_made(self, transport):
+        self.client.transport = transport
+        transport.write(proto.encode_hello(self.client.name))
+
+    def data_received(self, data):
+        for msg_type, payload in self.decoder.feed(data):
+            self.client.handle_message(msg_type, payload)
+
+    def connection_lost(self, exc):
+        self.client.handle_message(None, b"")
+
+
+class PartyClient:
+    """Connection to a party server for the pygame front end.
+
+    Networking runs on its own thread; decoded messages are queued as
+    (kind, value) tuples for the game loop to drain with poll().
+    """
+
+    def __init__(self, address, name="Player"):
+        host, _, port = address.rpartition(":")
+        if not host:
+            host, port = address, DEFAULT_PORT
+        self.host = host
+        self.port = int(port)
+        self.name = name
+        self.player_id = None
+        self.transport = None
+        self.loop = None
+        self.messages = queue.SimpleQueue()
+        # Set once connected, or once connecting has failed (with error set)
+        self.connected = threading.Event()
+        self.error = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def connect(self, timeout=5.0):
+        self.thread.start()
+        if not self.connected.wait(timeout):
+            raise ConnectionError(f"Could not connect to {self.host}:{self.port}: timed out")
+        if self.error is not None:
+            raise ConnectionError(f"Could not connect to {self.host}:{self.port}: {self.error}")
+        return self
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        try:
+            self.loop.run_until_complete(
+                self.loop.create_connection(lambda: PartyClientProtocol(self), self.host, self.port))
+        except OSError as e:
+            self.error = e
+            self.connected.set()
+            return
+        self.connected.set()
+        self.loop.run_forever()
+
+    def handle_message(self, msg_type, payload):
+        if msg_type == proto.WELCOME:
+            (self.player_id,) = proto.U16.unpack(payload)
+        elif msg_type == proto.ROUND_START:
+            duration, hard_mode = proto.ROUND_INFO.unpack(payload)
+            self.messages.put(("round_start", (duration, bool(hard_mode))))
+        elif msg_type == proto.POKEMON:
+            seq, number = proto.SEQ_POKEMON.unpack(payload)
+            self.messages.put(("pokemon", (seq, str(number).zfill(3))))
+        elif msg_type == proto.TICK:
+            self.messages.put(("tick", proto.U16.unpack(payload)[0]))
+        elif msg_type == proto.ROUND_END:
+            self.messages.put(("round_end", proto.decode_round_end(payload)))
+        elif msg_type is None:
+            self.messages.put(("disconnected", None))
+
+    def poll(self):
+        """Return every message received since the last call"""
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def _send(self, frame):
+        if self.loop and self.transport:
+            self.loop.call_soon_threadsafe(self.transport.write, frame)
+
+    def request_start(self):
+        self._send(proto.encode(proto.START))
+
+    def send_answer(self, seq, known):
+        """Answer the Pokemon the server sent as seq, i.e. the one on screen"""
+        self._send(proto.encode_answer(seq, known))
+
+    def close(self):
+        if self.loop:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+class SimulatedPlayer(asyncio.Protocol):
+    """Headless client that answers each Pokemon after a random delay"""
+
+    def __init__(self, stats, min_delay, max_delay):
+        self.stats = stats
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.decoder = proto.FrameDecoder()
+        self.transport = None
+        self.done = asyncio.get_running_loop().create_future()
+
+    def connection_made(self, transport):
+        self.transport = transport
+        transport.write(proto.encode_hello(f"bot{id(self) % 10000}"))
+
+    def data_received(self, data):
+        loop = asyncio.get_running_loop()
+        for msg_type, payload in self.decoder.feed(data):
+            if msg_type == proto.POKEMON:
+                seq, _ = proto.SEQ_POKEMON.unpack(payload)
+                self.stats["pokemon"] += 1
+                delay = random.uniform(self.min_delay, self.max_delay)
+                loop.call_later(delay, self._answer, seq, random.random() < 0.8)
+            elif msg_type == proto.TICK:
+                self.stats["ticks"] += 1
+            elif msg_type == proto.ROUND_END:
+                self.stats["round_ends"] += 1
+                if not self.done.done():
+                    self.done.set_result(proto.decode_round_end(payload))
+
+    def _answer(self, seq, known):
+        if not self.transport.is_closing():
+            self.transport.write(proto.encode_answer(seq, known))
+            self.stats["answers"] += 1
+
+    def connection_lost(self, exc):
+        if not self.done.done():
+            self.done.set_result(None)
+
+
+async def simulate(count, duration, host="127.0.0.1", port=0, min_delay=0.05, max_delay=0.5,
+                   names_file="pokemon_names.csv"):
+    """Run a server and `count` simulated players on localhost for one round"""
+    server = PartyServer(load_roster(names_file), duration=duration, auto_start=0.5)
+    await server.start(host, port)
+    loop = asyncio.get_running_loop()
+    stats = {"pokemon": 0, "ticks": 0, "answers": 0, "round_ends": 0}
+
+    players = []
+    for _ in range(count):
+        _, player = await loop.create_connection(
+            lambda: SimulatedPlayer(stats, min_delay, max_delay), host, server.port)
+        players.append(player)
+
+    started = time.monotonic()
+    results = await asyncio.gather(*(p.done for p in players))
+    elapsed = time.monotonic() - started
+
+    for player in players:
+        player.transport.close()
+    await server.close()
+
+    finished = sum(1 for r in results if r)
+    print(f"{finished}/{count} players finished in {elapsed:.1f}s")
+    print(f"Pokemon shown: {server.seq + 1}, messages received per player: "
+          f"{(stats['pokemon'] + stats['ticks'] + stats['round_ends']) / max(1, count):.1f}")
+    print(f"Answers sent: {stats['answers']}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pokemon Quiz party server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--duration", type=int, default=TIMER_DURATION)
+    parser.add_argument("--hard-mode", action="store_true")
+    parser.add_argument("--names", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                        "pokemon_names.csv"))
+    parser.add_argument("--auto-start", type=float, default=None,
+                        help="Start a round this many seconds after players are connected")
+    parser.add_argument("--simulate", type=int, default=0, metavar="N",
+                        help="Run one round against N simulated players on localhost and exit")
+    args = parser.parse_args()
+
+    if args.simulate:
+        asyncio.run(simulate(args.simulate, args.duration, names_file=args.names))
+        return
+
+    async def serve():
+        server = PartyServer(load_roster(args.names), duration=args.duration,
+                             hard_mode=args.hard_mode, auto_start=args.auto_start)
+        await server.start(args.host, args.port)
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
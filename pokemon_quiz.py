@@ -1,31 +1,31 @@
 import pygame
 import os
-import random
 import time
 import math
 import json
+import argparse
 import csv
+import random
 import sys
+from collections import OrderedDict
 from typing import List, Set
 
-# Helper function for PyInstaller asset bundling
-def resource_path(relative_path):
-    """ Get absolute path to resource, works for dev and for PyInstaller """
-    try:
-        # PyInstaller creates a temp folder and stores path in _MEIPASS
-        base_path = sys._MEIPASS
-        print(f"Running in PyInstaller bundle. Base path: {base_path}")
-    except Exception:
-        # Not running in a PyInstaller bundle, use current directory
-        base_path = os.path.abspath(".")
-        print(f"Running in development mode. Base path: {base_path}")
-
-    full_path = os.path.join(base_path, relative_path)
-    print(f"Resource path for '{relative_path}': {full_path}")
-    return full_path
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
-# Initialize pygame
-pygame.init()
+from quiz_engine import QuizEngine, QuizRoster, pokemon_id_from_filename
+from party_server import PartyClient
+from leaderboard import LeaderboardSink
+from session_log import ReplayError, resume
+from assets import resource_path, locate_sprite_dir, locate_sound_dir
+from sprite_store import STORAGE_MODES, pack_sprite, unpack_sprite, resolve_mode
+from name_index import NameIndex
+from sprite_similarity import FingerprintJob, load_index
+from shared_sprites import open_shared_sprites
+from audio import SoundBank, init_mixer
+from checkpoint import CheckpointJournal, CheckpointRecorder, load_checkpoint
 
 # Constants
 WINDOW_WIDTH = 1024
@@ -42,6 +42,12 @@ PINK = (255, 192, 203)
 DARK_PINK = (255, 150, 180)
 GOLD = (255, 215, 0)
 TIMER_DURATION = 60  # 60 seconds
+# "classic": SPACE means you knew it; "typed": type the name and it is checked;
+# "choice": pick the name from four look-alikes
+ANSWER_MODES = ("classic", "typed", "choice")
+CHOICE_COUNT = 4
+MAX_TYPED_LENGTH = 24
+FEEDBACK_SECONDS = 1.2
 POKEMON_NAMES_FILE = resource_path("pokemon_names.csv")
 
 # Get a writable location for high scores
@@ -75,26 +81,161 @@ def get_highscore_path():
         # Fallback to the template file
         return resource_path("empty_high_scores.json")
 
-HIGH_SCORE_FILE = get_highscore_path()
+# Resolved by bootstrap() so that importing this module has no side effects
+HIGH_SCORE_FILE = None
+MAX_SESSION_LOGS = 20
+
+def get_session_log_dir():
+    """Recorded rounds are kept next to the high scores"""
+    return os.path.join(os.path.dirname(HIGH_SCORE_FILE or get_highscore_path()), "sessions")
+
+# Display and fonts are created by init_display()
+screen = None
+title_font = None
+large_font = None
+medium_font = None
+small_font = None
+
+def init_display(fullscreen=False):
+    """Start only the SDL subsystems the game uses, then open the window and load fonts"""
+    pygame.display.init()
+    pygame.font.init()
+    
+    # Set up the display (resizable window, or fullscreen)
+    set_display_mode((WINDOW_WIDTH, WINDOW_HEIGHT), fullscreen)
+    pygame.display.set_caption("Pokémon Who?")
+
+def set_display_mode(size, fullscreen=False):
+    """(Re)create the window surface and fonts to match its size"""
+    global screen
+    
+    if fullscreen:
+        screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    else:
+        screen = pygame.display.set_mode(size, pygame.RESIZABLE)
+    load_fonts(get_ui_scale(screen.get_size()))
+    return screen
+
+def get_ui_scale(size):
+    """How much bigger than the 1024x768 design size the window is"""
+    return min(size[0] / WINDOW_WIDTH, size[1] / WINDOW_HEIGHT)
 
-# Set up the display (windowed)
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption("Pokémon Who?")
+def load_fonts(scale=1.0):
+    global title_font, large_font, medium_font, small_font
+    
+    title_font = pygame.font.Font(None, max(1, int(80 * scale)))
+    large_font = pygame.font.Font(None, max(1, int(60 * scale)))
+    medium_font = pygame.font.Font(None, max(1, int(48 * scale)))
+    small_font = pygame.font.Font(None, max(1, int(36 * scale)))
 
-# Load fonts
-title_font = pygame.font.Font(None, 80)
-large_font = pygame.font.Font(None, 60)
-medium_font = pygame.font.Font(None, 48)
-small_font = pygame.font.Font(None, 36)
+class SplashScreen:
+    """Loading screen shown while names and sprites are read at startup"""
+    def __init__(self, redraw_interval=0.05):
+        self.redraw_interval = redraw_interval
+        self.last_draw = 0
+        self.message = "Loading..."
+        self.progress = 0.0
+        self.draw()
+        
+    def update(self, loaded, total, message=None):
+        """Report loading progress; redraws at most every redraw_interval seconds"""
+        if message:
+            self.message = message
+        self.progress = loaded / total if total else 1.0
+        now = time.time()
+        if now - self.last_draw >= self.redraw_interval or loaded >= total:
+            self.draw()
+            
+    def draw(self):
+        self.last_draw = time.time()
+        # Keep the window responsive while we're busy loading
+        pygame.event.pump()
+        
+        width, height = screen.get_size()
+        scale = get_ui_scale((width, height))
+        screen.fill(LIGHT_PINK)
+        title_surf = title_font.render("Pokémon Who?", True, BLACK)
+        title_rect = title_surf.get_rect(center=(width // 2, height // 3))
+        screen.blit(title_surf, title_rect)
+        
+        message_surf = small_font.render(self.message, True, BLACK)
+        message_rect = message_surf.get_rect(center=(width // 2, height // 2))
+        screen.blit(message_surf, message_rect)
+        
+        # Progress bar
+        bar_rect = pygame.Rect(width // 4, height // 2 + int(40 * scale), width // 2, int(24 * scale))
+        pygame.draw.rect(screen, WHITE, bar_rect, border_radius=12)
+        fill_rect = bar_rect.copy()
+        fill_rect.width = int(bar_rect.width * self.progress)
+        if fill_rect.width > 0:
+            pygame.draw.rect(screen, DARK_PINK, fill_rect, border_radius=12)
+        pygame.draw.rect(screen, BLACK, bar_rect, width=2, border_radius=12)
+        
+        pygame.display.flip()
 
 class AnimatedGradient:
-    def __init__(self, width, height, colors, speed=0.01):
-        self.width = width
-        self.height = height
+    """Multi-stop gradient drifting diagonally (or vertically) across the window.
+
+    The colour at a pixel depends only on x + y (or y), folded into a repeating
+    band that runs through the colour stops and back, one window-height long.
+    Moving the band by k pixels looks the same as reading k pixels further
+    along it, so a single surface one band wider than the window holds every
+    phase of the animation. Each frame is then one blit of the right window
+    into it, with no per-pixel work after a resize.
+    """
+    def __init__(self, width, height, colors, speed=0.01, direction="diagonal"):
         self.colors = colors
         self.speed = speed
+        self.direction = direction
         self.time = 0
-        self.surface = pygame.Surface((width, height))
+        self.resize(width, height)
+        
+    def resize(self, width, height):
+        self.width = width
+        self.height = height
+        self.period = max(1, height)
+        self.surface = self.render()
+        
+    def band_color(self, position):
+        """Colour at a position along the band, 0 <= position < period"""
+        fold = 1 - abs(2 * position / self.period - 1)
+        scaled = fold * (len(self.colors) - 1)
+        index = min(int(scaled), len(self.colors) - 2)
+        blend = scaled - index
+        start, end = self.colors[index], self.colors[index + 1]
+        return tuple(int(start[c] + (end[c] - start[c]) * blend) for c in range(3))
+        
+    def render(self):
+        """Draw the gradient plus one extra band, to be scrolled through"""
+        if self.direction == "diagonal":
+            size = (self.width + self.period, self.height)
+        else:
+            size = (self.width, self.height + self.period)
+        surface = pygame.Surface(size, 0, 32)
+        
+        if numpy is not None:
+            # Colours along the band, repeated for every position the surface covers
+            band = numpy.array([surface.map_rgb(self.band_color(k)) for k in range(self.period)], dtype=numpy.uint32)
+            along = band[numpy.arange(size[0] + size[1]) % self.period]
+            # Pixel (x, y) is along[x + y] (or along[y]): a strided view, no per-pixel index maths
+            step = along.itemsize
+            view = numpy.lib.stride_tricks.as_strided(
+                along, shape=size, strides=(step if self.direction == "diagonal" else 0, step), writeable=False)
+            pixels = pygame.surfarray.pixels2d(surface)
+            pixels[...] = view
+            del pixels
+        elif self.direction == "diagonal":
+            # Each anti-diagonal x + y = k is one colour
+            for k in range(size[0] + size[1] - 1):
+                pygame.draw.line(surface, self.band_color(k % self.period), (k, 0), (k - size[1] + 1, size[1] - 1))
+        else:
+            for y in range(size[1]):
+                pygame.draw.line(surface, self.band_color(y % self.period), (0, y), (size[0] - 1, y))
+        
+        # Match the display's pixel format so the per-frame blit is a straight copy
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return surface
         
     def update(self):
         self.time += self.speed
@@ -102,23 +243,17 @@ class AnimatedGradient:
             self.time = 0
             
     def draw(self, surface):
-        # Create a soft oscillating gradient
-        color_index = (math.sin(self.time) + 1) / 2  # Value between 0 and 1
-        
-        # Interpolate between the two colors
-        r = int(self.colors[0][0] + (self.colors[1][0] - self.colors[0][0]) * color_index)
-        g = int(self.colors[0][1] + (self.colors[1][1] - self.colors[0][1]) * color_index)
-        b = int(self.colors[0][2] + (self.colors[1][2] - self.colors[0][2]) * color_index)
-        
-        # Fill the surface with the interpolated color
-        self.surface.fill((r, g, b))
-        
-        # Blit the gradient surface onto the target surface
-        surface.blit(self.surface, (0, 0))
+        # Scroll one full band per animation cycle
+        offset = int(self.time / (2 * math.pi) * self.period) % self.period
+        if self.direction == "diagonal":
+            area = pygame.Rect(offset, 0, self.width, self.height)
+        else:
+            area = pygame.Rect(0, offset, self.width, self.height)
+        surface.blit(self.surface, (0, 0), area)
 
 class Button:
-    def __init__(self, x, y, width, height, text, color, hover_color, text_color=WHITE, font=medium_font, 
-                 border_radius=10, border_width=2, border_color=WHITE):
+    def __init__(self, x, y, width, height, text, color, hover_color, text_color=WHITE, font=None, 
+                 border_radius=10, border_width=2, border_color=WHITE, on_click=None):
         self.rect = pygame.Rect(x, y, width, height)
         self.x = x
         self.y = y
@@ -133,35 +268,59 @@ class Button:
         self.border_radius = border_radius
         self.border_width = border_width
         self.border_color = border_color
-        
-    def draw(self, surface):
-        # Check if mouse is over button
-        mouse_pos = pygame.mouse.get_pos()
-        is_hovered = self.rect.collidepoint(mouse_pos)
+        self.on_click = on_click
+        # Set by the WidgetLayer on mouse motion
+        self.hovered = False
+        self.visible = True
+        # Rendered look, redrawn only when something that affects it changes
+        self._cache = None
+        self._cache_key = None
+        
+    def render(self, font):
+        button_surf = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        local_rect = button_surf.get_rect()
         
         # Draw button with appropriate color
-        button_color = self.hover_color if is_hovered else self.color
-        pygame.draw.rect(surface, button_color, self.rect, border_radius=self.border_radius)
+        button_color = self.hover_color if self.hovered else self.color
+        pygame.draw.rect(button_surf, button_color, local_rect, border_radius=self.border_radius)
         
         # Draw border
-        pygame.draw.rect(surface, self.border_color, self.rect, 
+        pygame.draw.rect(button_surf, self.border_color, local_rect, 
                          width=self.border_width, border_radius=self.border_radius)
         
         # Render text
-        text_surf = self.font.render(self.text, True, self.text_color)
-        text_rect = text_surf.get_rect(center=self.rect.center)
-        surface.blit(text_surf, text_rect)
+        text_surf = font.render(self.text, True, self.text_color)
+        text_rect = text_surf.get_rect(center=local_rect.center)
+        button_surf.blit(text_surf, text_rect)
+        return button_surf
+        
+    def draw(self, surface, font=None):
+        font = font or self.font or medium_font
+        key = (self.text, self.hovered, self.color, self.rect.size, font)
+        if key != self._cache_key:
+            self._cache = self.render(font)
+            self._cache_key = key
+        surface.blit(self._cache, self.rect)
+        return self.hovered
+        
+    def move(self, x, y, width, height):
+        """Reposition the button, e.g. after the window is resized"""
+        self.rect = pygame.Rect(x, y, width, height)
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
         
-        return is_hovered
+    def contains(self, pos):
+        return self.visible and self.rect.collidepoint(pos)
         
-    def is_clicked(self):
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_clicked = pygame.mouse.get_pressed()[0]
-        return self.rect.collidepoint(mouse_pos) and mouse_clicked
+    def click(self):
+        if self.on_click:
+            self.on_click()
 
 class Checkbox:
-    def __init__(self, x, y, width, height, text, checked=False, font=small_font, 
-                text_color=BLACK, box_color=WHITE, check_color=GREEN):
+    def __init__(self, x, y, width, height, text, checked=False, font=None, 
+                text_color=BLACK, box_color=WHITE, check_color=GREEN, on_click=None):
         self.rect = pygame.Rect(x, y, width, height)
         self.box_rect = pygame.Rect(x, y, height, height)  # Square box
         self.text = text
@@ -170,41 +329,147 @@ class Checkbox:
         self.text_color = text_color
         self.box_color = box_color
         self.check_color = check_color
+        self.on_click = on_click
+        self.hovered = False
+        self.visible = True
+        self._cache = None
+        self._cache_key = None
+        
+    def render(self, font):
+        # The label may run past the clickable rect, so size the surface to fit it
+        text_surf = font.render(self.text, True, self.text_color)
+        box_size = self.box_rect.height
+        checkbox_surf = pygame.Surface((box_size + 10 + text_surf.get_width(), max(box_size, text_surf.get_height())),
+                                       pygame.SRCALPHA)
+        box_rect = pygame.Rect(0, (checkbox_surf.get_height() - box_size) // 2, box_size, box_size)
         
-    def draw(self, surface):
         # Draw the checkbox box
-        pygame.draw.rect(surface, self.box_color, self.box_rect, border_radius=3)
-        pygame.draw.rect(surface, BLACK, self.box_rect, width=2, border_radius=3)
+        pygame.draw.rect(checkbox_surf, self.box_color, box_rect, border_radius=3)
+        pygame.draw.rect(checkbox_surf, BLACK, box_rect, width=2, border_radius=3)
         
         # Draw the checkmark if checked
         if self.checked:
-            inner_rect = pygame.Rect(
-                self.box_rect.x + 4, 
-                self.box_rect.y + 4, 
-                self.box_rect.width - 8, 
-                self.box_rect.height - 8
-            )
-            pygame.draw.rect(surface, self.check_color, inner_rect, border_radius=2)
+            inner_rect = box_rect.inflate(-8, -8)
+            pygame.draw.rect(checkbox_surf, self.check_color, inner_rect, border_radius=2)
         
         # Render text
-        text_surf = self.font.render(self.text, True, self.text_color)
-        text_rect = text_surf.get_rect(midleft=(self.box_rect.right + 10, self.box_rect.centery))
-        surface.blit(text_surf, text_rect)
+        text_rect = text_surf.get_rect(midleft=(box_rect.right + 10, box_rect.centery))
+        checkbox_surf.blit(text_surf, text_rect)
+        return checkbox_surf
         
-    def is_clicked(self):
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_clicked = pygame.mouse.get_pressed()[0]
-        if self.rect.collidepoint(mouse_pos) and mouse_clicked:
-            return True
-        return False
+    def draw(self, surface):
+        font = self.font or small_font
+        key = (self.text, self.checked, self.box_rect.size, font)
+        if key != self._cache_key:
+            self._cache = self.render(font)
+            self._cache_key = key
+        surface.blit(self._cache, self._cache.get_rect(midleft=self.box_rect.midleft))
+        
+    def contains(self, pos):
+        return self.visible and self.rect.collidepoint(pos)
+        
+    def click(self):
+        self.toggle()
+        if self.on_click:
+            self.on_click()
+        
+    def move(self, x, y, width, height):
+        """Reposition the checkbox, e.g. after the window is resized"""
+        self.rect = pygame.Rect(x, y, width, height)
+        self.box_rect = pygame.Rect(x, y, height, height)
         
     def toggle(self):
         self.checked = not self.checked
         return self.checked
 
+class WidgetLayer:
+    """The widgets of one screen, with clicks and hover routed by pointer position.
+    
+    Widgets are bucketed into a coarse grid whenever the layout changes, so
+    finding the widget under the pointer only tests the few in one cell.
+    """
+    CELL_SIZE = 64
+    
+    def __init__(self, widgets):
+        self.widgets = list(widgets)
+        self.grid = {}
+        self.hovered = None
+        self.rebuild()
+        
+    def rebuild(self):
+        """Re-bucket the widgets after they moved"""
+        self.grid = {}
+        for widget in self.widgets:
+            rect = widget.rect
+            for cell_x in range(rect.left // self.CELL_SIZE, (rect.right - 1) // self.CELL_SIZE + 1):
+                for cell_y in range(rect.top // self.CELL_SIZE, (rect.bottom - 1) // self.CELL_SIZE + 1):
+                    self.grid.setdefault((cell_x, cell_y), []).append(widget)
+        
+    def widget_at(self, pos):
+        cell = (pos[0] // self.CELL_SIZE, pos[1] // self.CELL_SIZE)
+        # Later widgets are drawn on top, so they win
+        for widget in reversed(self.grid.get(cell, ())):
+            if widget.contains(pos):
+                return widget
+        return None
+        
+    def hover(self, pos):
+        """Move the hover highlight to whatever is under pos (None clears it)"""
+        widget = self.widget_at(pos) if pos is not None else None
+        if widget is not self.hovered:
+            if self.hovered is not None:
+                self.hovered.hovered = False
+            if widget is not None:
+                widget.hovered = True
+            self.hovered = widget
+        
+    def click(self, pos):
+        widget = self.widget_at(pos)
+        if widget is not None:
+            widget.click()
+        return widget
+
+class ScaledSpriteCache:
+    """Display-size copies of sprites keyed by (ID, size).
+    
+    Sprites are scaled the first time they're shown at a given size, so a window
+    resize only costs a rescale for the sprites that actually appear afterwards.
+    Least recently used entries are dropped past max_entries.
+    """
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        
+    def get(self, pokemon_id, image, size):
+        key = (pokemon_id, size)
+        scaled = self.entries.get(key)
+        if scaled is not None:
+            self.entries.move_to_end(key)
+            return scaled
+        
+        # Compressed sprites are only inflated here, on a cache miss
+        image = unpack_sprite(image)
+        if image.get_size() == size:
+            scaled = image
+        else:
+            try:
+                scaled = pygame.transform.smoothscale(image, size)
+            except ValueError:
+                # smoothscale only handles 24/32-bit surfaces
+                scaled = pygame.transform.scale(image, size)
+        self.entries[key] = scaled
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return scaled
+        
+    def clear(self):
+        self.entries.clear()
+
 class HighScoreManager:
-    def __init__(self, file_path=HIGH_SCORE_FILE):
-        self.file_path = file_path
+    def __init__(self, file_path=None, sink=None):
+        self.file_path = file_path or HIGH_SCORE_FILE or get_highscore_path()
+        # Optional LeaderboardSink that also receives every finished round
+        self.sink = sink
         self.high_scores = self.load_high_scores()
         
         # ALWAYS ensure top_score is 0 when first initializing the app
@@ -299,7 +564,10 @@ class HighScoreManager:
             print(f"Error saving high scores: {e}")
             print(f"Attempted to save to: {self.file_path}")
             
-    def add_score(self, score, date=None):
+    def add_score(self, score, date=None, mode="normal"):
+        if self.sink is not None:
+            self.sink.submit(score, mode)
+        
         if date is None:
             date = time.strftime("%Y-%m-%d %H:%M:%S")
             
@@ -353,20 +621,59 @@ def load_pokemon_names():
     return pokemon_dict
 
 class PokemonQuizGame:
-    def __init__(self):
-        self.state = "start"  # "start", "game", "end"
+    def __init__(self, party=None, leaderboard=None, splash=None, sprite_storage="rgba", shared_sprites=False,
+                 sound=True):
+        # Sound effects decode in the background while the rest loads
+        sprite_dir = locate_sprite_dir()
+        self.audio = SoundBank(locate_sound_dir(sprite_dir), enabled=sound)
+        
         self.pokemon_images = []
-        self.seen_pokemon = []
-        self.skipped_pokemon = []  # Track skipped Pokémon separately
-        self.current_pokemon = None
-        self.start_time = 0
-        self.time_left = TIMER_DURATION
+        # How sprites are held in memory: "rgba", "palette" or "compressed" (see sprite_store)
+        self.sprite_storage = resolve_mode(sprite_storage)
+        # Sprites come from a decoded store on disk shared with other instances (see shared_sprites).
+        # Off by default: the store takes about 1 GB and only pays off with several instances
+        self.shared_sprites = shared_sprites
+        
+        # Connected PartyClient when playing a shared round, otherwise None
+        self.party = party
+        self.party_results = None
+        # Sequence number of the party Pokemon on screen, sent back with the answer
+        self.party_seq = 0
+        
+        # Round rules live in the engine; this class only renders and handles input
+        self.engine = QuizEngine(QuizRoster([]), duration=TIMER_DURATION)
+        
+        # Solo rounds are recorded for replay, and journaled so a crash doesn't lose them;
+        # party rounds are driven by the server
+        self.checkpoints = None
+        self.resume_offer = None
+        if party is None:
+            # A round the last run didn't finish, read before the journal is reused
+            self.resume_offer = load_checkpoint()
+            self.checkpoints = CheckpointJournal()
+            self.engine.recorder = CheckpointRecorder(self.checkpoints, details=lambda: {"answer_mode": self.answer_mode})
         
         # Load Pokemon names
+        if splash:
+            splash.update(0, 1, "Loading Pokemon names...")
         self.pokemon_names = load_pokemon_names()
+        self.name_index = NameIndex(self.pokemon_names.values())
+        
+        # Typed-answer mode input
+        self.answer_mode = "classic"
+        self.typed_answer = ""
+        self.suggestions = []
+        self.answer_feedback = None  # (text, color, shown until)
+        
+        # Multiple-choice mode: look-alike index (None until loaded) and the current options
+        self.similarity = None
+        self.similarity_job = None
+        self.choice_rng = random.Random()
+        self.choice_names = []
+        self.choice_for = -1
         
         # High score system
-        self.high_score_manager = HighScoreManager()
+        self.high_score_manager = HighScoreManager(sink=leaderboard)
         # Force reset high scores to zero at app startup for Windows packaged version
         # This ensures each installation starts fresh
         if getattr(sys, 'frozen', False):  # Check if running in a PyInstaller bundle
@@ -375,16 +682,11 @@ class PokemonQuizGame:
             self.high_score_manager.high_scores["recent_scores"] = []
             self.high_score_manager.save_high_scores()
             
-        self.current_score = 0 # Final score for the round
-        self.score = 0         # Running score during the game
         self.is_new_high_score = False
-        self.first_interaction_done = False # Flag for initial state
-        
-        # Hard mode toggle
-        self.hard_mode = False
         
         # Animated background
-        self.gradient = AnimatedGradient(WINDOW_WIDTH, WINDOW_HEIGHT, [LIGHT_PINK, DARK_PINK])
+        width, height = screen.get_size()
+        self.gradient = AnimatedGradient(width, height, [LIGHT_PINK, PINK, DARK_PINK])
         
         # Animation variables
         self.fade_alpha = 0
@@ -397,69 +699,143 @@ class PokemonQuizGame:
         self.max_scroll = 0
         self.scroll_speed = 30
         
-        # Buttons
-        self.start_button = Button(
-            WINDOW_WIDTH // 2 - 150, 
-            WINDOW_HEIGHT // 5 + 150, 
-            300, 80, "START", 
-            GREEN, (100, 255, 100)
-        )
-        
-        self.restart_button = Button(
-            WINDOW_WIDTH // 2 - 150, 
-            WINDOW_HEIGHT - 100, 
-            300, 80, "PLAY AGAIN", 
-            GREEN, (100, 255, 100)
-        )
-        
-        self.scroll_up_button = Button(
-            WINDOW_WIDTH - 80, 
-            280, 
-            60, 40, "▲", 
-            GRAY, (150, 150, 150)
-        )
-        
-        self.scroll_down_button = Button(
-            WINDOW_WIDTH - 80, 
-            WINDOW_HEIGHT - 180, 
-            60, 40, "▼", 
-            GRAY, (150, 150, 150)
-        )
+        # Buttons and checkboxes are positioned by layout()
+        self.start_button = Button(0, 0, 300, 80, "START", GREEN, (100, 255, 100), on_click=self.start_game)
+        self.resume_button = Button(0, 0, 400, 45, "", BLUE, (100, 180, 255), on_click=self.resume_round)
+        self.resume_button.visible = self.resume_offer is not None
+        self.restart_button = Button(0, 0, 300, 80, "PLAY AGAIN", GREEN, (100, 255, 100), on_click=self.restart_game)
+        self.scroll_up_button = Button(0, 0, 60, 40, "▲", GRAY, (150, 150, 150),
+                                       on_click=lambda: self.scroll(-self.scroll_speed))
+        self.scroll_down_button = Button(0, 0, 60, 40, "▼", GRAY, (150, 150, 150),
+                                         on_click=lambda: self.scroll(self.scroll_speed))
         
         # Hard mode checkbox
-        self.hard_mode_checkbox = Checkbox(
-            WINDOW_WIDTH // 2 - 80,
-            WINDOW_HEIGHT // 5 + 250,
-            240, 30, "Hard Mode",
-            checked=False
-        )
+        self.hard_mode_checkbox = Checkbox(0, 0, 240, 30, "Hard Mode", checked=False)
+        
+        # Answer mode selector, cycles through ANSWER_MODES
+        self.answer_mode_button = Button(0, 0, 300, 40, "Answers: Classic", GRAY, (150, 150, 150),
+                                         on_click=self.cycle_answer_mode)
+        self.choice_buttons = [Button(0, 0, 300, 50, "", BLUE, (100, 180, 255),
+                                      on_click=lambda option=i: self.answer_choice(option))
+                               for i in range(CHOICE_COUNT)]
         
         # End screen hard mode checkbox
-        self.end_hard_mode_checkbox = Checkbox(
-            WINDOW_WIDTH // 2 - 80,
-            WINDOW_HEIGHT - 130,
-            240, 30, "Hard Mode",
-            checked=False
-        )
+        self.end_hard_mode_checkbox = Checkbox(0, 0, 240, 30, "Hard Mode", checked=False)
+        
+        # Widgets of each screen; mouse events are routed to the one for the current state
+        self.widget_layers = {
+            "start": WidgetLayer([self.start_button, self.hard_mode_checkbox, self.answer_mode_button,
+                                  self.resume_button]),
+            "game": WidgetLayer(self.choice_buttons),
+            "end": WidgetLayer([self.restart_button, self.end_hard_mode_checkbox,
+                                self.scroll_up_button, self.scroll_down_button]),
+        }
+        # Screen whose hover highlight matches the pointer
+        self.hover_state = None
+        
+        # Window size the layout was computed for, and sprites scaled to fit it
+        self.window_size = None
+        self.ui_scale = 1.0
+        self.sprite_cache = ScaledSpriteCache()
+        self.fullscreen = bool(screen.get_flags() & pygame.FULLSCREEN)
+        self.windowed_size = (WINDOW_WIDTH, WINDOW_HEIGHT)
+        self.layout()
         
         # Load Pokemon images
-        self.load_pokemon_images()
+        self.image_dir = None
+        self.load_pokemon_images(progress=splash.update if splash else None, image_dir=sprite_dir)
+        if self.image_dir:
+            self.similarity = load_index(self.image_dir)
         
         # Game state variables
         self.reset_game()
 
+    def s(self, value):
+        """Scale a 1024x768 design measurement to the current window"""
+        return int(value * self.ui_scale)
+
+    def layout(self):
+        """Position widgets for the live window size"""
+        width, height = screen.get_size()
+        self.window_size = (width, height)
+        self.ui_scale = get_ui_scale(self.window_size)
+        s = self.s
+        
+        self.start_button.move(width // 2 - s(150), height // 5 + s(150), s(300), s(80))
+        self.resume_button.move(width // 2 - s(200), s(25), s(400), s(45))
+        self.restart_button.move(width // 2 - s(150), height - s(100), s(300), s(80))
+        self.scroll_up_button.move(width - s(80), s(280), s(60), s(40))
+        self.scroll_down_button.move(width - s(80), height - s(180), s(60), s(40))
+        self.hard_mode_checkbox.move(width // 2 - s(80), height // 5 + s(250), s(240), s(30))
+        self.answer_mode_button.move(width // 2 - s(150), height // 5 + s(295), s(300), s(40))
+        for i, button in enumerate(self.choice_buttons):
+            # 2x2 grid below the sprite
+            column, row = i % 2, i // 2
+            button.move(width // 2 - s(310) + column * s(320), height - s(165) + row * s(58), s(300), s(50))
+        self.end_hard_mode_checkbox.move(width // 2 - s(80), height - s(130), s(240), s(30))
+        self.scroll_speed = s(30)
+        
+        for layer in self.widget_layers.values():
+            layer.rebuild()
+        self.hover_state = None
+        
+        if self.gradient.width != width or self.gradient.height != height:
+            self.gradient.resize(width, height)
+
+    def on_resize(self, size):
+        """Rebuild the window surface and layout after a resize"""
+        set_display_mode(size, self.fullscreen)
+        if not self.fullscreen:
+            self.windowed_size = screen.get_size()
+        self.layout()
+
+    def toggle_fullscreen(self):
+        self.fullscreen = not self.fullscreen
+        set_display_mode(self.windowed_size, self.fullscreen)
+        self.layout()
+
+    # Round state is read straight from the engine
+    @property
+    def state(self):
+        return self.engine.state
+    
+    @property
+    def seen_pokemon(self):
+        return self.engine.seen_pokemon
+    
+    @property
+    def skipped_pokemon(self):
+        return self.engine.skipped_pokemon
+    
+    @property
+    def score(self):
+        return self.engine.score
+    
+    @property
+    def current_score(self):
+        return self.engine.current_score
+    
+    @property
+    def time_left(self):
+        return self.engine.time_left
+    
+    @property
+    def hard_mode(self):
+        return self.engine.hard_mode
+    
+    @property
+    def current_pokemon(self):
+        """(ID, name, image) of the Pokemon on screen, or None"""
+        if self.engine.current < 0:
+            return None
+        return self.pokemon_images[self.engine.current]
+
     def reset_game(self):
         """Reset the game state for a new game"""
-        self.seen_pokemon = []
-        self.skipped_pokemon = []
-        self.current_pokemon = None
-        self.time_left = TIMER_DURATION
-        self.score = 0
-        self.current_score = 0
+        self.engine.reset()
         self.is_new_high_score = False
-        self.first_interaction_done = False
-        self.state = "start"
         self.scroll_y = 0
+        self.set_typed_answer("")
         
         # Only reload images if they were cleared
         if not self.pokemon_images:
@@ -473,60 +849,62 @@ class PokemonQuizGame:
         # Make end screen checkbox match start screen checkbox
         self.end_hard_mode_checkbox.checked = self.hard_mode_checkbox.checked
 
-    def load_pokemon_images(self):
-        """Load all Pokemon images from the img directory"""
-        image_dir = resource_path("img")
+    def load_pokemon_images(self, progress=None, image_dir=None):
+        """Load all Pokemon images from the img directory, reporting to progress(loaded, total, message)"""
+        image_dir = image_dir or locate_sprite_dir()
         print(f"Attempting to load images from: {image_dir}")
         
         if not os.path.exists(image_dir):
             print(f"Error: '{image_dir}' directory not found. Please create it and add Pokemon images.")
             return
+        self.image_dir = image_dir
         
-        for filename in sorted(os.listdir(image_dir)):
-            if filename.endswith(('.png', '.jpg', '.jpeg')):
-                try:
+        filenames = [f for f in sorted(os.listdir(image_dir)) if f.endswith(('.png', '.jpg', '.jpeg'))]
+        shared = open_shared_sprites(image_dir, filenames, progress) if self.shared_sprites else None
+        for count, filename in enumerate(filenames, 1):
+            if progress:
+                progress(count, len(filenames), f"Loading Pokemon {count}/{len(filenames)}...")
+            try:
+                if shared is not None:
+                    if filename not in shared:
+                        continue
+                    # RGBA sprites stay mapped; the other modes are packed from the mapped pixels
+                    original_image = pack_sprite(shared[filename], self.sprite_storage)
+                else:
                     image_path = os.path.join(image_dir, filename)
                     print(f"Loading image: {image_path}")
-                    original_image = pygame.image.load(image_path)
-                    
-                    # Scale image to fit the screen while maintaining aspect ratio
-                    scaled_image = self.scale_image(original_image)
-                    
-                    # Extract pokemon ID and name info
-                    pokemon_id = self.get_pokemon_id_from_filename(filename)
-                    
-                    # Get the name directly from the dictionary
-                    pokemon_name = "Unknown"
-                    if pokemon_id in self.pokemon_names:
-                        pokemon_name = self.pokemon_names[pokemon_id]
-                    else:
-                        print(f"WARNING: No name found for ID {pokemon_id}")
-                    
-                    # Store in our list (ID, name, image)
-                    self.pokemon_images.append((pokemon_id, pokemon_name, scaled_image))
-                    
-                except pygame.error as e:
-                    print(f"Could not load image {filename}: {e}")
+                    original_image = pack_sprite(pygame.image.load(image_path), self.sprite_storage)
+                
+                # Extract pokemon ID and name info
+                pokemon_id = self.get_pokemon_id_from_filename(filename)
+                
+                # Get the name directly from the dictionary
+                pokemon_name = "Unknown"
+                if pokemon_id in self.pokemon_names:
+                    pokemon_name = self.pokemon_names[pokemon_id]
+                else:
+                    print(f"WARNING: No name found for ID {pokemon_id}")
+                
+                # Store in our list (ID, name, image); images are scaled for the window when shown
+                self.pokemon_images.append((pokemon_id, pokemon_name, original_image))
+                
+            except pygame.error as e:
+                print(f"Could not load image {filename}: {e}")
         
         print(f"Loaded {len(self.pokemon_images)} Pokemon images")
         # Print first few entries as sample
         for i in range(min(5, len(self.pokemon_images))):
             pid, name, _ = self.pokemon_images[i]
             print(f"Loaded Pokemon {i+1}: ID={pid}, name={name}")
+        
+        # The engine draws roster indices, which line up with pokemon_images
+        self.engine.roster = QuizRoster(pid for pid, _, _ in self.pokemon_images)
+        self.engine.reset()
 
     def get_pokemon_id_from_filename(self, filename):
         """Extract Pokemon ID from filename"""
-        parts = filename.split('.')
-        base = parts[0]
-        
-        # Handle different filename formats (001.png or 001_Name.png)
-        if '_' in base:
-            id_part = base.split('_')[0]
-        else:
-            id_part = base
-            
-        # Ensure ID is consistently formatted (with leading zeros)
-        formatted_id = id_part.zfill(3)
+        # Handle different filename formats (001.png or 001_Name.png), with leading zeros
+        formatted_id = pokemon_id_from_filename(filename)
         print(f"Extracted ID '{formatted_id}' from filename '{filename}'")
         return formatted_id
     
@@ -550,116 +928,232 @@ class PokemonQuizGame:
         # Fallback to a more descriptive name if not found
         return f"Pokemon {pokemon_num}"
 
-    def scale_image(self, image):
-        """Scale image to fit the screen while maintaining aspect ratio"""
-        max_width = WINDOW_WIDTH * 0.7
-        max_height = WINDOW_HEIGHT * 0.7
+    def scale_image(self, image, pokemon_id=None):
+        """Scale image to fit the window while maintaining aspect ratio"""
+        width, height = screen.get_size()
+        max_width = width * 0.7
+        max_height = height * 0.7
         
         original_width, original_height = image.get_size()
         
-        if original_width > max_width or original_height > max_height:
-            scale_factor = min(max_width / original_width, max_height / original_height)
-            new_width = int(original_width * scale_factor)
-            new_height = int(original_height * scale_factor)
-            return pygame.transform.scale(image, (new_width, new_height))
-        
-        return image
+        # Grow with the window beyond the design size, but always fit the sprite area
+        scale_factor = min(self.ui_scale, max_width / original_width, max_height / original_height)
+        new_size = (max(1, int(original_width * scale_factor)), max(1, int(original_height * scale_factor)))
+        return self.sprite_cache.get(pokemon_id, image, new_size)
 
     def get_random_pokemon(self):
-        """Get a random Pokemon that hasn't been seen yet"""
-        if not self.pokemon_images:
+        """Get a random Pokemon that hasn't been seen yet and mark it as seen"""
+        index = self.engine.get_random_pokemon()
+        if index < 0:
             return None
-        
-        available_pokemon = [p for p in self.pokemon_images if p[0] not in self.seen_pokemon]
-        
-        if not available_pokemon:
-            # If all Pokemon have been seen, reset the list
-            self.seen_pokemon = []
-            available_pokemon = self.pokemon_images
-        
-        return random.choice(available_pokemon)
+        return self.pokemon_images[index]
 
     def start_game(self):
         """Start a new game"""
-        self.state = "game"
-        self.current_pokemon = self.get_random_pokemon()
-        # Initialize lists and score/state variables
-        self.seen_pokemon = []
-        self.skipped_pokemon = []
-        self.start_time = time.time()
-        self.time_left = TIMER_DURATION
-        self.is_new_high_score = False
-        self.score = 0 # Start score at 0
-        self.first_interaction_done = False # Reset flag
+        # In party mode the server starts the round for everyone
+        if self.party:
+            self.party.request_start()
+            return
         
         # Set hard mode based on checkbox state
-        self.hard_mode = self.hard_mode_checkbox.checked
+        self.engine.start_game(hard_mode=self.hard_mode_checkbox.checked)
+        self.audio.play("start")
+        self.is_new_high_score = False
+        self.set_typed_answer("")
+        # A new round replaces any unfinished one in the journal
+        self.clear_resume_offer()
+    
+    def resume_round(self):
+        """Pick up the round the last run didn't finish, with the time it had left"""
+        checkpoint = self.resume_offer
+        if checkpoint is None or self.party:
+            return
+        self.clear_resume_offer()
         
-        # Add the first pokemon to seen_pokemon
-        if self.current_pokemon:
-            pokemon_id = self.current_pokemon[0]
-            self.seen_pokemon.append(pokemon_id)
+        # Answer mode first, so the replayed round is journaled with it again
+        answer_mode = checkpoint.details.get("answer_mode", "classic")
+        if answer_mode in ANSWER_MODES:
+            while self.answer_mode != answer_mode:
+                self.cycle_answer_mode()
+        
+        try:
+            events = resume(checkpoint.log, self.engine, checkpoint.elapsed_ms)
+        except ReplayError as e:
+            print(f"Could not resume the unfinished round: {e}")
+            self.engine.reset()
+            self.checkpoints.round_finished()
+            return
+        
+        print(f"Resumed round after {events} answers with {self.time_left}s left")
+        self.hard_mode_checkbox.checked = self.hard_mode
+        self.is_new_high_score = False
+        self.set_typed_answer("")
+    
+    def clear_resume_offer(self):
+        self.resume_offer = None
+        self.resume_button.visible = False
+        self.resume_button.hovered = False
 
     def next_pokemon(self):
         """Show the next Pokemon and score the previous one if not skipped."""
-        # Score the pokemon that was just displayed, if interaction has happened
-        # or if it's the very first interaction.
-        if self.current_pokemon:
-            previous_pokemon_id = self.current_pokemon[0]
-            if not self.first_interaction_done:
-                # This is the first SPACE press. Score the initial Pokemon.
-                self.score += 1
-                self.first_interaction_done = True
-            elif previous_pokemon_id not in self.skipped_pokemon:
-                # This is a subsequent SPACE press. Score if not skipped.
-                self.score += 1
-        
-        # Get the next pokemon
-        self.current_pokemon = self.get_random_pokemon()
-        if self.current_pokemon:
-            pokemon_id = self.current_pokemon[0]
-            # Only add if not already in the list
-            if pokemon_id not in self.seen_pokemon:
-                self.seen_pokemon.append(pokemon_id)
+        if self.engine.current >= 0:
+            self.audio.play("correct")
+        if self.party:
+            self.send_party_answer(True)
+        else:
+            self.engine.next_pokemon()
 
     def skip_pokemon(self):
         """Skip the current Pokemon"""
-        # Mark that the first interaction has occurred
-        self.first_interaction_done = True
-        
-        if self.current_pokemon:
-            # Add current Pokemon to skipped list if not already there
-            pokemon_id = self.current_pokemon[0]
-            if pokemon_id not in self.skipped_pokemon:
-                self.skipped_pokemon.append(pokemon_id)
-            
-            # Get next Pokemon
-            next_pokemon = self.get_random_pokemon()
-            if next_pokemon:
-                self.current_pokemon = next_pokemon
-                
-                # Only add to seen_pokemon if not already in the list
-                pokemon_id = self.current_pokemon[0]
-                if pokemon_id not in self.seen_pokemon:
-                    self.seen_pokemon.append(pokemon_id)
+        if self.engine.current >= 0:
+            self.audio.play("skip")
+        if self.party:
+            self.send_party_answer(False)
+        else:
+            self.engine.skip_pokemon()
+
+    def restart_game(self):
+        """PLAY AGAIN, with the hard mode chosen on the end screen"""
+        self.hard_mode_checkbox.checked = self.end_hard_mode_checkbox.checked
+        self.start_game()
+    
+    def scroll(self, amount):
+        """Scroll the end screen list, staying within its bounds"""
+        self.scroll_y = min(self.max_scroll, max(0, self.scroll_y + amount))
+    
+    def cycle_answer_mode(self):
+        """Switch to the next answer mode"""
+        index = (ANSWER_MODES.index(self.answer_mode) + 1) % len(ANSWER_MODES)
+        self.answer_mode = ANSWER_MODES[index]
+        self.answer_mode_button.text = f"Answers: {self.answer_mode.title()}"
+        
+        # Fingerprint the sprites in the background the first time look-alikes are needed
+        if self.answer_mode == "choice" and self.similarity is None and self.similarity_job is None and self.image_dir:
+            self.similarity_job = FingerprintJob(self.image_dir)
+            self.similarity_job.start()
+    
+    def score_mode(self):
+        """Leaderboard category for the round just played"""
+        if self.answer_mode in ("typed", "choice"):
+            return self.answer_mode
+        return "hard" if self.hard_mode else "normal"
+    
+    def set_typed_answer(self, text):
+        """Update the typed answer and its autocomplete suggestions"""
+        self.typed_answer = text
+        # Suggestions are looked up once per keystroke, not every frame
+        self.suggestions = self.name_index.suggest(text) if text.strip() else []
+        self.answer_feedback = None
+    
+    def show_feedback(self, text, color):
+        self.answer_feedback = (text, color, time.time() + FEEDBACK_SECONDS)
+    
+    def submit_typed_answer(self):
+        """Check the typed name against the Pokemon on screen; an empty answer skips"""
+        if not self.current_pokemon:
+            return
+        pokemon_name = self.current_pokemon[1]
+        
+        if not self.typed_answer.strip():
+            self.skip_pokemon()
+            self.show_feedback(f"Skipped - it was {pokemon_name}", BLACK)
+        elif self.name_index.is_correct(self.typed_answer, pokemon_name):
+            self.set_typed_answer("")
+            self.next_pokemon()
+            self.show_feedback(f"Correct! {pokemon_name}", GREEN)
+        else:
+            self.show_feedback("Not quite - try again, or ENTER on an empty box to skip", RED)
+    
+    def handle_typed_key(self, event):
+        """Editing keys for the typed-answer box"""
+        if event.key == pygame.K_RETURN:
+            self.submit_typed_answer()
+        elif event.key == pygame.K_BACKSPACE:
+            self.set_typed_answer(self.typed_answer[:-1])
+        elif event.key == pygame.K_TAB and self.suggestions:
+            # Complete to the first suggestion
+            self.set_typed_answer(self.suggestions[0])
+
+    def prepare_choices(self):
+        """Pick the options for the Pokemon on screen: its name plus look-alikes"""
+        self.choice_for = self.engine.current
+        self.choice_names = []
+        if not self.current_pokemon:
+            return
+        pokemon_id, pokemon_name, _ = self.current_pokemon
+        
+        # Random Pokemon fill in until the look-alike index is ready
+        candidates = self.similarity.distractors(pokemon_id, CHOICE_COUNT - 1, self.choice_rng) if self.similarity else []
+        candidates += self.choice_rng.sample(self.engine.roster.ids, min(len(self.engine.roster), CHOICE_COUNT * 2))
+        
+        names = [pokemon_name]
+        for candidate in candidates:
+            name = self.pokemon_names.get(candidate)
+            if name and name not in names:
+                names.append(name)
+            if len(names) == CHOICE_COUNT:
+                break
+        self.choice_rng.shuffle(names)
+        self.choice_names = names
+        for i, button in enumerate(self.choice_buttons):
+            button.visible = i < len(names)
+    
+    def answer_choice(self, option):
+        """Answer with one of the options; a wrong pick counts as a skip"""
+        if not self.current_pokemon or option >= len(self.choice_names):
+            return
+        pokemon_name = self.current_pokemon[1]
+        if self.choice_names[option] == pokemon_name:
+            self.next_pokemon()
+            self.show_feedback(f"Correct! {pokemon_name}", GREEN)
+        else:
+            self.skip_pokemon()
+            self.show_feedback(f"No - it was {pokemon_name}", RED)
+
+    def send_party_answer(self, known):
+        """Answer the shared Pokemon and wait for the server to move on"""
+        if self.engine.current < 0:
+            return
+        self.engine.answer(known)
+        self.engine.current = -1
+        self.party.send_answer(self.party_seq, known)
+
+    def process_party_messages(self):
+        """Apply everything the party server has sent since the last frame"""
+        for kind, value in self.party.poll():
+            if kind == "round_start":
+                duration, hard_mode = value
+                self.engine.duration = duration
+                self.engine.start_game(hard_mode=hard_mode, draw=False)
+                self.audio.play("start")
+                self.is_new_high_score = False
+                self.party_results = None
+            elif kind == "pokemon" and self.state == "game":
+                # The room moved on before we answered
+                if self.engine.current >= 0:
+                    self.engine.answer(False)
+                self.party_seq, pokemon_id = value
+                self.engine.show(pokemon_id)
+                self.set_typed_answer("")
+            elif kind == "tick":
+                self.engine.time_left = value
+            elif kind == "round_end":
+                self.party_results = value
+                # The server's tally is authoritative
+                for player_id, score, _ in value:
+                    if player_id == self.party.player_id:
+                        self.engine.score = score
+                if self.state == "game":
+                    self.end_game()
+            elif kind == "disconnected":
+                print("Lost connection to party server - switching to solo play")
+                self.party = None
+                if self.state == "game":
+                    self.end_game()
 
     def end_game(self):
         """End the current game"""
-        self.state = "end"
-        
-        # Check if the last pokemon displayed needs to be marked as skipped
-        # because the timer ran out before the player acted on it.
-        if self.current_pokemon:
-            last_pokemon_id = self.current_pokemon[0]
-            # Add to skipped list if not already there
-            if last_pokemon_id not in self.skipped_pokemon:
-                self.skipped_pokemon.append(last_pokemon_id)
-            # Ensure it's also in the seen list (should be, but safe check)
-            if last_pokemon_id not in self.seen_pokemon:
-                self.seen_pokemon.append(last_pokemon_id)
-                 
-        # Set the final current_score for display and saving
-        self.current_score = self.score
+        self.engine.end_game()
         
         # Reset scroll position
         self.scroll_y = 0
@@ -672,7 +1166,7 @@ class PokemonQuizGame:
         print(f"Current top score: {top_score}, This game score: {self.current_score}")
         
         # Double check the top score isn't artificially high
-        if getattr(sys, 'frozen', False) and top_score > 20 and os.path.exists(HIGH_SCORE_FILE):
+        if getattr(sys, 'frozen', False) and top_score > 20 and os.path.exists(self.high_score_manager.file_path):
             print("Resetting suspiciously high score in packaged app")
             self.high_score_manager.high_scores["top_score"] = 0
             top_score = 0
@@ -680,23 +1174,60 @@ class PokemonQuizGame:
         if self.current_score > top_score:
             self.is_new_high_score = True
             print(f"New high score achieved: {self.current_score}")
+        self.audio.play("high_score" if self.is_new_high_score else "time_up")
         
         # Save the score
-        self.high_score_manager.add_score(self.current_score)
+        self.high_score_manager.add_score(self.current_score, mode=self.score_mode())
+        
+        if self.engine.recorder is not None and self.engine.recorder.finished:
+            self.save_session_log()
+
+    def save_session_log(self):
+        """Write the round's replay log and prune old ones"""
+        try:
+            session_log_dir = get_session_log_dir()
+            os.makedirs(session_log_dir, exist_ok=True)
+            # Milliseconds in the name, and never overwriting, as rounds can end in the same second
+            now = time.time()
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"-{int(now * 1000) % 1000:03d}"
+            for attempt in range(100):
+                log_path = os.path.join(session_log_dir, f"{stamp}-{attempt}.pqs" if attempt else f"{stamp}.pqs")
+                try:
+                    self.engine.recorder.save(log_path, overwrite=False)
+                    break
+                except FileExistsError:
+                    continue
+            else:
+                raise FileExistsError(f"No free log name for {stamp}")
+            print(f"Saved round log to {log_path} ({len(self.engine.recorder.data)} bytes)")
+            
+            logs = sorted(f for f in os.listdir(session_log_dir) if f.endswith(".pqs"))
+            for old_log in logs[:-MAX_SESSION_LOGS]:
+                os.remove(os.path.join(session_log_dir, old_log))
+        except Exception as e:
+            print(f"Error saving round log: {e}")
 
     def update(self):
         """Update game state"""
         # Update the gradient animation
         self.gradient.update()
         
-        if self.state == "game":
-            # Update timer
-            current_time = time.time()
-            self.time_left = max(0, TIMER_DURATION - int(current_time - self.start_time))
-            
-            # End game if time runs out
-            if self.time_left <= 0:
-                self.end_game()
+        # Update timer and end game if time runs out; party rounds follow the server's clock
+        if self.party:
+            self.process_party_messages()
+        elif self.engine.update_timer():
+            self.end_game()
+        elif self.checkpoints is not None:
+            self.engine.recorder.tick(self.engine)
+        
+        # Pick up the look-alike index once the background job has built it
+        if self.similarity_job is not None and not self.similarity_job.is_alive():
+            self.similarity = self.similarity_job.index
+            self.similarity_job = None
+        
+        # New options whenever a new Pokemon is shown
+        if self.answer_mode == "choice" and self.state == "game" and self.engine.current != self.choice_for:
+            self.prepare_choices()
         
         # Update animations only if in hard mode or not in game state
         if self.hard_mode or self.state != "game":
@@ -726,15 +1257,37 @@ class PokemonQuizGame:
             if event.type == pygame.QUIT:
                 return False
             
+            elif event.type == pygame.VIDEORESIZE and not self.fullscreen:
+                self.on_resize(event.size)
+            
             elif event.type == pygame.KEYDOWN:
                 # Quit on ESC
                 if event.key == pygame.K_ESCAPE:
                     return False
                 
+                # Toggle fullscreen on F11
+                elif event.key == pygame.K_F11:
+                    self.toggle_fullscreen()
+                
                 # Start game on Enter (from start screen)
                 elif event.key == pygame.K_RETURN and self.state == "start":
                     self.start_game()
                 
+                # Resume the unfinished round on R (from start screen)
+                elif event.key == pygame.K_r and self.state == "start" and self.resume_offer:
+                    self.resume_round()
+                
+                # Typed answers take over the keyboard during the game
+                elif self.state == "game" and self.answer_mode == "typed":
+                    self.handle_typed_key(event)
+                
+                # Keys 1-4 pick an option in multiple-choice mode
+                elif self.state == "game" and self.answer_mode == "choice":
+                    if pygame.K_1 <= event.key < pygame.K_1 + CHOICE_COUNT:
+                        self.answer_choice(event.key - pygame.K_1)
+                    elif event.key == pygame.K_BACKSPACE:
+                        self.skip_pokemon()
+                
                 # Next Pokemon on Space (during game)
                 elif event.key == pygame.K_SPACE and self.state == "game":
                     self.next_pokemon()
@@ -746,40 +1299,40 @@ class PokemonQuizGame:
                 # Scroll list on end screen with arrow keys
                 elif self.state == "end":
                     if event.key == pygame.K_UP:
-                        self.scroll_y = max(0, self.scroll_y - self.scroll_speed)
+                        self.scroll(-self.scroll_speed)
                     elif event.key == pygame.K_DOWN:
-                        self.scroll_y = min(self.max_scroll, self.scroll_y + self.scroll_speed)
+                        self.scroll(self.scroll_speed)
             
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                # Check button clicks
-                if self.state == "start":
-                    if self.start_button.is_clicked():
-                        self.start_game()
-                    elif self.hard_mode_checkbox.is_clicked():
-                        self.hard_mode_checkbox.toggle()
-                
-                elif self.state == "end":
-                    if self.restart_button.is_clicked():
-                        # Update hard mode from end screen
-                        self.hard_mode_checkbox.checked = self.end_hard_mode_checkbox.checked
-                        self.start_game()
-                    elif self.end_hard_mode_checkbox.is_clicked():
-                        self.end_hard_mode_checkbox.toggle()
-                    elif self.scroll_up_button.is_clicked():
-                        self.scroll_y = max(0, self.scroll_y - self.scroll_speed)
-                    elif self.scroll_down_button.is_clicked():
-                        self.scroll_y = min(self.max_scroll, self.scroll_y + self.scroll_speed)
-                    
-                # Handle mouse wheel scrolling
-                elif event.button == 4 and self.state == "end":  # Scroll up
-                    self.scroll_y = max(0, self.scroll_y - self.scroll_speed)
-                elif event.button == 5 and self.state == "end":  # Scroll down
-                    self.scroll_y = min(self.max_scroll, self.scroll_y + self.scroll_speed)
+            elif event.type == pygame.TEXTINPUT:
+                if self.state == "game" and self.answer_mode == "typed":
+                    self.set_typed_answer((self.typed_answer + event.text)[:MAX_TYPED_LENGTH])
+            
+            # Mouse events go to the current screen's widgets by position
+            elif event.type == pygame.MOUSEMOTION:
+                self.widget_layers[self.state].hover(event.pos)
+                self.hover_state = self.state
+            
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                if self.state != "game" or self.answer_mode == "choice":
+                    self.widget_layers[self.state].click(event.pos)
+            
+            # Scroll the end screen list with the mouse wheel
+            elif event.type == pygame.MOUSEWHEEL and self.state == "end":
+                self.scroll(-event.y * self.scroll_speed)
         
         return True
 
     def draw(self):
         """Draw the current game state to the screen"""
+        # Pick up size changes the window manager made without a resize event
+        if screen.get_size() != self.window_size:
+            self.layout()
+        
+        # After a screen change or relayout, highlight whatever is now under the pointer
+        if self.hover_state != self.state:
+            self.widget_layers[self.state].hover(pygame.mouse.get_pos() if pygame.mouse.get_focused() else None)
+            self.hover_state = self.state
+        
         # Draw animated background
         self.gradient.draw(screen)
         
@@ -794,23 +1347,33 @@ class PokemonQuizGame:
 
     def draw_start_screen(self):
         """Draw the start screen"""
+        width, height = screen.get_size()
+        
         # Draw title - move down slightly from 1/4 to 1/5
         title_surf = title_font.render("Pokemon Quiz Game", True, BLACK)
-        title_rect = title_surf.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 5))
+        title_rect = title_surf.get_rect(center=(width // 2, height // 5))
         screen.blit(title_surf, title_rect)
         
         # Draw high score - reduce gap after title
         high_score = self.high_score_manager.get_top_score()
         high_score_surf = medium_font.render(f"High Score: {high_score}", True, BLACK)
-        high_score_rect = high_score_surf.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 5 + 70))
+        high_score_rect = high_score_surf.get_rect(center=(width // 2, height // 5 + self.s(70)))
         screen.blit(high_score_surf, high_score_rect)
         
         # Draw start button - move up
         self.start_button.draw(screen)
         
+        # Draw the offer to resume a round the last run didn't finish
+        if self.resume_offer:
+            self.resume_button.text = f"RESUME LAST ROUND ({self.resume_offer.time_left}s) - R"
+            self.resume_button.draw(screen, small_font)
+        
         # Draw hard mode checkbox
         self.hard_mode_checkbox.draw(screen)
         
+        # Draw answer mode selector
+        self.answer_mode_button.draw(screen, small_font)
+        
         # Draw instructions - move up
         instructions = [
             "How to play:",
@@ -820,39 +1383,46 @@ class PokemonQuizGame:
             "4. Press ESC to quit"
         ]
         
+        if self.party:
+            instructions[0] = f"Party mode on {self.party.host}:{self.party.port} - START begins the round for everyone"
+        
         for i, text in enumerate(instructions):
             instr_surf = small_font.render(text, True, BLACK)
-            instr_rect = instr_surf.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT * 2/3 + i * 40))
+            instr_rect = instr_surf.get_rect(center=(width // 2, height * 2/3 + i * self.s(40)))
             screen.blit(instr_surf, instr_rect)
 
     def draw_game_screen(self):
         """Draw the game screen with Pokemon and timer"""
+        width, height = screen.get_size()
+        s = self.s
+        
         # Draw timer with color based on time left
         timer_color = GREEN if self.time_left > 10 else RED
         timer_surf = large_font.render(f"Time: {self.time_left}", True, timer_color)
-        timer_rect = timer_surf.get_rect(center=(WINDOW_WIDTH // 2, 40))
+        timer_rect = timer_surf.get_rect(center=(width // 2, s(40)))
         screen.blit(timer_surf, timer_rect)
         
         # Draw current score
         count_surf = medium_font.render(f"Score: {self.score}", True, BLACK)
-        count_rect = count_surf.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 40))
+        count_rect = count_surf.get_rect(center=(width // 2, height - s(40)))
         screen.blit(count_surf, count_rect)
         
         # Draw high score
         high_score = self.high_score_manager.get_top_score()
         high_score_surf = small_font.render(f"High Score: {high_score}", True, BLACK)
-        high_score_rect = high_score_surf.get_rect(topleft=(20, 20))
+        high_score_rect = high_score_surf.get_rect(topleft=(s(20), s(20)))
         screen.blit(high_score_surf, high_score_rect)
         
         # Draw hard mode indicator if enabled
         if self.hard_mode:
             hard_mode_surf = small_font.render("Hard Mode", True, RED)
-            hard_mode_rect = hard_mode_surf.get_rect(topright=(WINDOW_WIDTH - 20, 20))
+            hard_mode_rect = hard_mode_surf.get_rect(topright=(width - s(20), s(20)))
             screen.blit(hard_mode_surf, hard_mode_rect)
         
         # Draw current Pokemon with animation
         if self.current_pokemon:
             pokemon_id, pokemon_name, pokemon_image = self.current_pokemon
+            pokemon_image = self.scale_image(pokemon_image, pokemon_id)
             
             # Apply scaling animation if hard mode is enabled, otherwise just display at 100% scale
             if self.hard_mode:
@@ -864,20 +1434,77 @@ class PokemonQuizGame:
                 animated_image = pokemon_image
             
             # Center the image
-            image_rect = animated_image.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
+            image_rect = animated_image.get_rect(center=(width // 2, height // 2))
             screen.blit(animated_image, image_rect)
             
+            if self.answer_mode == "typed":
+                self.draw_typed_answer()
+                return
+            if self.answer_mode == "choice":
+                self.draw_choices()
+                return
+            
             # Draw semi-transparent "SPACE for next" text
             hint_surf = small_font.render("Press SPACE for next Pokemon | BACKSPACE to skip", True, BLACK)
             hint_surf.set_alpha(self.fade_alpha if self.hard_mode else 200)  # Constant alpha if not hard mode
-            hint_rect = hint_surf.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 100))
+            hint_rect = hint_surf.get_rect(center=(width // 2, height - s(100)))
             screen.blit(hint_surf, hint_rect)
+        elif self.party:
+            wait_surf = medium_font.render("Waiting for the other players...", True, BLACK)
+            wait_rect = wait_surf.get_rect(center=(width // 2, height // 2))
+            screen.blit(wait_surf, wait_rect)
+
+    def draw_typed_answer(self):
+        """Draw the answer box with autocomplete suggestions or feedback below it"""
+        width, height = screen.get_size()
+        s = self.s
+        
+        # Draw input box
+        box_rect = pygame.Rect(0, 0, s(420), s(40))
+        box_rect.center = (width // 2, height - s(110))
+        pygame.draw.rect(screen, WHITE, box_rect, border_radius=s(8))
+        pygame.draw.rect(screen, BLACK, box_rect, width=2, border_radius=s(8))
+        
+        # Blinking cursor after the text
+        cursor = "|" if int(time.time() * 2) % 2 == 0 else ""
+        text_surf = small_font.render(self.typed_answer + cursor, True, BLACK)
+        text_rect = text_surf.get_rect(midleft=(box_rect.left + s(12), box_rect.centery))
+        screen.blit(text_surf, text_rect)
+        
+        # Draw feedback from the last answer, otherwise the suggestions
+        if self.answer_feedback and time.time() < self.answer_feedback[2]:
+            line, color = self.answer_feedback[0], self.answer_feedback[1]
+        elif self.suggestions:
+            line, color = "   ".join(self.suggestions) + "   (TAB to complete)", GRAY
+        else:
+            line, color = "Type the name, ENTER to answer", GRAY
+        line_surf = small_font.render(line, True, color)
+        line_rect = line_surf.get_rect(center=(width // 2, height - s(76)))
+        screen.blit(line_surf, line_rect)
+
+    def draw_choices(self):
+        """Draw the four options and the result of the last pick"""
+        width = screen.get_width()
+        s = self.s
+        
+        for i, button in enumerate(self.choice_buttons[:len(self.choice_names)]):
+            button.text = f"{i + 1}. {self.choice_names[i]}"
+            button.draw(screen, small_font)
+        
+        # Draw feedback under the timer
+        if self.answer_feedback and time.time() < self.answer_feedback[2]:
+            feedback_surf = small_font.render(self.answer_feedback[0], True, self.answer_feedback[1])
+            feedback_rect = feedback_surf.get_rect(center=(width // 2, s(90)))
+            screen.blit(feedback_surf, feedback_rect)
 
     def draw_end_screen(self):
         """Draw the end screen with results"""
+        width = screen.get_width()
+        s = self.s
+        
         # Draw header
         header_surf = title_font.render("Time's Up!", True, RED)
-        header_rect = header_surf.get_rect(center=(WINDOW_WIDTH // 2, 60))
+        header_rect = header_surf.get_rect(center=(width // 2, s(60)))
         screen.blit(header_surf, header_rect)
         
         # Calculate stats
@@ -886,13 +1513,13 @@ class PokemonQuizGame:
         
         # Draw stats
         stats_surf = large_font.render(f"Score: {self.current_score}", True, BLACK)
-        stats_rect = stats_surf.get_rect(center=(WINDOW_WIDTH // 2, 120))
+        stats_rect = stats_surf.get_rect(center=(width // 2, s(120)))
         screen.blit(stats_surf, stats_rect)
         
         # Draw additional stats
         seen_text = f"Total Pokémon seen: {total_seen} (Skipped: {total_skipped})"
         seen_surf = medium_font.render(seen_text, True, BLACK)
-        seen_rect = seen_surf.get_rect(center=(WINDOW_WIDTH // 2, 170))
+        seen_rect = seen_surf.get_rect(center=(width // 2, s(170)))
         screen.blit(seen_surf, seen_rect)
         
         # Draw high score
@@ -904,9 +1531,21 @@ class PokemonQuizGame:
             high_score_text = f"New High Score: {high_score}!"
         
         high_score_surf = medium_font.render(high_score_text, True, high_score_color)
-        high_score_rect = high_score_surf.get_rect(center=(WINDOW_WIDTH // 2, 220))
+        high_score_rect = high_score_surf.get_rect(center=(width // 2, s(220)))
         screen.blit(high_score_surf, high_score_rect)
         
+        # Draw party standings
+        if self.party_results:
+            winner_id, winner_score, winner_name = self.party_results[0]
+            party_text = f"Winner: {winner_name} ({winner_score})"
+            for rank, (player_id, _, _) in enumerate(self.party_results, 1):
+                if self.party and player_id == self.party.player_id:
+                    party_text += f"  |  You placed #{rank} of {len(self.party_results)}"
+                    break
+            party_surf = small_font.render(party_text, True, BLUE)
+            party_rect = party_surf.get_rect(center=(width // 2, s(255)))
+            screen.blit(party_surf, party_rect)
+        
         # Draw hard mode checkbox (moved above restart button for visibility)
         self.end_hard_mode_checkbox.draw(screen)
         
@@ -915,7 +1554,7 @@ class PokemonQuizGame:
         
         # Draw list of seen Pokemon - position lower to add more space
         list_title_surf = medium_font.render("Pokemon You Saw:", True, BLACK)
-        list_title_rect = list_title_surf.get_rect(center=(WINDOW_WIDTH // 2, 290))
+        list_title_rect = list_title_surf.get_rect(center=(width // 2, s(290)))
         screen.blit(list_title_surf, list_title_rect)
         
         # Create the scrollable list view
@@ -923,15 +1562,18 @@ class PokemonQuizGame:
 
     def draw_scrollable_pokemon_list(self):
         """Draw a scrollable grid of seen Pokemon in the order they appeared"""
+        width, height = screen.get_size()
+        s = self.s
+        
         # Set up list area dimensions - position lower to add space after title
-        list_area_x = 80
-        list_area_y = 320  # Increased from 280 to add space after title
-        list_area_width = WINDOW_WIDTH - 160  # Leave margins on both sides
-        list_area_height = WINDOW_HEIGHT - list_area_y - 140  # Leave space for restart button
+        list_area_x = s(80)
+        list_area_y = s(320)  # Increased from 280 to add space after title
+        list_area_width = width - 2 * list_area_x  # Leave margins on both sides
+        list_area_height = height - list_area_y - s(140)  # Leave space for restart button
         
         # Create a clipping rect for the list area
         list_area_rect = pygame.Rect(list_area_x, list_area_y, list_area_width, list_area_height)
-        pygame.draw.rect(screen, (255, 255, 255, 100), list_area_rect, border_radius=10)
+        pygame.draw.rect(screen, (255, 255, 255, 100), list_area_rect, border_radius=s(10))
         
         # Get Pokemon info in the order they were seen
         seen_pokemon_info = []
@@ -957,8 +1599,9 @@ class PokemonQuizGame:
                 print(f"Debug - Pokemon {i+1}: ID={pid}, entry={entry}, skipped={skipped}")
         
         # Calculate grid layout - increase item_width for better spacing
-        item_height = 30
-        item_width = 250  # Increased from 200 to provide more space
+        item_height = s(30)
+        item_width = s(250)  # Increased from 200 to provide more space
+        item_gap = s(10)
         items_per_row = max(1, list_area_width // item_width)
         
         # Ensure even spacing between columns
@@ -967,7 +1610,7 @@ class PokemonQuizGame:
         
         # Calculate total content height for scrolling
         total_rows = math.ceil(len(seen_pokemon_info) / items_per_row)
-        total_content_height = total_rows * (item_height + 10)  # 10px vertical gap
+        total_content_height = total_rows * (item_height + item_gap)  # 10px vertical gap
         self.max_scroll = max(0, total_content_height - list_area_height)
         
         # Create a clipping mask to only show items within the list area
@@ -981,7 +1624,7 @@ class PokemonQuizGame:
             
             # Calculate position (with scrolling offset)
             x = list_area_x + horizontal_spacing + col * (item_width + horizontal_spacing)
-            y = list_area_y + 10 + row * (item_height + 10) - self.scroll_y
+            y = list_area_y + item_gap + row * (item_height + item_gap) - self.scroll_y
             
             # Only draw if visible in the viewport
             if list_area_y - item_height <= y <= list_area_y + list_area_height:
@@ -1002,6 +1645,7 @@ class PokemonQuizGame:
         screen.set_clip(original_clip)
         
         # Draw scroll buttons if needed
+        self.scroll_up_button.visible = self.scroll_down_button.visible = self.max_scroll > 0
         if self.max_scroll > 0:
             self.scroll_up_button.draw(screen)
             self.scroll_down_button.draw(screen)
@@ -1009,11 +1653,11 @@ class PokemonQuizGame:
             # Draw scroll indicator (optional)
             if self.max_scroll > 0:
                 scroll_percent = self.scroll_y / self.max_scroll
-                indicator_height = max(30, list_area_height * (list_area_height / total_content_height))
+                indicator_height = max(s(30), list_area_height * (list_area_height / total_content_height))
                 indicator_y = list_area_y + (list_area_height - indicator_height) * scroll_percent
                 
-                indicator_rect = pygame.Rect(WINDOW_WIDTH - 50, indicator_y, 10, indicator_height)
-                pygame.draw.rect(screen, GRAY, indicator_rect, border_radius=5)
+                indicator_rect = pygame.Rect(width - s(50), indicator_y, s(10), indicator_height)
+                pygame.draw.rect(screen, GRAY, indicator_rect, border_radius=s(5))
 
     def run(self):
         """Main game loop"""
@@ -1024,6 +1668,7 @@ class PokemonQuizGame:
         if not self.pokemon_names:
             print("Pokemon names dictionary is empty - reloading from CSV...")
             self.pokemon_names = load_pokemon_names()
+            self.name_index = NameIndex(self.pokemon_names.values())
         
         # Ensure Pokemon images are loaded at startup
         if not self.pokemon_images:
@@ -1046,9 +1691,58 @@ class PokemonQuizGame:
         # Ensure high scores are saved when closing
         print("Game closing - saving high scores...")
         self.high_score_manager.save_high_scores()
+        # An unfinished round stays in the journal, to be offered next time
+        if self.checkpoints is not None:
+            self.checkpoints.close()
+        if self.high_score_manager.sink is not None:
+            self.high_score_manager.sink.close()
         
         pygame.quit()
 
+def bootstrap(fullscreen=False, sound=True):
+    """Staged startup: show the window and splash first, then do the slower file work"""
+    global HIGH_SCORE_FILE
+    
+    init_display(fullscreen)
+    splash = SplashScreen()
+    
+    # The mixer is opened here, with a small buffer, rather than by pygame.init()
+    if sound:
+        init_mixer()
+    
+    splash.update(0, 1, "Finding your high scores...")
+    HIGH_SCORE_FILE = get_highscore_path()
+    return splash
+
 if __name__ == "__main__":
-    game = PokemonQuizGame()
-    game.run() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Pokemon Quiz")
+    parser.add_argument("--join", metavar="HOST[:PORT]", help="Join a party server on the LAN")
+    parser.add_argument("--fullscreen", action="store_true", help="Start in fullscreen")
+    parser.add_argument("--sprite-storage", choices=STORAGE_MODES, default="rgba",
+                        help="Keep sprites as full RGBA, 8-bit palettes or compressed to save memory")
+    parser.add_argument("--shared-sprites", action="store_true",
+                        help="Decode sprites once into a store on disk (about 1 GB) that every instance maps, "
+                             "for hosts running several instances")
+    parser.add_argument("--mute", action="store_true", help="Play without sound effects")
+    parser.add_argument("--name", default="Player", help="Your name in party mode and on the leaderboard")
+    parser.add_argument("--leaderboard", metavar="HOST[:PORT]", default=os.getenv("POKEMONQUIZ_LEADERBOARD"),
+                        help="Also upload scores to a shared leaderboard server")
+    args = parser.parse_args()
+    
+    splash = bootstrap(fullscreen=args.fullscreen, sound=not args.mute)
+    party = None
+    if args.join:
+        try:
+            party = PartyClient(args.join, args.name).connect()
+        except ConnectionError as e:
+            print(f"Party mode unavailable: {e}")
+            pygame.quit()
+            sys.exit(1)
+    leaderboard = None
+    if args.leaderboard:
+        queue_path = os.path.join(os.path.dirname(HIGH_SCORE_FILE), "leaderboard_queue.jsonl")
+        leaderboard = LeaderboardSink(args.leaderboard, queue_path, name=args.name)
+    game = PokemonQuizGame(party=party, leaderboard=leaderboard, splash=splash,
+                           sprite_storage=args.sprite_storage, shared_sprites=args.shared_sprites,
+                           sound=not args.mute)
+    game.run()
@@ -0,0 +1,197 @@
+import os
+import random
+import time
+from array import array
+
+# Default round length in seconds
+TIMER_DURATION = 60
+
+# Per-Pokemon flag bits kept in QuizEngine._flags
+_SEEN = 1
+_SKIPPED = 2
+
+
+def pokemon_id_from_filename(filename):
+    """Pokemon ID for an image file name (001.png or 001_Name.png)"""
+    base = filename.split('.')[0]
+    return base.split('_')[0].zfill(3)
+
+
+def roster_from_image_dir(image_dir):
+    """Roster in the same order PokemonQuizGame loads the sprites"""
+    return QuizRoster(pokemon_id_from_filename(filename)
+                      for filename in sorted(os.listdir(image_dir))
+                      if filename.endswith(('.png', '.jpg', '.jpeg')))
+
+
+class QuizRoster:
+    """Immutable list of Pokemon IDs shared by every session"""
+    __slots__ = ("ids", "index")
+
+    def __init__(self, pokemon_ids):
+        self.ids = tuple(pokemon_ids)
+        self.index = {pokemon_id: i for i, pokemon_id in enumerate(self.ids)}
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class QuizEngine:
+    """Round rules for one quiz session, independent of pygame.
+
+    Sessions only hold small per-round state (a flag byte and a draw-pool slot
+    per Pokemon plus the seen/skipped lists), so a single process can run
+    thousands of them side by side. Pokemon are referred to by their ID string
+    from the shared QuizRoster.
+    """
+    __slots__ = (
+        "roster", "duration", "clock", "rng", "seed", "recorder",
+        "state", "hard_mode", "score", "current_score", "first_interaction_done",
+        "start_time", "time_left", "current", "seen_pokemon", "skipped_pokemon",
+        "_flags", "_pool",
+    )
+
+    def __init__(self, roster, duration=TIMER_DURATION, clock=time.time, rng=None):
+        self.roster = roster
+        self.duration = duration
+        self.clock = clock
+        # Per-session RNG, reseeded every round so a round can be replayed from its seed
+        self.rng = rng if rng is not None else random.Random()
+        self.seed = 0
+        # Optional SessionRecorder notified of every draw
+        self.recorder = None
+        self.hard_mode = False
+        self.reset()
+
+    def reset(self):
+        """Return to the start state with an empty round"""
+        self.state = "start"  # "start", "game", "end"
+        self.score = 0
+        self.current_score = 0
+        self.first_interaction_done = False
+        self.start_time = 0
+        self.time_left = self.duration
+        self.current = -1
+        self.seen_pokemon = []
+        self.skipped_pokemon = []
+        self._flags = bytearray(len(self.roster))
+        self._pool = array('H', range(len(self.roster)))
+
+    @property
+    def current_pokemon_id(self):
+        """ID of the Pokemon on screen, or None"""
+        if self.current < 0:
+            return None
+        return self.roster.ids[self.current]
+
+    def is_skipped(self, pokemon_id):
+        index = self.roster.index.get(pokemon_id)
+        return index is not None and bool(self._flags[index] & _SKIPPED)
+
+    def get_random_pokemon(self):
+        """Draw a random Pokemon that hasn't been seen yet and mark it as seen"""
+        if not self.roster.ids:
+            return -1
+
+        pool = self._pool
+        if not pool:
+            # If all Pokemon have been seen, reset the list
+            self.seen_pokemon = []
+            flags = self._flags
+            for i in range(len(flags)):
+                flags[i] &= ~_SEEN
+            pool.extend(range(len(flags)))
+
+        # Swap-remove so each draw is O(1)
+        slot = self.rng.randrange(len(pool))
+        index = pool[slot]
+        pool[slot] = pool[-1]
+        pool.pop()
+
+        self._flags[index] |= _SEEN
+        self.seen_pokemon.append(self.roster.ids[index])
+        return index
+
+    def start_game(self, hard_mode=None, draw=True, seed=None):
+        """Start a new round; draw=False leaves the first Pokemon to show()"""
+        if hard_mode is not None:
+            self.hard_mode = hard_mode
+        self.reset()
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng.seed(self.seed)
+        self.state = "game"
+        self.start_time = self.clock()
+        if draw:
+            self.current = self.get_random_pokemon()
+            if self.recorder is not None:
+                self.recorder.start(self)
+
+    def answer(self, known):
+        """Score (known) or skip the Pokemon on screen without drawing the next one"""
+        self.first_interaction_done = True
+        if self.current < 0:
+            return
+        if not known:
+            self._mark_skipped(self.current)
+        elif not self._flags[self.current] & _SKIPPED:
+            self.score += 1
+
+    def next_pokemon(self):
+        """Score the Pokemon on screen unless it was skipped, then show the next one"""
+        self.answer(True)
+        self.current = self.get_random_pokemon()
+        if self.recorder is not None:
+            self.recorder.record(self, next_pokemon=True)
+
+    def skip_pokemon(self):
+        """Skip the Pokemon on screen"""
+        if self.current >= 0:
+            self.answer(False)
+            self.current = self.get_random_pokemon()
+            if self.recorder is not None:
+                self.recorder.record(self, next_pokemon=False)
+        else:
+            self.first_interaction_done = True
+
+    def show(self, pokemon_id):
+        """Put a specific Pokemon on screen, for rounds whose draws come from elsewhere"""
+        index = self.roster.index.get(pokemon_id, -1)
+        if index >= 0 and not self._flags[index] & _SEEN:
+            self._flags[index] |= _SEEN
+            self.seen_pokemon.append(pokemon_id)
+            # Keep the local draw pool in step so it never repeats this one
+            pool = self._pool
+            slot = pool.index(index)
+            pool[slot] = pool[-1]
+            pool.pop()
+        self.current = index
+
+    def _mark_skipped(self, index):
+        if not self._flags[index] & _SKIPPED:
+            self._flags[index] |= _SKIPPED
+            self.skipped_pokemon.append(self.roster.ids[index])
+
+    def update_timer(self, now=None):
+        """Refresh time_left; returns True once a running round has run out of time"""
+        if self.state != "game":
+            return False
+        if now is None:
+            now = self.clock()
+        self.time_left = max(0, self.duration - int(now - self.start_time))
+        return self.time_left <= 0
+
+    def end_game(self):
+        """End the round and return the final score"""
+        self.state = "end"
+
+        # The Pokemon on screen when time ran out counts as skipped
+        if self.current >= 0:
+            self._mark_skipped(self.current)
+            if not self._flags[self.current] & _SEEN:
+                self._flags[self.current] |= _SEEN
+                self.seen_pokemon.append(self.roster.ids[self.current])
+
+        self.current_score = self.score
+        if self.recorder is not None:
+            self.recorder.finish(self)
+        return self.current_score
@@ -0,0 +1,155 @@
+import struct
+
+# Every frame is a 1-byte message type and a 2-byte payload length, then the payload
+HEADER = struct.Struct("!BH")
+MAX_PAYLOAD = 0xFFFF
+
+# Client -> server
+HELLO = 1         # player name (UTF-8)
+START = 2         # ask the server to start a round
+ANSWER = 3        # seq u16, known u8 (1 = SPACE, 0 = BACKSPACE)
+
+# Server -> client
+WELCOME = 10      # player id u16
+ROUND_START = 11  # duration u16, hard mode u8
+POKEMON = 12      # seq u16, pokemon number u16
+TICK = 13         # time left u16
+ROUND_END = 14    # count u16, then per player: id u16, score u16, name length u8, name
+
+# Leaderboard client -> server
+SUBMIT_BATCH = 20  # client id u32, batch id u32, count u16, then SCORE_ENTRY + name per score
+QUERY_TOP = 21     # mode u8, limit u16
+QUERY_RANK = 22    # mode u8, score u16
+
+# Leaderboard server -> client
+BATCH_ACK = 30     # batch id u32
+TOP = 31           # count u16, then SCORE_ENTRY + name per score
+RANK = 32          # rank u32, total u32
+
+U8 = struct.Struct("!B")
+U16 = struct.Struct("!H")
+SEQ_ANSWER = struct.Struct("!HB")
+ROUND_INFO = struct.Struct("!HB")
+SEQ_POKEMON = struct.Struct("!HH")
+RESULT = struct.Struct("!HHB")
+BATCH_HEADER = struct.Struct("!IIH")
+SCORE_ENTRY = struct.Struct("!HBIB")  # score, mode, unix time, name length
+U32 = struct.Struct("!I")
+QUERY = struct.Struct("!BH")
+RANK_INFO = struct.Struct("!II")
+
+
+def encode(msg_type, payload=b""):
+    """Build a single frame"""
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError(f"Payload too large: {len(payload)} bytes")
+    return HEADER.pack(msg_type, len(payload)) + payload
+
+
+def encode_hello(name):
+    return encode(HELLO, name.encode("utf-8")[:64])
+
+
+def encode_answer(seq, known):
+    return encode(ANSWER, SEQ_ANSWER.pack(seq & 0xFFFF, 1 if known else 0))
+
+
+def encode_welcome(player_id):
+    return encode(WELCOME, U16.pack(player_id))
+
+
+def encode_round_start(duration, hard_mode):
+    return encode(ROUND_START, ROUND_INFO.pack(duration, 1 if hard_mode else 0))
+
+
+def encode_pokemon(seq, pokemon_id):
+    return encode(POKEMON, SEQ_POKEMON.pack(seq & 0xFFFF, int(pokemon_id)))
+
+
+def encode_tick(time_left):
+    return encode(TICK, U16.pack(time_left))
+
+
+def encode_round_end(results):
+    """results is a list of (player id, score, name) tuples"""
+    parts = [U16.pack(len(results))]
+    for player_id, score, name in results:
+        raw_name = name.encode("utf-8")[:255]
+        parts.append(RESULT.pack(player_id, min(score, 0xFFFF), len(raw_name)))
+        parts.append(raw_name)
+    return encode(ROUND_END, b"".join(parts))
+
+
+def decode_round_end(payload):
+    (count,) = U16.unpack_from(payload, 0)
+    offset = U16.size
+    results = []
+    for _ in range(count):
+        player_id, score, name_len = RESULT.unpack_from(payload, offset)
+        offset += RESULT.size
+        name = payload[offset:offset + name_len].decode("utf-8", "replace")
+        offset += name_len
+        results.append((player_id, score, name))
+    return results
+
+
+def encode_scores(entries):
+    """entries is a list of (score, mode, unix time, name) tuples"""
+    parts = []
+    for score, mode, timestamp, name in entries:
+        raw_name = name.encode("utf-8")[:255]
+        parts.append(SCORE_ENTRY.pack(min(score, 0xFFFF), mode, int(timestamp), len(raw_name)))
+        parts.append(raw_name)
+    return b"".join(parts)
+
+
+def decode_scores(payload, offset, count):
+    entries = []
+    for _ in range(count):
+        score, mode, timestamp, name_len = SCORE_ENTRY.unpack_from(payload, offset)
+        offset += SCORE_ENTRY.size
+        name = payload[offset:offset + name_len].decode("utf-8", "replace")
+        offset += name_len
+        entries.append((score, mode, timestamp, name))
+    return entries
+
+
+def encode_batch(client_id, batch_id, entries):
+    return encode(SUBMIT_BATCH, BATCH_HEADER.pack(client_id, batch_id, len(entries)) + encode_scores(entries))
+
+
+def decode_batch(payload):
+    client_id, batch_id, count = BATCH_HEADER.unpack_from(payload, 0)
+    return client_id, batch_id, decode_scores(payload, BATCH_HEADER.size, count)
+
+
+def encode_top(entries):
+    return encode(TOP, U16.pack(len(entries)) + encode_scores(entries))
+
+
+def decode_top(payload):
+    (count,) = U16.unpack_from(payload, 0)
+    return decode_scores(payload, U16.size, count)
+
+
+class FrameDecoder:
+    """Incrementally splits a byte stream into (type, payload) frames"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, data):
+        self.buffer += data
+        frames = []
+        offset = 0
+        buffer = self.buffer
+        while len(buffer) - offset >= HEADER.size:
+            msg_type, length = HEADER.unpack_from(buffer, offset)
+            end = offset + HEADER.size + length
+            if end > len(buffer):
+                break
+            frames.append((msg_type, bytes(buffer[offset + HEADER.size:end])))
+            offset = end
+        if offset:
+            del buffer[:offset]
+        return frames
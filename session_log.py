@@ -0,0 +1,254 @@
+"""Compact binary recording of quiz rounds and deterministic replay.
+
+A log is a fixed header (RNG seed, hard mode flag, duration and a checksum of
+the roster order) followed by varint-packed records:
+
+    first Pokemon number
+    per SPACE/BACKSPACE: (ms since previous event << 2 | kind), Pokemon drawn next
+    at the end:          (ms since previous event << 2 | END), final score
+
+A typical event takes 3-4 bytes. Replaying re-seeds a QuizEngine with the
+recorded seed and feeds it the same inputs on a simulated clock. It checks
+every draw and the final score against the log, so a log that was edited, or
+produced by a different build, is rejected.
+
+    python session_log.py replay ~/.pokemonquiz/sessions/20250101-120000-000.pqs
+    python session_log.py replay round.pqs --repeat 10000
+"""
+import argparse
+import struct
+import sys
+import time
+import zlib
+
+from assets import locate_sprite_dir
+from quiz_engine import QuizEngine, roster_from_image_dir
+
+MAGIC = b"PQSL"
+VERSION = 1
+# magic, version, seed, hard mode, duration, roster size, roster checksum
+HEADER = struct.Struct("!4sBQBHHI")
+
+SPACE = 0
+BACKSPACE = 1
+END = 2
+
+
+class ReplayError(Exception):
+    """The log does not reproduce under the current rules and roster"""
+
+
+def roster_checksum(roster):
+    return zlib.crc32(",".join(roster.ids).encode("ascii"))
+
+
+def write_varint(buffer, value):
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ReplayError("Log ends in the middle of a record")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _pokemon_number(engine):
+    pokemon_id = engine.current_pokemon_id
+    return int(pokemon_id) if pokemon_id is not None else 0
+
+
+class SessionRecorder:
+    """Attach to QuizEngine.recorder to capture each round as it is played"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.last_ms = 0
+        self.finished = False
+
+    def start(self, engine):
+        self.data = bytearray(HEADER.pack(
+            MAGIC, VERSION, engine.seed, 1 if engine.hard_mode else 0,
+            engine.duration, len(engine.roster), roster_checksum(engine.roster)))
+        self.last_ms = 0
+        self.finished = False
+        write_varint(self.data, _pokemon_number(engine))
+
+    def _event(self, engine, kind):
+        now_ms = int((engine.clock() - engine.start_time) * 1000)
+        write_varint(self.data, (max(0, now_ms - self.last_ms) << 2) | kind)
+        self.last_ms = max(self.last_ms, now_ms)
+
+    def record(self, engine, next_pokemon):
+        if not self.data or self.finished:
+            return
+        self._event(engine, SPACE if next_pokemon else BACKSPACE)
+        write_varint(self.data, _pokemon_number(engine))
+
+    def finish(self, engine):
+        if not self.data or self.finished:
+            return
+        self._event(engine, END)
+        write_varint(self.data, engine.current_score)
+        self.finished = True
+
+    def save(self, path, overwrite=True):
+        """Write the log to path; without overwrite, raises FileExistsError if it is taken"""
+        with open(path, 'wb' if overwrite else 'xb') as f:
+            f.write(self.data)
+
+
+class ReplayResult:
+    __slots__ = ("score", "events", "seen", "skipped", "hard_mode", "elapsed_ms")
+
+    def __init__(self, engine, events, elapsed_ms):
+        self.score = engine.current_score
+        self.events = events
+        self.seen = len(engine.seen_pokemon)
+        self.skipped = len(engine.skipped_pokemon)
+        self.hard_mode = engine.hard_mode
+        self.elapsed_ms = elapsed_ms
+
+
+def _read_header(data, roster):
+    """(seed, hard mode, duration) of a log recorded with this roster"""
+    if len(data) < HEADER.size:
+        raise ReplayError("Log is too short")
+    magic, version, seed, hard_mode, duration, roster_size, checksum = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ReplayError("Not a session log, or an unsupported version")
+    if roster_size != len(roster) or checksum != roster_checksum(roster):
+        raise ReplayError("Log was recorded with a different set of Pokemon")
+    return seed, bool(hard_mode), duration
+
+
+def _start(data, engine, seed, hard_mode):
+    """Start the engine's round from the header; returns the offset of the first event"""
+    engine.start_game(hard_mode=hard_mode, seed=seed)
+    expected, offset = read_varint(data, HEADER.size)
+    if expected != _pokemon_number(engine):
+        raise ReplayError("First Pokemon does not match the recorded seed")
+    return offset
+
+
+def _step(data, offset, engine, kind, events):
+    """Apply one SPACE or BACKSPACE event and check the draw that followed"""
+    if kind == SPACE:
+        engine.next_pokemon()
+    elif kind == BACKSPACE:
+        engine.skip_pokemon()
+    else:
+        raise ReplayError(f"Unknown event type {kind}")
+
+    expected, offset = read_varint(data, offset)
+    if expected != _pokemon_number(engine):
+        raise ReplayError(f"Draw {events} diverged: log has #{expected}, replay drew #{_pokemon_number(engine)}")
+    return offset
+
+
+def replay(data, roster):
+    """Re-drive a QuizEngine from a log as fast as possible and verify every step"""
+    seed, hard_mode, duration = _read_header(data, roster)
+
+    now = [0.0]
+    engine = QuizEngine(roster, duration=duration, clock=lambda: now[0])
+    offset = _start(data, engine, seed, hard_mode)
+
+    elapsed_ms = 0
+    events = 0
+    while True:
+        packed, offset = read_varint(data, offset)
+        kind = packed & 3
+        elapsed_ms += packed >> 2
+        now[0] = elapsed_ms / 1000
+        if elapsed_ms > duration * 1000 + 1000:
+            raise ReplayError(f"Event at {elapsed_ms} ms is after the round ended")
+
+        if kind == END:
+            score, offset = read_varint(data, offset)
+            engine.end_game()
+            if score != engine.current_score:
+                raise ReplayError(f"Recorded score {score} but replay scored {engine.current_score}")
+            return ReplayResult(engine, events, elapsed_ms)
+
+        events += 1
+        offset = _step(data, offset, engine, kind, events)
+
+
+def resume(data, engine, elapsed_ms=0):
+    """Bring engine back to where an unfinished log left off, elapsed_ms into its round.
+
+    The log must end after a whole event. The engine's recorder sees the round
+    being replayed, so it ends up holding the same log and keeps recording.
+    Returns the number of events replayed.
+    """
+    seed, hard_mode, duration = _read_header(data, engine.roster)
+
+    # Replay on a simulated clock, so recorded event times stay as they were
+    clock = engine.clock
+    now = [0.0]
+    engine.clock = lambda: now[0]
+    engine.duration = duration
+    event_ms = 0
+    events = 0
+    try:
+        offset = _start(data, engine, seed, hard_mode)
+        while offset < len(data):
+            packed, offset = read_varint(data, offset)
+            kind = packed & 3
+            event_ms += packed >> 2
+            now[0] = event_ms / 1000
+            if kind == END:
+                raise ReplayError("Round already finished")
+            events += 1
+            offset = _step(data, offset, engine, kind, events)
+    finally:
+        engine.clock = clock
+
+    # Carry on with the time that was left
+    engine.start_time = clock() - max(elapsed_ms, event_ms) / 1000
+    engine.update_timer()
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay and verify recorded quiz rounds")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    replay_parser = subparsers.add_parser("replay", help="Verify a recorded round")
+    replay_parser.add_argument("log")
+    replay_parser.add_argument("--img", default=None, help="Sprite folder the round was played with")
+    replay_parser.add_argument("--repeat", type=int, default=1, help="Replay N times and report the rate")
+    args = parser.parse_args()
+
+    with open(args.log, 'rb') as f:
+        data = f.read()
+    roster = roster_from_image_dir(args.img or locate_sprite_dir())
+
+    try:
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            result = replay(data, roster)
+        elapsed = time.perf_counter() - started
+    except ReplayError as e:
+        print(f"Replay FAILED: {e}")
+        sys.exit(1)
+
+    print(f"Verified: score {result.score}, {result.events} events, {result.seen} seen, "
+          f"{result.skipped} skipped, hard mode {'on' if result.hard_mode else 'off'}")
+    print(f"Log size {len(data)} bytes ({len(data) / max(1, result.events):.1f} bytes per event)")
+    if args.repeat > 1:
+        print(f"{args.repeat} replays in {elapsed:.3f}s ({args.repeat / elapsed:.0f} rounds/s)")
+
+
+if __name__ == "__main__":
+    main()
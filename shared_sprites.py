@@ -0,0 +1,231 @@
+"""Decoded sprites cached on disk and shared by every quiz instance on the machine.
+
+Running one instance per display used to mean each one decoded all of img/
+into its own 1 GB of surfaces, on every launch. Instead, sprites are decoded
+once into a store file in the user data folder:
+
+    header   magic, version, sprite count, index offset and length
+    pixels   BGRA rows per sprite (the display's native 32-bit layout),
+             each sprite aligned to 64 bytes
+    index    JSON list of [filename, content hash, width, height, offset]
+
+Every instance maps the file read-only and wraps each sprite's bytes in a
+surface with pygame.image.frombuffer, which does not copy. The pages live in
+the OS page cache once and are shared by all processes mapping the file, so N
+instances cost about one set of sprite memory.
+
+A manifest next to the store remembers each source file's size, mtime and
+SHA-256, plus the processing parameters. A launch only stats the folder;
+files whose stat changed are re-hashed, and when sprites are added, changed
+or removed a new store is written that copies every unchanged sprite's
+pixels from the old one and decodes only the rest. Scaling to the window
+happens later and per window size (see ScaledSpriteCache), so the store holds
+full-size sprites.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+import pygame
+
+from assets import file_hash, user_data_dir
+
+MAGIC = b"PQSS"
+VERSION = 2
+# magic, version, sprite count, index offset, index length
+HEADER = struct.Struct("!4sBIQI")
+ALIGN = 64
+PIXEL_FORMAT = "BGRA"
+STORE_DIR = "sprite_store"
+# Anything that changes the stored pixels; a mismatch rebuilds every sprite
+PARAMS = {"version": VERSION, "format": PIXEL_FORMAT, "align": ALIGN}
+
+
+def store_key(image_dir):
+    """Stores and manifests for one sprite folder share this prefix"""
+    return "sprites-" + hashlib.sha1(os.path.abspath(image_dir).encode("utf-8")).hexdigest()[:16]
+
+
+def manifest_path(image_dir):
+    return os.path.join(user_data_dir(), STORE_DIR, store_key(image_dir) + ".json")
+
+
+def _aligned(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _write_json(path, data):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(temp_path, path)
+
+
+class SharedSpriteStore:
+    """Read-only view of a store file; surfaces point straight into the mapping"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.mapping)
+
+        magic, version, count, index_offset, index_size = HEADER.unpack_from(self.mapping, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a sprite store, or an old version")
+        if index_offset + index_size > len(self.mapping):
+            raise ValueError("sprite store is truncated")
+        self.index = json.loads(bytes(self.view[index_offset:index_offset + index_size]))
+        if len(self.index) != count:
+            raise ValueError("sprite store index is incomplete")
+
+        for _, _, width, height, offset in self.index:
+            if offset + width * height * 4 > index_offset:
+                raise ValueError("sprite store index points past the pixel data")
+
+    def __len__(self):
+        return len(self.index)
+
+    def pixels(self, offset, width, height):
+        return self.view[offset:offset + width * height * 4]
+
+    def by_hash(self):
+        """{content hash: (width, height, offset)}"""
+        return {digest: (width, height, offset) for _, digest, width, height, offset in self.index}
+
+    def surfaces(self):
+        """{filename: surface} without copying any pixels"""
+        return {filename: pygame.image.frombuffer(self.pixels(offset, width, height), (width, height), PIXEL_FORMAT)
+                for filename, _, width, height, offset in self.index}
+
+
+def build_store(image_dir, files, path, previous=None, progress=None):
+    """Write a store for files ({filename: content hash}), reusing sprites already in previous.
+
+    Returns how many sprites had to be decoded.
+    """
+    reusable = previous.by_hash() if previous is not None else {}
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    index = []
+    decoded = 0
+    with open(temp_path, 'wb') as f:
+        offset = _aligned(HEADER.size)
+        for count, (filename, digest) in enumerate(files.items(), 1):
+            if digest in reusable:
+                width, height, old_offset = reusable[digest]
+                data = previous.pixels(old_offset, width, height)
+            else:
+                if progress:
+                    progress(count, len(files), f"Preparing sprites {count}/{len(files)}...")
+                try:
+                    surface = pygame.image.load(os.path.join(image_dir, filename))
+                except pygame.error as e:
+                    print(f"Could not load image {filename}: {e}")
+                    continue
+                width, height = surface.get_size()
+                data = pygame.image.tobytes(surface, PIXEL_FORMAT)
+                decoded += 1
+            f.seek(offset)
+            f.write(data)
+            index.append([filename, digest, width, height, offset])
+            offset = _aligned(offset + width * height * 4)
+
+        # The header goes in last, so a half-written file is never valid
+        index_bytes = json.dumps(index).encode("utf-8")
+        f.seek(offset)
+        f.write(index_bytes)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, len(index), offset, len(index_bytes)))
+    try:
+        os.replace(temp_path, path)
+    except OSError:
+        # Another instance wrote the same store first and has it open (Windows)
+        os.remove(temp_path)
+    return decoded
+
+
+def current_hashes(image_dir, filenames, manifest):
+    """{filename: content hash}, hashing only files whose size or mtime changed.
+
+    Also returns the manifest's new per-file [size, mtime, hash] entries.
+    """
+    known = manifest.get("files", {}) if manifest.get("params") == PARAMS else {}
+    files = {}
+    stats = {}
+    for filename in filenames:
+        path = os.path.join(image_dir, filename)
+        st = os.stat(path)
+        stat = [st.st_size, st.st_mtime_ns]
+        entry = known.get(filename)
+        if entry and entry[:2] == stat:
+            digest = entry[2]
+        else:
+            digest = file_hash(path)
+        files[filename] = digest
+        stats[filename] = stat + [digest]
+    return files, stats
+
+
+def remove_stale_stores(image_dir, keep_name):
+    store_dir = os.path.join(user_data_dir(), STORE_DIR)
+    prefix = store_key(image_dir)
+    for name in os.listdir(store_dir):
+        if name.startswith(prefix + "-") and name.endswith(".bin") and name != keep_name:
+            try:
+                os.remove(os.path.join(store_dir, name))
+            except OSError:
+                # Still mapped by a running instance (Windows); removed next time
+                pass
+
+
+def _open_store(path):
+    try:
+        return SharedSpriteStore(path)
+    except (OSError, ValueError, struct.error) as e:
+        if os.path.exists(path):
+            print(f"Sprite store {path} is unusable: {e}")
+        return None
+
+
+def open_shared_sprites(image_dir, filenames, progress=None):
+    """{filename: surface} from the shared store, updating it first if the sprites changed.
+
+    Returns None if the store can't be used, so the caller loads sprites itself.
+    """
+    store_dir = os.path.join(user_data_dir(), STORE_DIR)
+    try:
+        os.makedirs(store_dir, exist_ok=True)
+        try:
+            with open(manifest_path(image_dir), 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+
+        files, stats = current_hashes(image_dir, filenames, manifest)
+        # The store is named after its contents, so instances agree on the file without locking
+        contents = hashlib.sha256(json.dumps([PARAMS, list(files.items())]).encode("utf-8")).hexdigest()[:16]
+        name = f"{store_key(image_dir)}-{contents}.bin"
+        path = os.path.join(store_dir, name)
+
+        store = _open_store(path)
+        if store is None:
+            previous = None
+            if manifest.get("store") and manifest.get("params") == PARAMS:
+                previous = _open_store(os.path.join(store_dir, manifest["store"]))
+            decoded = build_store(image_dir, files, path, previous, progress)
+            print(f"Updated sprite store {path}: decoded {decoded}, reused {len(files) - decoded}")
+            store = _open_store(path)
+            if store is None:
+                return None
+            previous = None
+            remove_stale_stores(image_dir, name)
+
+        if manifest.get("store") != name or manifest.get("files") != stats or manifest.get("params") != PARAMS:
+            _write_json(manifest_path(image_dir), {"params": PARAMS, "store": name, "files": stats})
+    except OSError as e:
+        print(f"Could not use the sprite store: {e}")
+        return None
+
+    print(f"Attached to sprite store {path} ({len(store)} sprites)")
+    return store.surfaces()
@@ -0,0 +1,256 @@
+"""Visually similar Pokemon, for multiple-choice distractors.
+
+Every sprite gets a perceptual fingerprint of 576 bytes, built from the
+sprite cropped to its visible pixels and shrunk to 32x32:
+
+- colour: square root of a 512-bin RGB histogram (3 bits per channel)
+- silhouette: opaque coverage of an 8x8 grid, weighted lightly
+
+Colour is what makes two sprites look alike at a glance; on the full roster
+this finds a sprite's own evolution line among its six closest matches far
+more often than bit hashes of shape or shading do.
+
+Fingerprints form one (sprites x 576) uint8 array stored in
+sprite_fingerprints.npz, either inside an asset pack (built offline) or in
+the user data folder (built once by a background job). A shipped file
+records the content hash of the sprites it was built from and is only used
+when that matches the pack's manifest; a built one records the folder's stat
+signature. Nearest neighbours by
+cosine similarity are precomputed for the whole roster with a few matrix
+products when the index loads, so picking distractors for a question is a
+list lookup.
+
+    python sprite_similarity.py build img sprite_fingerprints.npz
+    python sprite_similarity.py similar 025
+
+Needs NumPy; without it multiple-choice questions use random distractors.
+"""
+import argparse
+import os
+import threading
+import time
+
+import pygame
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from assets import MANIFEST_NAME, file_hash, list_images, load_manifest, pack_hash, stat_signature, user_data_dir
+from quiz_engine import pokemon_id_from_filename
+
+FINGERPRINT_FILE = "sprite_fingerprints.npz"
+# Marks a signature holding the sprites' content hash (an asset pack's pack_hash), not their stat signature
+CONTENT_PREFIX = "pack:"
+COLOR_BINS = 512
+SILHOUETTE_CELLS = 64
+FINGERPRINT_BYTES = COLOR_BINS + SILHOUETTE_CELLS
+# Silhouette coverage is scaled to this, colour to 255
+SILHOUETTE_WEIGHT = 25
+# Neighbours kept per sprite; distractors are drawn from the closest of these
+NEIGHBOURS = 12
+
+
+def fingerprint(surface):
+    """Perceptual fingerprint of a sprite surface, as FINGERPRINT_BYTES uint8 values"""
+    rect = surface.get_bounding_rect()
+    if rect.width == 0 or rect.height == 0:
+        rect = surface.get_rect()
+    # Copy into plain 32-bit RGBA so palette and colour-keyed sprites work too
+    crop = pygame.Surface(rect.size, pygame.SRCALPHA, 32)
+    crop.blit(surface, (0, 0), rect)
+
+    small = pygame.transform.smoothscale(crop, (32, 32))
+    rgba = numpy.frombuffer(pygame.image.tostring(small, "RGBA"), dtype=numpy.uint8).reshape(32, 32, 4)
+
+    opaque = rgba[rgba[:, :, 3] >= 128][:, :3] >> 5
+    colors = numpy.zeros(COLOR_BINS)
+    if len(opaque):
+        bins = (opaque[:, 0].astype(numpy.int32) << 6) | (opaque[:, 1] << 3) | opaque[:, 2]
+        colors = numpy.sqrt(numpy.bincount(bins, minlength=COLOR_BINS) / len(opaque))
+
+    coverage = rgba[:, :, 3].reshape(8, 4, 8, 4).mean(axis=(1, 3)) / 255
+
+    return numpy.concatenate([
+        numpy.round(colors * 255), numpy.round(coverage.ravel() * SILHOUETTE_WEIGHT)]).astype(numpy.uint8)
+
+
+def fingerprint_dir(image_dir, progress=None):
+    """(ids, fingerprints) for every sprite in a folder"""
+    filenames = list_images(image_dir)
+    ids = []
+    fingerprints = numpy.zeros((len(filenames), FINGERPRINT_BYTES), dtype=numpy.uint8)
+    for row, filename in enumerate(filenames):
+        if progress:
+            progress(row + 1, len(filenames))
+        fingerprints[row] = fingerprint(pygame.image.load(os.path.join(image_dir, filename)))
+        ids.append(pokemon_id_from_filename(filename))
+    return ids, fingerprints
+
+
+def unit_vectors(fingerprints):
+    vectors = fingerprints.astype(numpy.float32)
+    norms = numpy.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / numpy.maximum(norms, 1e-6)
+
+
+class SimilarityIndex:
+    def __init__(self, ids, fingerprints, neighbours=NEIGHBOURS, chunk=128):
+        self.ids = list(ids)
+        self.rows = {pokemon_id: row for row, pokemon_id in enumerate(self.ids)}
+        self.fingerprints = fingerprints
+
+        # Nearest neighbours of every sprite, a chunk of rows at a time to bound memory
+        count = len(self.ids)
+        neighbours = max(0, min(neighbours, count - 1))
+        self.neighbours = numpy.zeros((count, neighbours), dtype=numpy.uint16)
+        if neighbours == 0:
+            return
+        vectors = unit_vectors(fingerprints)
+        for start in range(0, count, chunk):
+            rows = numpy.arange(start, min(count, start + chunk))
+            # Cosine distance, with each sprite pushed out of its own neighbour list
+            distances = 1 - vectors[rows] @ vectors.T
+            distances[numpy.arange(len(rows)), rows] = 2
+            nearest = numpy.argpartition(distances, neighbours, axis=1)[:, :neighbours]
+            order = numpy.take_along_axis(distances, nearest, axis=1).argsort(axis=1, kind="stable")
+            self.neighbours[rows] = numpy.take_along_axis(nearest, order, axis=1)
+
+    def similar(self, pokemon_id):
+        """IDs of the most similar-looking Pokemon, closest first"""
+        row = self.rows.get(pokemon_id)
+        if row is None:
+            return []
+        return [self.ids[i] for i in self.neighbours[row]]
+
+    def distractors(self, pokemon_id, count, rng, pool=2):
+        """count look-alikes, picked at random from the closest count * pool so rounds vary"""
+        similar = self.similar(pokemon_id)[:count * pool]
+        return rng.sample(similar, min(count, len(similar)))
+
+
+def content_signature(image_dir, filenames):
+    """Signature of the sprites' contents, the same as the pack_hash of an asset pack built from them"""
+    return CONTENT_PREFIX + pack_hash({name: file_hash(os.path.join(image_dir, name)) for name in filenames})
+
+
+def pack_signature(image_dir):
+    """Content signature from the manifest of the asset pack holding image_dir, or None"""
+    pack_dir = os.path.dirname(os.path.abspath(image_dir))
+    if not os.path.exists(os.path.join(pack_dir, MANIFEST_NAME)):
+        return None
+    manifest = load_manifest(pack_dir)
+    return CONTENT_PREFIX + manifest["pack_hash"] if manifest else None
+
+
+def save_fingerprints(path, ids, fingerprints, signature):
+    """signature is the folder's stat signature, or its content signature for a file shipped in a pack"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Write to a temporary name first so an interrupted save is never picked up
+    with open(path + ".tmp", 'wb') as f:
+        numpy.savez_compressed(f, ids=numpy.array(ids), fingerprints=fingerprints, signature=numpy.array(signature))
+    os.replace(path + ".tmp", path)
+
+
+def load_fingerprints(path, ids, signature, shipped_signature=None):
+    """Stored fingerprints for exactly these ids, or None if missing or out of date.
+
+    signature is the sprite folder's stat signature; shipped_signature its
+    content signature from the pack manifest, if it is in a pack.
+    """
+    try:
+        with numpy.load(path, allow_pickle=False) as data:
+            stored_ids = [str(i) for i in data["ids"]]
+            stored_signature = str(data["signature"])
+            fingerprints = data["fingerprints"]
+    except (OSError, ValueError, KeyError) as e:
+        if os.path.exists(path):
+            print(f"Could not read sprite fingerprints from {path}: {e}")
+        return None
+    if stored_ids != list(ids) or fingerprints.shape != (len(ids), FINGERPRINT_BYTES):
+        return None
+    if stored_signature.startswith(CONTENT_PREFIX):
+        if stored_signature != shipped_signature:
+            return None
+    elif stored_signature != signature:
+        return None
+    return fingerprints
+
+
+def cached_fingerprint_paths(image_dir):
+    """Where fingerprints for a sprite folder may be stored, shipped file first"""
+    return [os.path.join(os.path.dirname(os.path.abspath(image_dir)), FINGERPRINT_FILE),
+            os.path.join(user_data_dir(), FINGERPRINT_FILE)]
+
+
+def load_index(image_dir):
+    """SimilarityIndex from stored fingerprints, or None if they need (re)building"""
+    if numpy is None or not os.path.isdir(image_dir):
+        return None
+    filenames = list_images(image_dir)
+    ids = [pokemon_id_from_filename(f) for f in filenames]
+    signature = stat_signature(image_dir, filenames)
+    shipped_signature = pack_signature(image_dir)
+    for path in cached_fingerprint_paths(image_dir):
+        fingerprints = load_fingerprints(path, ids, signature, shipped_signature)
+        if fingerprints is not None:
+            return SimilarityIndex(ids, fingerprints)
+    return None
+
+
+class FingerprintJob(threading.Thread):
+    """Builds and stores fingerprints for a sprite folder without blocking the game"""
+
+    def __init__(self, image_dir):
+        super().__init__(daemon=True)
+        self.image_dir = image_dir
+        self.index = None
+        self.progress = (0, 0)
+
+    def run(self):
+        try:
+            started = time.time()
+            ids, fingerprints = fingerprint_dir(self.image_dir, progress=self._progress)
+            save_fingerprints(os.path.join(user_data_dir(), FINGERPRINT_FILE), ids, fingerprints,
+                              stat_signature(self.image_dir, list_images(self.image_dir)))
+            self.index = SimilarityIndex(ids, fingerprints)
+            print(f"Fingerprinted {len(ids)} sprites in {time.time() - started:.1f}s")
+        except Exception as e:
+            print(f"Error fingerprinting sprites: {e}")
+
+    def _progress(self, done, total):
+        self.progress = (done, total)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sprite fingerprints for multiple-choice distractors")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Fingerprint a sprite folder, e.g. for an asset pack")
+    build_parser.add_argument("image_dir")
+    build_parser.add_argument("output", help="e.g. dist/PokemonQuiz-assets/" + FINGERPRINT_FILE)
+    similar_parser = subparsers.add_parser("similar", help="List the look-alikes of a Pokemon")
+    similar_parser.add_argument("pokemon_id")
+    similar_parser.add_argument("--img", default="img")
+    args = parser.parse_args()
+
+    if numpy is None:
+        parser.error("NumPy is required")
+
+    if args.command == "build":
+        started = time.time()
+        ids, fingerprints = fingerprint_dir(args.image_dir)
+        save_fingerprints(args.output, ids, fingerprints,
+                          content_signature(args.image_dir, list_images(args.image_dir)))
+        print(f"Fingerprinted {len(ids)} sprites in {time.time() - started:.1f}s -> {args.output}")
+    else:
+        index = load_index(args.img)
+        if index is None:
+            index = SimilarityIndex(*fingerprint_dir(args.img))
+        print(" ".join(index.similar(args.pokemon_id.zfill(3))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Compact in-memory storage for the sprite collection.
+
+Each 512x512 sprite takes 1 MB as a plain RGBA surface. Two smaller storage
+modes are available:
+
+- "palette": quantised to an 8-bit palette (exact when a sprite has at most
+  255 distinct colours after 5-bit-per-channel binning, which is typical for
+  the cel-shaded art). Transparent pixels become an RLE-accelerated colour
+  key. 4x smaller and still directly blittable. Needs NumPy; without it this
+  mode falls back to "compressed".
+- "compressed": zlib-compressed RGBA pixels, inflated only when a sprite
+  needs (re)scaling for display.
+
+benchmarks/bench_sprite_storage.py measures memory and blit speed per mode.
+"""
+import zlib
+
+import pygame
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+STORAGE_MODES = ("rgba", "palette", "compressed")
+# Palette slot reserved for transparent pixels
+TRANSPARENT_INDEX = 255
+TRANSPARENT_COLOR = (255, 0, 255)
+
+
+class CompressedSprite:
+    """RGBA pixels kept zlib-compressed until the sprite is displayed"""
+    __slots__ = ("size", "data")
+
+    def __init__(self, surface, level=6):
+        self.size = surface.get_size()
+        self.data = zlib.compress(pygame.image.tostring(surface, "RGBA"), level)
+
+    def get_size(self):
+        return self.size
+
+    def inflate(self):
+        return pygame.image.fromstring(zlib.decompress(self.data), self.size, "RGBA")
+
+
+def palettize(surface):
+    """8-bit copy of an RGBA surface with transparency as an RLE colour key"""
+    width, height = surface.get_size()
+    rgba = numpy.frombuffer(pygame.image.tostring(surface, "RGBA"), dtype=numpy.uint8).reshape(-1, 4)
+    opaque = rgba[:, 3] >= 128
+    rgb = rgba[opaque, :3].astype(numpy.int32)
+
+    # Bin to 5 bits per channel, then keep the 255 most common bins
+    bins = ((rgb[:, 0] >> 3) << 10) | ((rgb[:, 1] >> 3) << 5) | (rgb[:, 2] >> 3)
+    unique_bins, inverse, counts = numpy.unique(bins, return_inverse=True, return_counts=True)
+    # Each bin's colour is the average of the real pixels that fell into it
+    sums = numpy.stack([numpy.bincount(inverse, weights=rgb[:, c], minlength=len(unique_bins))
+                        for c in range(3)], axis=1)
+    bin_colors = sums / counts[:, None]
+
+    keep = numpy.argsort(counts)[::-1][:TRANSPARENT_INDEX]
+    palette_colors = bin_colors[keep]
+    if len(unique_bins) <= TRANSPARENT_INDEX:
+        bin_to_index = numpy.empty(len(unique_bins), dtype=numpy.uint8)
+        bin_to_index[keep] = numpy.arange(len(keep), dtype=numpy.uint8)
+    else:
+        # Map every leftover bin to its nearest palette colour
+        distances = ((bin_colors[:, None, :] - palette_colors[None, :, :]) ** 2).sum(axis=2)
+        bin_to_index = distances.argmin(axis=1).astype(numpy.uint8)
+
+    indices = numpy.full(width * height, TRANSPARENT_INDEX, dtype=numpy.uint8)
+    indices[opaque] = bin_to_index[inverse]
+
+    palette = [tuple(int(round(v)) for v in color) for color in palette_colors]
+    palette += [TRANSPARENT_COLOR] * (256 - len(palette))
+
+    sprite = pygame.image.fromstring(indices.tobytes(), (width, height), "P")
+    sprite.set_palette(palette)
+    sprite.set_colorkey(TRANSPARENT_INDEX, pygame.RLEACCEL)
+    return sprite
+
+
+def pack_sprite(surface, mode="rgba"):
+    """Convert a freshly loaded sprite to the chosen storage mode"""
+    if mode == "palette":
+        if numpy is not None:
+            return palettize(surface)
+        mode = "compressed"
+    if mode == "compressed":
+        return CompressedSprite(surface)
+    return surface
+
+
+def unpack_sprite(sprite):
+    """Blittable surface for a stored sprite"""
+    if isinstance(sprite, CompressedSprite):
+        return sprite.inflate()
+    return sprite
+
+
+def stored_size(sprite):
+    """Approximate bytes held for one stored sprite"""
+    if isinstance(sprite, CompressedSprite):
+        return len(sprite.data)
+    width, height = sprite.get_size()
+    size = width * height * sprite.get_bytesize()
+    if sprite.get_bytesize() == 1:
+        size += 256 * 4
+    return size
+
+
+def resolve_mode(mode):
+    """Storage mode that will actually be used, after the NumPy fallback"""
+    if mode == "palette" and numpy is None:
+        print("NumPy is not installed - using compressed sprite storage instead of palette")
+        return "compressed"
+    if mode not in STORAGE_MODES:
+        print(f"Unknown sprite storage mode '{mode}', using rgba")
+        return "rgba"
+    return mode
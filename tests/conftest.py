@@ -0,0 +1,13 @@
+"""Behaviour tests for the game's modules.
+
+    python -m pytest tests
+
+Timing checks live in benchmarks/ instead. Anything touching pygame runs
+headless under the SDL dummy drivers.
+"""
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,74 @@
+"""Asset packs: building, manifest checks and remembering a verified pack"""
+import json
+import os
+
+import pytest
+
+import assets
+from assets import build_pack, find_asset_pack, load_manifest, verify_pack
+
+
+@pytest.fixture
+def pack(tmp_path, monkeypatch):
+    """A pack of three fake sprites, found through POKEMONQUIZ_ASSETS, with an empty user data folder"""
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("APPDATA", str(tmp_path / "home"))
+    source = tmp_path / "img"
+    source.mkdir()
+    for number in (1, 2, 3):
+        (source / f"{number:03d}.png").write_bytes(bytes([number]) * 64)
+    (source / ".DS_Store").write_bytes(b"not a sprite")
+    pack_dir = tmp_path / assets.ASSET_PACK_NAME
+    build_pack(str(source), str(pack_dir))
+    monkeypatch.setenv("POKEMONQUIZ_ASSETS", str(pack_dir))
+    return pack_dir
+
+
+def test_build_writes_a_consistent_manifest(pack):
+    manifest = load_manifest(str(pack))
+    assert sorted(manifest["files"]) == ["001.png", "002.png", "003.png"]
+    assert verify_pack(str(pack), manifest)
+    assert find_asset_pack() == os.path.join(str(pack), "img")
+
+
+def test_corrupt_sprite_is_rejected(pack):
+    (pack / "img" / "002.png").write_bytes(b"tampered")
+    assert not verify_pack(str(pack), load_manifest(str(pack)))
+    assert find_asset_pack() is None
+
+
+def test_edited_manifest_is_rejected(pack):
+    manifest_path = pack / assets.MANIFEST_NAME
+    manifest = json.loads(manifest_path.read_text())
+    manifest["files"]["002.png"] = "0" * 64
+    manifest_path.write_text(json.dumps(manifest))
+    # The pack hash no longer matches the file list
+    assert load_manifest(str(pack)) is None
+    assert find_asset_pack() is None
+
+
+def test_sprites_missing_from_the_manifest_are_rejected(pack):
+    (pack / "img" / "004.png").write_bytes(b"extra")
+    assert find_asset_pack() is None
+
+
+def test_verified_pack_is_not_hashed_again(pack, monkeypatch):
+    assert find_asset_pack() is not None
+
+    def no_hashing(*args):
+        raise AssertionError("verified pack hashed again")
+
+    monkeypatch.setattr(assets, "verify_pack", no_hashing)
+    assert find_asset_pack() == os.path.join(str(pack), "img")
+
+    # A changed sprite changes the folder's signature, so the pack is checked again
+    monkeypatch.setattr(assets, "verify_pack", verify_pack)
+    (pack / "img" / "001.png").write_bytes(b"different size")
+    assert find_asset_pack() is None
+
+
+def test_falls_back_to_the_bundled_folder(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("POKEMONQUIZ_ASSETS", str(tmp_path / "missing"))
+    monkeypatch.setattr(assets, "candidate_pack_dirs", lambda: [str(tmp_path / "missing")])
+    assert assets.locate_sprite_dir() == assets.resource_path("img")
@@ -0,0 +1,183 @@
+"""Checkpoint journal: writing a round, reading it back after a crash and resuming it"""
+import os
+import time
+
+import pytest
+
+import checkpoint
+from checkpoint import CheckpointJournal, CheckpointRecorder, load_checkpoint
+from quiz_engine import QuizEngine, QuizRoster
+from session_log import ReplayError, SessionRecorder, resume
+
+DURATION = 60
+# SPACE or BACKSPACE, and how many seconds into the round it is pressed
+PRESSES = [(True, 0.8), (True, 1.9), (False, 2.4), (True, 3.1), (True, 4.7), (False, 5.2), (True, 6.6)]
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_roster(size=50):
+    return QuizRoster(f"{i:03d}" for i in range(1, size + 1))
+
+
+class PlayedRound:
+    """A round played on a fake clock while being journaled"""
+
+    def __init__(self, path, compact_frames=checkpoint.COMPACT_FRAMES):
+        self.clock = FakeClock()
+        self.engine = QuizEngine(make_roster(), duration=DURATION, clock=self.clock)
+        self.journal = CheckpointJournal(str(path), compact_frames)
+        self.recorder = CheckpointRecorder(self.journal, details=lambda: {"answer_mode": "typed"})
+        self.engine.recorder = self.recorder
+        # Log length after each press, to check which presses survive a torn journal
+        self.log_lengths = []
+        started = self.clock.now
+        self.engine.start_game(seed=1234)
+        for known, at in PRESSES:
+            self.clock.now = started + at
+            if known:
+                self.engine.next_pokemon()
+            else:
+                self.engine.skip_pokemon()
+            self.log_lengths.append(len(self.recorder.data))
+        self.started = started
+
+    def tick(self, at):
+        self.clock.now = self.started + at
+        self.recorder.tick(self.engine)
+
+    def close(self):
+        assert self.journal.flush()
+        self.journal.close()
+
+
+def frames(path):
+    """Kinds of the frames in a journal file"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    kinds = []
+    offset = checkpoint.FILE_HEADER.size
+    while offset < len(data):
+        kind, _, length = checkpoint.FRAME.unpack_from(data, offset)
+        kinds.append(kind)
+        offset += checkpoint.FRAME.size + length + checkpoint.CRC.size
+    return kinds
+
+
+def resumed_engine(saved, roster=None, now=5000.0):
+    engine = QuizEngine(roster or make_roster(), clock=FakeClock(now))
+    engine.recorder = SessionRecorder()
+    resume(saved.log, engine, saved.elapsed_ms)
+    return engine
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return tmp_path / "checkpoint.pqj"
+
+
+def test_load_checkpoint(journal_path):
+    played = PlayedRound(journal_path)
+    played.tick(12.5)
+    played.close()
+
+    saved = load_checkpoint(str(journal_path))
+    assert saved.details == {"answer_mode": "typed"}
+    assert saved.log == bytes(played.recorder.data)
+    assert saved.elapsed_ms == 12500
+    assert saved.duration == DURATION
+    assert saved.time_left == DURATION - 12
+
+
+def test_resume_into_engine(journal_path):
+    played = PlayedRound(journal_path)
+    played.tick(12.5)
+    played.close()
+
+    engine = resumed_engine(load_checkpoint(str(journal_path)))
+    assert engine.state == "game"
+    assert engine.seen_pokemon == played.engine.seen_pokemon
+    assert engine.skipped_pokemon == played.engine.skipped_pokemon
+    assert engine.score == played.engine.score
+    assert engine.current == played.engine.current
+    assert engine.time_left == DURATION - 12
+    # The resumed round keeps recording where the journal left off
+    assert engine.recorder.data == played.recorder.data
+
+
+def test_resume_with_different_roster(journal_path):
+    played = PlayedRound(journal_path)
+    played.close()
+    with pytest.raises(ReplayError):
+        resumed_engine(load_checkpoint(str(journal_path)), roster=make_roster(49))
+
+
+def test_cut_mid_frame(journal_path):
+    played = PlayedRound(journal_path)
+    played.close()
+    assert frames(journal_path)[-1] == checkpoint.EVENTS
+
+    # The crash hit while the last press was being written
+    size = os.path.getsize(journal_path)
+    with open(journal_path, 'r+b') as f:
+        f.truncate(size - 3)
+
+    saved = load_checkpoint(str(journal_path))
+    assert saved.log == bytes(played.recorder.data[:played.log_lengths[-2]])
+    engine = resumed_engine(saved)
+    assert engine.seen_pokemon == played.engine.seen_pokemon[:-1]
+    assert engine.score == played.engine.score - 1
+
+
+def test_bad_crc_ends_the_journal(journal_path):
+    played = PlayedRound(journal_path)
+    played.close()
+
+    # Flip a bit in the last frame's CRC
+    with open(journal_path, 'r+b') as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 1]))
+
+    saved = load_checkpoint(str(journal_path))
+    assert saved.log == bytes(played.recorder.data[:played.log_lengths[-2]])
+
+
+def test_compaction(journal_path):
+    played = PlayedRound(journal_path, compact_frames=3)
+    played.close()
+
+    kinds = frames(journal_path)
+    assert kinds[0] == checkpoint.ROUND
+    assert len(kinds) < 3
+    assert load_checkpoint(str(journal_path)).log == bytes(played.recorder.data)
+
+
+def test_finished_round_removes_journal(journal_path):
+    played = PlayedRound(journal_path)
+    played.engine.end_game()
+    played.close()
+    assert not os.path.exists(journal_path)
+    assert load_checkpoint(str(journal_path)) is None
+
+
+def test_expired_or_used_up(journal_path):
+    played = PlayedRound(journal_path)
+    played.tick(59.5)
+    played.close()
+    # Nothing worth resuming with under two seconds left
+    assert load_checkpoint(str(journal_path)) is None
+
+    played = PlayedRound(journal_path)
+    played.close()
+    assert load_checkpoint(str(journal_path)) is not None
+    old = time.time() - checkpoint.MAX_AGE - 60
+    os.utime(journal_path, (old, old))
+    assert load_checkpoint(str(journal_path)) is None
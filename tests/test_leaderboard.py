@@ -0,0 +1,135 @@
+"""Leaderboard: ranks, top lists and not counting a resent batch twice"""
+import asyncio
+import threading
+
+import pytest
+
+import quiz_protocol as proto
+from leaderboard import LeaderboardServer, LeaderboardSink, ModeBoard, ScoreCounts, load_test, mode_index
+
+
+def test_rank_counts_ties_as_the_same_place():
+    counts = ScoreCounts()
+    for score in (10, 20, 20, 30):
+        counts.add(score)
+    assert counts.rank(30) == 1
+    assert counts.rank(20) == 2
+    assert counts.rank(25) == 2
+    assert counts.rank(10) == 4
+    assert counts.rank(0) == 5
+
+
+def test_board_keeps_the_best_scores_oldest_first():
+    board = ModeBoard(capacity=3)
+    for score, timestamp in [(5, 1), (9, 2), (7, 3), (9, 4), (1, 5)]:
+        board.add((score, 0, timestamp, "p"))
+    assert [(e[0], e[2]) for e in board.top(10)] == [(9, 2), (9, 4), (7, 3)]
+    # Scores that don't make the list still count towards ranks
+    assert board.counts.total == 5
+
+
+def submit(server, client_id, batch_id, scores, mode=0):
+    entries = [(score, mode, 1000 + i, "p") for i, score in enumerate(scores)]
+    frame = proto.encode_batch(client_id, batch_id, entries)
+    reply = server.handle_message(proto.SUBMIT_BATCH, frame[proto.HEADER.size:])
+    assert proto.FrameDecoder().feed(reply) == [(proto.BATCH_ACK, proto.U32.pack(batch_id))]
+
+
+def test_resent_batch_is_counted_once():
+    server = LeaderboardServer()
+    submit(server, 1, 1, [10, 20])
+    submit(server, 1, 1, [10, 20])
+    assert server.scores_received == 2
+    # The same batch id from another client is a different batch
+    submit(server, 2, 1, [30])
+    submit(server, 1, 2, [40])
+    assert server.scores_received == 4
+
+
+def test_queries():
+    server = LeaderboardServer()
+    submit(server, 1, 1, [10, 50, 30], mode=mode_index("hard"))
+    (msg_type, payload), = proto.FrameDecoder().feed(
+        server.handle_message(proto.QUERY_TOP, proto.QUERY.pack(mode_index("hard"), 2)))
+    assert msg_type == proto.TOP
+    assert [entry[0] for entry in proto.decode_top(payload)] == [50, 30]
+    (msg_type, payload), = proto.FrameDecoder().feed(
+        server.handle_message(proto.QUERY_RANK, proto.QUERY.pack(mode_index("hard"), 40)))
+    assert proto.RANK_INFO.unpack(payload) == (2, 3)
+
+
+@pytest.fixture
+def live_server():
+    """A leaderboard server on localhost, run on its own thread"""
+    ready = threading.Event()
+    state = {}
+
+    def run():
+        async def main():
+            state["server"] = await LeaderboardServer().start("127.0.0.1", 0)
+            state["stop"] = asyncio.Event()
+            ready.set()
+            await state["stop"].wait()
+            await state["server"].close()
+
+        state["loop"] = asyncio.new_event_loop()
+        state["loop"].run_until_complete(main())
+        state["loop"].close()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert ready.wait(5)
+    yield state["server"]
+    state["loop"].call_soon_threadsafe(state["stop"].set)
+    thread.join(5)
+
+
+def quiet_sink(server, queue_path):
+    """A sink whose background thread is stopped, so the test decides when to upload"""
+    sink = LeaderboardSink(f"127.0.0.1:{server.port}", str(queue_path), name="Kiosk")
+    sink.close()
+    return sink
+
+
+def test_unacknowledged_batch_is_not_counted_twice_after_restart(live_server, tmp_path):
+    queue_path = tmp_path / "leaderboard_queue.jsonl"
+    sink = quiet_sink(live_server, queue_path)
+    for score in (12, 34, 56):
+        sink.submit(score, "typed")
+    request = sink.pool.request
+
+    def ack_lost(frame, reply_type):
+        request(frame, reply_type)
+        raise ConnectionError("connection dropped before the ACK")
+
+    # The server takes the batch, but the game exits before hearing back
+    sink.pool.request = ack_lost
+    assert not sink.flush()
+    sink.pool.close()
+    assert live_server.scores_received == 3
+
+    # Scores queued after the lost ACK go in a batch of their own
+    restarted = quiet_sink(live_server, queue_path)
+    assert restarted.client_id == sink.client_id
+    restarted.submit(78, "typed")
+    assert restarted.flush()
+    assert restarted.pending == []
+    assert live_server.scores_received == 4
+    assert [entry[0] for entry in restarted.query_top("typed")] == [78, 56, 34, 12]
+    restarted.pool.close()
+
+
+def test_queue_survives_a_server_outage(tmp_path):
+    sink = LeaderboardSink("127.0.0.1:1", str(tmp_path / "queue.jsonl"))
+    sink.close()
+    sink.submit(42)
+    assert not sink.flush()
+    restarted = LeaderboardSink("127.0.0.1:1", str(tmp_path / "queue.jsonl"))
+    restarted.close()
+    assert restarted.pending == sink.pending
+    assert restarted.in_flight == 1
+
+
+def test_load_test_through_sinks():
+    server = asyncio.run(load_test(5, 40))
+    assert server.scores_received == 200
@@ -0,0 +1,56 @@
+"""Typed-answer matching against the real Pokemon names"""
+import csv
+import os
+
+import pytest
+
+from name_index import NameIndex, edit_distance, normalize
+
+NAMES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pokemon_names.csv")
+
+
+@pytest.fixture(scope="module")
+def index():
+    with open(NAMES_FILE, 'r', encoding='utf-8') as f:
+        names = [row[1] for row in csv.reader(f) if len(row) >= 2 and row[0].isdigit()]
+    return NameIndex(names)
+
+
+def test_punctuation_and_case_are_ignored(index):
+    assert normalize("Mr. Mime") == normalize("mr mime")
+    assert index.is_correct("mr mime", "Mr. Mime")
+    assert index.is_correct("Farfetchd", "Farfetch'd")
+
+
+def test_accents_are_folded(index):
+    assert normalize("Flabébé") == "flabebe"
+    assert index.is_correct("Flabebe", "Flabébé")
+
+
+def test_nidoran_without_gender_symbol(index):
+    assert index.is_correct("Nidoran", "Nidoran♀")
+    assert index.is_correct("Nidoran", "Nidoran♂")
+    assert not index.is_correct("Nidoranf", "Nidoran♂")
+
+
+def test_transposition_is_one_typo(index):
+    assert edit_distance("pikahcu", "pikachu") == 1
+    assert index.is_correct("Pikahcu", "Pikachu")
+
+
+def test_near_misses_are_rejected(index):
+    # Short names get no typos at all
+    assert not index.is_correct("Mwe", "Mew")
+    # Two typos are too many for a seven letter name
+    assert not index.is_correct("Pikaxhy", "Pikachu")
+    # One typo away from the answer, but spelling another Pokemon exactly
+    assert not index.is_correct("Nidorino", "Nidorina")
+    assert not index.is_correct("Wiglett", "Diglett")
+    assert not index.is_correct("", "Pikachu")
+
+
+def test_suggestions(index):
+    assert index.complete("char")[:3] == ["Charmander", "Charmeleon", "Charizard"]
+    assert index.suggest("mr")[0] == "Mr. Mime"
+    # A typo in the prefix still finds the name
+    assert "Bulbasaur" in index.suggest("bulbasuar")
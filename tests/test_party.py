@@ -0,0 +1,190 @@
+"""Party rounds: moving the room on, players leaving, timeouts and the client's seq"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+import quiz_protocol as proto
+from party_server import PartyClient, PartyServer
+from quiz_engine import QuizRoster
+
+
+class FakeTransport:
+    """Collects what the server writes to one player"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.closed = False
+
+    def write(self, data):
+        self.data += data
+
+    def get_write_buffer_size(self):
+        return 0
+
+    def close(self):
+        self.closed = True
+
+    abort = close
+
+    def messages(self):
+        return proto.FrameDecoder().feed(bytes(self.data))
+
+
+def make_server(**kwargs):
+    return PartyServer(QuizRoster(f"{i:03d}" for i in range(1, 51)), **kwargs)
+
+
+def join(server, count):
+    return [server.add_player(FakeTransport()) for _ in range(count)]
+
+
+def answer(server, player, known, seq=None):
+    seq = server.seq if seq is None else seq
+    server.handle_message(player, proto.ANSWER, proto.SEQ_ANSWER.pack(seq, 1 if known else 0))
+
+
+def test_moves_on_once_everyone_answered():
+    server = make_server()
+    alice, bob = join(server, 2)
+    server.start_round()
+    first = server.engine.current_pokemon_id
+
+    answer(server, alice, True)
+    assert server.seq == 0
+    answer(server, bob, False)
+    assert server.seq == 1
+    # One player knew it, so the room scores it
+    assert server.engine.score == 1
+    assert alice.score == 1 and bob.score == 0
+    pokemon = [payload for kind, payload in alice.transport.messages() if kind == proto.POKEMON]
+    assert [proto.SEQ_POKEMON.unpack(p)[0] for p in pokemon] == [0, 1]
+    assert server.engine.seen_pokemon[0] == first
+
+
+def test_stale_and_duplicate_answers_are_ignored():
+    server = make_server()
+    alice, bob = join(server, 2)
+    server.start_round()
+    answer(server, alice, True)
+    answer(server, alice, True)
+    assert server.answers == 1
+    answer(server, bob, True)
+    assert server.seq == 1
+
+    # An answer for the previous question doesn't count for this one
+    answer(server, alice, True, seq=0)
+    assert server.answers == 0
+    assert alice.score == 1
+
+
+def test_leaver_was_the_last_to_answer():
+    server = make_server()
+    alice, bob, carol = join(server, 3)
+    server.start_round()
+    answer(server, alice, False)
+    answer(server, bob, False)
+    server.remove_player(carol)
+    assert server.seq == 1
+    assert server.engine.skipped_pokemon
+
+
+def test_leaver_answer_no_longer_counts():
+    server = make_server()
+    alice, bob, carol = join(server, 3)
+    server.start_round()
+    answer(server, alice, True)
+    server.remove_player(alice)
+    assert (server.answers, server.known_answers) == (0, 0)
+    answer(server, bob, False)
+    answer(server, carol, False)
+    # Nobody left in the room knew it
+    assert server.seq == 1
+    assert server.engine.score == 0
+
+
+def test_late_joiner_gets_the_round_in_progress():
+    server = make_server()
+    join(server, 1)
+    server.start_round()
+    (late,) = join(server, 1)
+    kinds = [kind for kind, _ in late.transport.messages()]
+    assert kinds == [proto.WELCOME, proto.ROUND_START, proto.POKEMON, proto.TICK]
+
+
+def test_question_timeout_and_round_end():
+    async def play():
+        server = make_server(duration=1, question_timeout=0.2)
+        await server.start("127.0.0.1", 0)
+        try:
+            (alice,) = join(server, 1)
+            server.start_round()
+            await asyncio.sleep(0.5)
+            # Nobody answered, so the room moved on by itself
+            assert server.seq >= 1
+            assert server.engine.score == 0
+            await asyncio.sleep(1.0)
+            assert server.engine.state == "end"
+            assert proto.ROUND_END in [kind for kind, _ in alice.transport.messages()]
+        finally:
+            await server.close()
+
+    asyncio.run(play())
+
+
+@pytest.fixture
+def live_server():
+    """A party server on localhost, run on its own thread"""
+    ready = threading.Event()
+    state = {}
+
+    def run():
+        async def main():
+            state["server"] = await make_server().start("127.0.0.1", 0)
+            state["stop"] = asyncio.Event()
+            ready.set()
+            await state["stop"].wait()
+            await state["server"].close()
+
+        state["loop"] = asyncio.new_event_loop()
+        state["loop"].run_until_complete(main())
+        state["loop"].close()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert ready.wait(5)
+    yield state["server"]
+    state["loop"].call_soon_threadsafe(state["stop"].set)
+    thread.join(5)
+
+
+def wait_for(client, kind, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for message in client.poll():
+            if message[0] == kind:
+                return message[1]
+        time.sleep(0.01)
+    raise AssertionError(f"No {kind} message")
+
+
+def test_client_answers_the_pokemon_it_was_shown(live_server):
+    client = PartyClient(f"127.0.0.1:{live_server.port}", "Ash").connect()
+    try:
+        client.request_start()
+        seq, pokemon_id = wait_for(client, "pokemon")
+        assert (seq, pokemon_id) == (0, live_server.engine.current_pokemon_id)
+        client.send_answer(seq, True)
+        next_seq, _ = wait_for(client, "pokemon")
+        assert next_seq == 1
+        assert live_server.engine.score == 1
+    finally:
+        client.close()
+
+
+def test_connect_failure_is_reported_at_once():
+    started = time.monotonic()
+    with pytest.raises(ConnectionError):
+        PartyClient("127.0.0.1:1").connect(timeout=5)
+    assert time.monotonic() - started < 2
@@ -0,0 +1,106 @@
+"""Round logs: recording, verified replay and rejecting edited logs"""
+import pytest
+
+import session_log
+from quiz_engine import QuizEngine, QuizRoster
+from session_log import HEADER, ReplayError, SessionRecorder, read_varint, replay, write_varint
+
+DURATION = 60
+
+
+def make_roster(size=50):
+    return QuizRoster(f"{i:03d}" for i in range(1, size + 1))
+
+
+def play_round(presses=((True, 0.5), (False, 1.2), (True, 2.0), (True, 30.0), (False, 59.0))):
+    """Log of a round played on a fake clock, and the engine that played it"""
+    now = [100.0]
+    engine = QuizEngine(make_roster(), duration=DURATION, clock=lambda: now[0])
+    engine.recorder = SessionRecorder()
+    engine.start_game(seed=99)
+    for known, at in presses:
+        now[0] = 100.0 + at
+        if known:
+            engine.next_pokemon()
+        else:
+            engine.skip_pokemon()
+    now[0] = 100.0 + DURATION
+    engine.end_game()
+    return bytes(engine.recorder.data), engine
+
+
+def replace_varint(data, offset, change):
+    """data with the varint at offset changed by change(value)"""
+    value, end = read_varint(data, offset)
+    encoded = bytearray()
+    write_varint(encoded, change(value))
+    return data[:offset] + bytes(encoded) + data[end:]
+
+
+def test_varint_round_trip():
+    buffer = bytearray()
+    values = [0, 1, 127, 128, 300, 2 ** 32]
+    for value in values:
+        write_varint(buffer, value)
+    offset = 0
+    for value in values:
+        decoded, offset = read_varint(buffer, offset)
+        assert decoded == value
+    assert offset == len(buffer)
+
+
+def test_replay_reproduces_the_round():
+    data, engine = play_round()
+    result = replay(data, make_roster())
+    assert result.score == engine.current_score == 3
+    assert result.events == 5
+    assert result.seen == len(engine.seen_pokemon)
+    assert result.skipped == len(engine.skipped_pokemon)
+    assert result.elapsed_ms == DURATION * 1000
+    # A few bytes per key press
+    assert len(data) < HEADER.size + 6 * 4
+
+
+def test_edited_score_is_rejected():
+    data, _ = play_round()
+    # The score is the last varint, a single byte for small scores
+    assert data[-2] < 0x80 and data[-1] < 0x80
+    with pytest.raises(ReplayError, match="score"):
+        replay(replace_varint(data, len(data) - 1, lambda score: score + 5), make_roster())
+
+
+def test_edited_draw_is_rejected():
+    data, _ = play_round()
+    with pytest.raises(ReplayError, match="First Pokemon"):
+        replay(replace_varint(data, HEADER.size, lambda number: number % 50 + 1), make_roster())
+
+
+def test_edited_timing_is_rejected():
+    data, _ = play_round(presses=((True, 0.5),))
+    _, offset = read_varint(data, HEADER.size)
+    # Push the key press past the end of the round
+    late = replace_varint(data, offset, lambda packed: packed + (DURATION * 1000 << 2))
+    with pytest.raises(ReplayError, match="after the round ended"):
+        replay(late, make_roster())
+
+
+def test_other_roster_or_bad_data_is_rejected():
+    data, _ = play_round()
+    with pytest.raises(ReplayError, match="different set"):
+        replay(data, make_roster(49))
+    with pytest.raises(ReplayError):
+        replay(data[:-1], make_roster())
+    with pytest.raises(ReplayError):
+        replay(b"PQXX" + data[4:], make_roster())
+    with pytest.raises(ReplayError):
+        replay(data[:HEADER.size - 1], make_roster())
+
+
+def test_save_never_overwrites_when_asked(tmp_path):
+    data, engine = play_round()
+    path = tmp_path / "round.pqs"
+    engine.recorder.save(str(path), overwrite=False)
+    with pytest.raises(FileExistsError):
+        engine.recorder.save(str(path), overwrite=False)
+    assert path.read_bytes() == data
+    assert session_log.replay(path.read_bytes(), make_roster()).score == 3
@@ -0,0 +1,109 @@
+"""Shared sprite store: built once, then only changed sprites are decoded again"""
+import os
+
+import pygame
+import pytest
+
+import shared_sprites
+from assets import list_images
+from shared_sprites import STORE_DIR, open_shared_sprites
+
+
+def save_sprite(folder, number, colour, size=(12, 10)):
+    surface = pygame.Surface(size, pygame.SRCALPHA, 32)
+    surface.fill(colour)
+    pygame.image.save(surface, os.path.join(folder, f"{number:03d}.png"))
+
+
+@pytest.fixture
+def image_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("APPDATA", str(tmp_path / "home"))
+    folder = tmp_path / "img"
+    folder.mkdir()
+    for number, colour in enumerate([(255, 0, 0, 255), (0, 255, 0, 255), (0, 0, 255, 128)], 1):
+        save_sprite(str(folder), number, colour)
+    return str(folder)
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    """Filenames decoded from PNG, in order"""
+    decoded = []
+    load = pygame.image.load
+
+    def counting_load(path):
+        decoded.append(os.path.basename(path))
+        return load(path)
+
+    monkeypatch.setattr(shared_sprites.pygame.image, "load", counting_load)
+    return decoded
+
+
+def open_store(image_dir):
+    return open_shared_sprites(image_dir, list_images(image_dir))
+
+
+def stores(tmp_path):
+    return sorted(name for name in os.listdir(tmp_path / "home" / ".pokemonquiz" / STORE_DIR) if name.endswith(".bin"))
+
+
+def test_first_launch_decodes_everything(image_dir, decodes):
+    sprites = open_store(image_dir)
+    assert decodes == ["001.png", "002.png", "003.png"]
+    assert sprites["001.png"].get_size() == (12, 10)
+    assert tuple(sprites["002.png"].get_at((3, 3))) == (0, 255, 0, 255)
+    assert tuple(sprites["003.png"].get_at((0, 0))) == (0, 0, 255, 128)
+
+
+def test_later_launches_decode_nothing(image_dir, decodes, monkeypatch):
+    open_store(image_dir)
+    decodes.clear()
+
+    def no_hashing(path):
+        raise AssertionError(f"{path} hashed again")
+
+    # Unchanged files are recognised by their size and mtime alone
+    monkeypatch.setattr(shared_sprites, "file_hash", no_hashing)
+    sprites = open_store(image_dir)
+    assert decodes == []
+    assert len(sprites) == 3
+
+
+def test_only_changed_sprites_are_decoded(image_dir, decodes, tmp_path):
+    open_store(image_dir)
+    first_store = stores(tmp_path)
+    decodes.clear()
+
+    save_sprite(image_dir, 2, (255, 255, 0, 255), size=(8, 8))
+    save_sprite(image_dir, 4, (9, 9, 9, 255))
+    os.remove(os.path.join(image_dir, "001.png"))
+    sprites = open_store(image_dir)
+
+    assert decodes == ["002.png", "004.png"]
+    assert sorted(sprites) == ["002.png", "003.png", "004.png"]
+    assert sprites["002.png"].get_size() == (8, 8)
+    assert tuple(sprites["003.png"].get_at((0, 0))) == (0, 0, 255, 128)
+    # The old store is replaced, not kept alongside
+    assert len(stores(tmp_path)) == 1 and stores(tmp_path) != first_store
+
+
+def test_touched_but_unchanged_sprite_is_not_decoded(image_dir, decodes):
+    open_store(image_dir)
+    decodes.clear()
+    path = os.path.join(image_dir, "001.png")
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10 ** 9))
+    open_store(image_dir)
+    assert decodes == []
+
+
+def test_damaged_store_is_rebuilt(image_dir, decodes, tmp_path):
+    open_store(image_dir)
+    decodes.clear()
+    (name,) = stores(tmp_path)
+    path = tmp_path / "home" / ".pokemonquiz" / STORE_DIR / name
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) // 2)
+    sprites = open_store(image_dir)
+    assert sorted(decodes) == ["001.png", "002.png", "003.png"]
+    assert len(sprites) == 3
@@ -0,0 +1,64 @@
+"""Stored sprite fingerprints are only used for the sprites they were built from"""
+import os
+
+import pygame
+import pytest
+
+import sprite_similarity
+from assets import build_pack
+
+pytest.importorskip("numpy")
+
+
+def make_sprites(folder, colours):
+    os.makedirs(folder, exist_ok=True)
+    for number, colour in enumerate(colours, 1):
+        surface = pygame.Surface((16, 16), pygame.SRCALPHA, 32)
+        surface.fill(colour, pygame.Rect(4, 4, 8, 8))
+        pygame.image.save(surface, os.path.join(folder, f"{number:03d}.png"))
+
+
+@pytest.fixture
+def pack(tmp_path, monkeypatch):
+    """An asset pack with shipped fingerprints, and an empty user data folder"""
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("APPDATA", str(tmp_path / "home"))
+    source = str(tmp_path / "img")
+    make_sprites(source, [(255, 0, 0), (250, 10, 0), (0, 0, 255), (0, 10, 250)])
+    pack_dir = str(tmp_path / "PokemonQuiz-assets")
+    build_pack(source, pack_dir)
+    ids, fingerprints = sprite_similarity.fingerprint_dir(source)
+    sprite_similarity.save_fingerprints(
+        os.path.join(pack_dir, sprite_similarity.FINGERPRINT_FILE), ids, fingerprints,
+        sprite_similarity.content_signature(source, sorted(os.listdir(source))))
+    return pack_dir
+
+
+def test_shipped_fingerprints_match_the_pack(pack):
+    index = sprite_similarity.load_index(os.path.join(pack, "img"))
+    assert index is not None
+    assert index.similar("001")[0] == "002"
+    assert index.similar("003")[0] == "004"
+
+
+def test_shipped_fingerprints_for_other_sprites_are_ignored(pack):
+    # The pack was rebuilt from changed sprites, but the old fingerprints were left behind
+    make_sprites(os.path.join(pack, "changed"), [(255, 0, 0), (0, 0, 255), (250, 10, 0), (0, 10, 250)])
+    build_pack(os.path.join(pack, "changed"), pack)
+    assert sprite_similarity.load_index(os.path.join(pack, "img")) is None
+
+
+def test_shipped_fingerprints_need_a_manifest(pack):
+    os.remove(os.path.join(pack, "manifest.json"))
+    assert sprite_similarity.load_index(os.path.join(pack, "img")) is None
+
+
+def test_built_fingerprints_follow_the_folder(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    image_dir = str(tmp_path / "img")
+    make_sprites(image_dir, [(255, 0, 0), (0, 0, 255)])
+    job = sprite_similarity.FingerprintJob(image_dir)
+    job.run()
+    assert sprite_similarity.load_index(image_dir) is not None
+    make_sprites(image_dir, [(255, 0, 0), (0, 0, 255), (0, 255, 0)])
+    assert sprite_similarity.load_index(image_dir) is None
@@ -0,0 +1,150 @@
+"""Mouse input: WidgetLayer hit-testing and hover, and the game's click and wheel handling"""
+import os
+import shutil
+
+import pygame
+import pytest
+
+from assets import list_images, resource_path
+
+# Enough sprites for the end screen's list to scroll
+SPRITES = 80
+
+
+class FakeWidget:
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+        self.hovered = False
+        self.visible = True
+        self.clicks = 0
+
+    def contains(self, pos):
+        return self.visible and self.rect.collidepoint(pos)
+
+    def click(self):
+        self.clicks += 1
+
+
+@pytest.fixture(scope="module")
+def quiz():
+    import pokemon_quiz
+    return pokemon_quiz
+
+
+def test_widget_at_finds_the_topmost_widget(quiz):
+    back = FakeWidget((0, 0, 200, 200))
+    front = FakeWidget((50, 50, 20, 20))
+    far = FakeWidget((1000, 700, 10, 10))
+    layer = quiz.WidgetLayer([back, front, far])
+    assert layer.widget_at((60, 60)) is front
+    assert layer.widget_at((10, 10)) is back
+    assert layer.widget_at((1005, 705)) is far
+    assert layer.widget_at((500, 500)) is None
+    # Edges follow pygame.Rect: right and bottom are outside
+    assert layer.widget_at((200, 10)) is None
+
+
+def test_hidden_widgets_are_not_hit(quiz):
+    widget = FakeWidget((0, 0, 100, 40))
+    layer = quiz.WidgetLayer([widget])
+    widget.visible = False
+    assert layer.click((10, 10)) is None
+    assert widget.clicks == 0
+
+
+def test_rebuild_after_moving(quiz):
+    widget = FakeWidget((0, 0, 100, 40))
+    layer = quiz.WidgetLayer([widget])
+    widget.rect = pygame.Rect(300, 300, 100, 40)
+    layer.rebuild()
+    assert layer.widget_at((10, 10)) is None
+    assert layer.click((350, 320)) is widget
+    assert widget.clicks == 1
+
+
+def test_hover_moves_between_widgets(quiz):
+    first = FakeWidget((0, 0, 100, 40))
+    second = FakeWidget((0, 100, 100, 40))
+    layer = quiz.WidgetLayer([first, second])
+    layer.hover((10, 10))
+    assert first.hovered and not second.hovered
+    layer.hover((10, 110))
+    assert second.hovered and not first.hovered
+    layer.hover(None)
+    assert not first.hovered and not second.hovered
+    assert layer.hovered is None
+
+
+@pytest.fixture(scope="module")
+def game(quiz, tmp_path_factory):
+    """A game on a small copy of the roster, with scores and logs in a temporary home folder"""
+    home = tmp_path_factory.mktemp("home")
+    image_dir = home / "img"
+    image_dir.mkdir()
+    source = resource_path("img")
+    for filename in list_images(source)[:SPRITES]:
+        shutil.copy(os.path.join(source, filename), image_dir)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("HOME", str(home))
+        patch.setenv("APPDATA", str(home))
+        patch.setattr(quiz, "locate_sprite_dir", lambda: str(image_dir))
+        quiz.bootstrap(sound=False)
+        yield quiz.PokemonQuizGame(sound=False)
+    pygame.quit()
+
+
+def post(event_type, **attributes):
+    pygame.event.post(pygame.event.Event(event_type, **attributes))
+
+
+def click(game, widget):
+    post(pygame.MOUSEBUTTONDOWN, pos=widget.rect.center, button=1)
+    game.handle_events()
+
+
+def test_start_screen_clicks(game):
+    game.reset_game()
+    game.draw()
+    mode = game.answer_mode
+    click(game, game.answer_mode_button)
+    assert game.answer_mode != mode
+    while game.answer_mode != "classic":
+        click(game, game.answer_mode_button)
+
+    checked = game.hard_mode_checkbox.checked
+    click(game, game.hard_mode_checkbox)
+    assert game.hard_mode_checkbox.checked != checked
+    click(game, game.hard_mode_checkbox)
+
+    post(pygame.MOUSEMOTION, pos=game.start_button.rect.center, rel=(0, 0), buttons=(0, 0, 0))
+    game.handle_events()
+    assert game.start_button.hovered
+    click(game, game.start_button)
+    assert game.state == "game"
+
+
+def test_mouse_wheel_scrolls_the_end_screen_list(game):
+    game.reset_game()
+    game.start_game()
+    for _ in range(SPRITES - 1):
+        game.next_pokemon()
+    game.end_game()
+    game.draw()
+    assert game.max_scroll > 0
+
+    post(pygame.MOUSEWHEEL, x=0, y=-2, flipped=False)
+    game.handle_events()
+    assert game.scroll_y == 2 * game.scroll_speed
+    post(pygame.MOUSEWHEEL, x=0, y=1, flipped=False)
+    game.handle_events()
+    assert game.scroll_y == game.scroll_speed
+    # The list stops at its ends
+    post(pygame.MOUSEWHEEL, x=0, y=100, flipped=False)
+    game.handle_events()
+    assert game.scroll_y == 0
+    post(pygame.MOUSEWHEEL, x=0, y=-10000, flipped=False)
+    game.handle_events()
+    assert game.scroll_y == game.max_scroll
+
+    click(game, game.restart_button)
+    assert game.state == "game"